@@ -41,6 +41,7 @@ try:
 except ImportError:
     # Python 2 fallback
     import __builtin__ as builtins
+import functools
 import inspect
 import os
 import re
@@ -125,6 +126,82 @@ class code_formatter_meta(type):
         cls.pattern = re.compile(pat, re.VERBOSE | re.DOTALL | re.MULTILINE)
 
 
+_LITERAL, _IDENT, _EVAL, _LONE, _POS, _INVALID = range(6)
+
+
+@functools.lru_cache(maxsize=16384)
+def _compile(pattern, format):
+    """Split a format string into the operations that expand it
+
+    Formatting the same string again (e.g. from a loop in a code
+    generator) reuses the operations and the compiled expressions instead
+    of matching and compiling the string each time. Each operation is an
+    (op, arg) tuple, run in order against a lookup object.
+    """
+    ops = []
+    literal = []
+    end = 0
+    for match in pattern.finditer(format):
+        literal.append(format[end : match.start()])
+        end = match.end()
+
+        # check for an escaped delimiter
+        if match.group("escaped") is not None:
+            literal.append("$")
+            continue
+
+        # check for a lone identifier
+        if match.group("lone"):
+            op = (_LONE, (match.group("indent"), match.group("lone")))
+
+        # check for an identifier, braced or not
+        elif match.group("ident") or match.group("b_ident"):
+            op = (_IDENT, match.group("ident") or match.group("b_ident"))
+
+        # check for a positional parameter, braced or not
+        elif match.group("pos") or match.group("b_pos"):
+            op = (_POS, int(match.group("pos") or match.group("b_pos")))
+
+        # check for a double braced expression; an expression that does
+        # not compile is kept as source so that it fails when evaluated
+        elif match.group("eval") is not None:
+            eval_expr = match.group("eval")
+            try:
+                eval_expr = compile(eval_expr, "<string>", "eval")
+            except SyntaxError:
+                pass
+            op = (_EVAL, eval_expr)
+
+        # At this point, we have to match invalid
+        elif match.group("invalid") is not None:
+            i = match.start("invalid")
+            lines = format[:i].splitlines(True)
+            colno = i - sum(len(z) for z in lines)
+            lineno = len(lines)
+            op = (
+                _INVALID,
+                "Invalid format string: line %d, col %d" % (lineno, colno),
+            )
+
+        else:
+            # didn't match invalid!
+            raise ValueError(
+                "Unrecognized named group in pattern",
+                code_formatter.pattern,
+            )
+
+        text = "".join(literal)
+        if text:
+            ops.append((_LITERAL, text))
+        literal = []
+        ops.append(op)
+
+    text = "".join(literal) + format[end:]
+    if text:
+        ops.append((_LITERAL, text))
+    return tuple(ops)
+
+
 class code_formatter(metaclass=code_formatter_meta):
     delim = r"$"
     ident = r"[_A-z]\w*"
@@ -171,46 +248,51 @@ class code_formatter(metaclass=code_formatter_meta):
         self._data = []
 
     def write(self, *args):
-        f = open(os.path.join(*args), "w")
-        name, extension = os.path.splitext(f.name)
+        filename = os.path.join(*args)
+        name, extension = os.path.splitext(filename)
 
         # Add a comment to inform which file generated the generated file
         # to make it easier to backtrack and modify generated code
         frame = inspect.currentframe().f_back
+        header = ""
         if re.match(r"^\.(cc|hh|c|h)$", extension) is not None:
-            f.write(
-                f"""/**
+            header = f"""/**
  * DO NOT EDIT THIS FILE!
  * File automatically generated by
  *   {frame.f_code.co_filename}:{frame.f_lineno}
  */
 
 """
-            )
         elif re.match(r"^\.py$", extension) is not None:
-            f.write(
-                f"""#
+            header = f"""#
 # DO NOT EDIT THIS FILE!
 # File automatically generated by
 #   {frame.f_code.co_filename}:{frame.f_lineno}
 #
 
 """
-            )
         elif re.match(r"^\.html$", extension) is not None:
-            f.write(
-                f"""<!--
+            header = f"""<!--
  DO NOT EDIT THIS FILE!
  File automatically generated by
    {frame.f_code.co_filename}:{frame.f_lineno}
 -->
 
 """
-            )
 
-        for data in self._data:
+        data = header + "".join(self._data)
+
+        # Leave a file that would not change alone, so that its timestamp,
+        # and whatever is built from it, stays up to date
+        try:
+            with open(filename) as f:
+                if f.read() == data:
+                    return
+        except (OSError, ValueError):
+            pass
+
+        with open(filename, "w") as f:
             f.write(data)
-        f.close()
 
     def __str__(self):
         data = "".join(self._data)
@@ -263,73 +345,40 @@ class code_formatter(metaclass=code_formatter_meta):
         format = args[0]
         args = args[1:]
 
+        ops = _compile(code_formatter.pattern, format)
+        if not ops:
+            self._append("")
+            return
+        if len(ops) == 1 and ops[0][0] == _LITERAL:
+            self._append(ops[0][1])
+            return
+
         frame = inspect.currentframe().f_back
 
         l = lookup(self, frame, *args, **kwargs)
 
-        def convert(match):
-            ident = match.group("lone")
-            # check for a lone identifier
-            if ident:
-                indent = match.group("indent")  # must be spaces
+        d = []
+        for op, arg in ops:
+            if op == _LITERAL:
+                d.append(arg)
+            elif op == _IDENT:
+                d.append(f"{l[arg]}")
+            elif op == _EVAL:
+                d.append(f"{eval(arg, {}, l)}")
+            elif op == _LONE:
+                indent, ident = arg
                 lone = f"{l[ident]}"
-
-                def indent_lines(gen):
-                    for line in gen:
-                        yield indent
-                        yield line
-
-                return "".join(indent_lines(lone.splitlines(True)))
-
-            # check for an identifier, braced or not
-            ident = match.group("ident") or match.group("b_ident")
-            if ident is not None:
-                return f"{l[ident]}"
-
-            # check for a positional parameter, braced or not
-            pos = match.group("pos") or match.group("b_pos")
-            if pos is not None:
-                pos = int(pos)
-                if pos > len(args):
+                d.extend(indent + line for line in lone.splitlines(True))
+            elif op == _POS:
+                if arg > len(args):
                     raise ValueError(
-                        "Positional parameter #%d not found in pattern" % pos,
+                        "Positional parameter #%d not found in pattern" % arg,
                         code_formatter.pattern,
                     )
-                return f"{args[int(pos)]}"
-
-            # check for a double braced expression
-            eval_expr = match.group("eval")
-            if eval_expr is not None:
-                result = eval(eval_expr, {}, l)
-                return f"{result}"
-
-            # check for an escaped delimiter
-            if match.group("escaped") is not None:
-                return "$"
-
-            # At this point, we have to match invalid
-            if match.group("invalid") is None:
-                # didn't match invalid!
-                raise ValueError(
-                    "Unrecognized named group in pattern",
-                    code_formatter.pattern,
-                )
-
-            i = match.start("invalid")
-            if i == 0:
-                colno = 1
-                lineno = 1
+                d.append(f"{args[arg]}")
             else:
-                lines = format[:i].splitlines(True)
-                colno = i - sum(len(z) for z in lines)
-                lineno = len(lines)
-
-                raise ValueError(
-                    "Invalid format string: line %d, col %d" % (lineno, colno)
-                )
-
-        d = code_formatter.pattern.sub(convert, format)
-        self._append(d)
+                raise ValueError(arg)
+        self._append("".join(d))
 
 
 __all__ = ["code_formatter"]
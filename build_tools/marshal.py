@@ -61,10 +61,20 @@ from code_formatter import code_formatter
 # PySource() call in a SConscript need to be embedded into the M5
 # library.  To do that, we compile the file to byte code, marshal the
 # byte code, compress it, and then generate a c++ file that
-# inserts the result into an array.
-
-if len(sys.argv) < 4:
-    print(f"Usage: {sys.argv[0]} CPP PY MODPATH ABSPATH", file=sys.stderr)
+# inserts the result into an array. With --no-compress, or if compressing
+# doesn't make it smaller, the byte code is stored uncompressed so that it
+# can be unmarshalled straight from the binary when it is imported.
+
+args = sys.argv[1:]
+no_compress = "--no-compress" in args
+if no_compress:
+    args.remove("--no-compress")
+
+if len(args) != 4:
+    print(
+        f"Usage: {sys.argv[0]} [--no-compress] CPP PY MODPATH ABSPATH",
+        file=sys.stderr,
+    )
     sys.exit(1)
 
 # Set the Python's locale settings manually based on the `LC_CTYPE`
@@ -72,7 +82,7 @@ if len(sys.argv) < 4:
 if "LC_CTYPE" in os.environ:
     locale.setlocale(locale.LC_CTYPE, os.environ["LC_CTYPE"])
 
-_, cpp, python, modpath, abspath = sys.argv
+cpp, python, modpath, abspath = args
 
 with open(python) as f:
     src = f.read()
@@ -80,7 +90,11 @@ with open(python) as f:
 compiled = compile(src, python, "exec")
 marshalled = marshal.dumps(compiled)
 
-compressed = zlib.compress(marshalled)
+# EmbeddedPython treats data which is the same size as the marshalled code
+# as uncompressed.
+stored = marshalled if no_compress else zlib.compress(marshalled)
+if len(stored) >= len(marshalled):
+    stored = marshalled
 
 code = code_formatter()
 code(
@@ -95,7 +109,7 @@ namespace
 """
 )
 
-bytesToCppArray(code, "embedded_module_data", compressed)
+bytesToCppArray(code, "embedded_module_data", stored)
 
 # The name of the EmbeddedPython object doesn't matter since it's in an
 # anonymous namespace, and it's constructor takes care of installing it into a
@@ -106,7 +120,7 @@ EmbeddedPython embedded_module_info(
     "${abspath}",
     "${modpath}",
     embedded_module_data,
-    ${{len(compressed)}},
+    ${{len(stored)}},
     ${{len(marshalled)}});
 
 } // anonymous namespace
@@ -0,0 +1,118 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Generates the index of the names defined by each ``m5.objects`` module. The
+index is used to import ``m5.objects`` lazily: on first access of a name, only
+the module defining it is imported (see ``src/python/m5/objects/__init__.py``).
+
+Usage: objectsindexpy.py OBJECTS_INDEX_PY MODPATH=FILE [MODPATH=FILE ...]
+"""
+
+import argparse
+import ast
+
+from code_formatter import code_formatter
+
+parser = argparse.ArgumentParser()
+parser.add_argument("objects_index_py", help="objects_index.py file path")
+parser.add_argument(
+    "modules",
+    help="the module path, and source file, of each m5.objects module",
+    metavar="MODPATH=FILE",
+    nargs="*",
+)
+
+args = parser.parse_args()
+
+
+def target_names(target, names):
+    """Adds the names bound by an assignment target (e.g., ``a, b = ...``) to
+    ``names``. Attributes and subscripts do not bind names.
+    """
+    if isinstance(target, ast.Name):
+        names.add(target.id)
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for element in target.elts:
+            target_names(element, names)
+    elif isinstance(target, ast.Starred):
+        target_names(target.value, names)
+
+
+def top_level_names(body, defined, imported):
+    """Adds the public names bound by the top-level statements of a module to
+    ``defined``, or to ``imported`` if bound by an import. Statements nested
+    in top-level conditionals (e.g., ``if``/``try``) are included.
+    """
+    for node in body:
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+            defined.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node]
+            for target in targets:
+                target_names(getattr(target, "target", target), defined)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name != "*":
+                    imported.add(alias.asname or alias.name.split(".")[0])
+        else:
+            for field in ("body", "orelse", "finalbody"):
+                top_level_names(getattr(node, field, []), defined, imported)
+            for handler in getattr(node, "handlers", []):
+                top_level_names(handler.body, defined, imported)
+
+
+# Map each name to the module which defines it. A name which is only imported
+# by modules is mapped to one of the modules importing it, as it is not
+# defined by any m5.objects module (e.g., it is defined in m5.params).
+defines = {}
+imports = {}
+for module in args.modules:
+    modpath, source = module.split("=", 1)
+    with open(source) as f:
+        tree = ast.parse(f.read(), source)
+    defined, imported = set(), set()
+    top_level_names(tree.body, defined, imported)
+    for name in defined:
+        defines[name] = modpath
+    for name in imported:
+        imports[name] = modpath
+
+index = {
+    name: modpath
+    for name, modpath in {**imports, **defines}.items()
+    if not name.startswith("_")
+}
+
+code = code_formatter()
+code("# Generated by objectsindexpy.py. Do not edit.")
+code("index = {")
+code.indent()
+for name, modpath in sorted(index.items()):
+    code("${{repr(name)}}: ${{repr(modpath)}},")
+code.dedent()
+code("}")
+code.write(args.objects_index_py)
@@ -37,14 +37,20 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import glob
+import hashlib
 import os
+import pickle
 import re
 import sys
 import traceback
+import zlib
 
 # get type names
 from types import *
 
+import grammar
+import ply
 from grammar import Grammar
 
 from .operand_list import *
@@ -537,6 +543,10 @@ class ISAParser(Grammar):
         self.files = {}
         self.splits = {}
 
+        # Names of all of the files written to output_dir, so that they can
+        # be cached.
+        self.written = set()
+
         # isa_name / namespace identifier from namespace declaration.
         # before the namespace declaration, None.
         self.isa_name = None
@@ -1603,6 +1613,7 @@ StaticInstPtr
         """Open the output file for writing and include scary warning."""
         filename = os.path.join(self.output_dir, name)
         f = open(filename, "w")
+        self.written.add(name)
         if f:
             if not bare:
                 f.write(ISAParser.scaremonger_template % self)
@@ -1655,10 +1666,157 @@ StaticInstPtr
         self.fileNameStack.pop()
         return contents
 
+    # Bump this whenever the format of the cache entries changes.
+    cache_format = 1
+
+    # How many cache entries to keep for each ISA description.
+    cache_entries = 4
+
+    def cache_path(self, isa_desc_file, isa_desc):
+        """Return the location of the cached output for the flattened ISA
+        description isa_desc, or None if the output is not to be cached.
+        Everything except the Python modules imported while parsing goes
+        into the key; those are checked when the cache entry is read.
+
+        Caches are kept in GEM5_ISA_PARSER_CACHE_DIR if set, otherwise in
+        ~/.cache/gem5/isa_parser. Setting GEM5_ISA_PARSER_CACHE_DIR to an
+        empty string disables caching."""
+        cache_dir = os.getenv(
+            "GEM5_ISA_PARSER_CACHE_DIR",
+            os.path.join(
+                os.path.expanduser("~"), ".cache", "gem5", "isa_parser"
+            ),
+        )
+        if not cache_dir:
+            return None
+
+        # Leave out the parse tables that PLY writes next to the parser the
+        # first time it runs, as they are generated from the parser itself.
+        parser_dir = os.path.dirname(os.path.abspath(__file__))
+        sources = [
+            source
+            for source in glob.glob(os.path.join(parser_dir, "*.py"))
+            if os.path.basename(source) != "parsetab.py"
+        ]
+        sources.append(grammar.__file__)
+
+        digest = hashlib.sha256()
+        for source in sorted(sources):
+            with open(source, "rb") as f:
+                digest.update(f.read())
+        for item in (
+            ply.__version__,
+            isa_desc_file,
+            self.decoder_name,
+            isa_desc,
+        ):
+            digest.update(item.encode() + b"\0")
+
+        name = self.filename.replace("/", "-")
+        return os.path.join(cache_dir, f"{name}-{digest.hexdigest()}.pkl")
+
+    @staticmethod
+    def file_digest(filename):
+        with open(filename, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def module_deps(self, isa_desc_file, modules):
+        """Return the files and digests of the Python modules that parsing
+        the ISA description may have used: those imported since modules was
+        taken, and those that live alongside the ISA description."""
+        arch_dir = os.path.dirname(os.path.dirname(isa_desc_file))
+        deps = {}
+        for name, module in list(sys.modules.items()):
+            filename = getattr(module, "__file__", None)
+            if not filename or not os.path.isfile(filename):
+                continue
+            filename = os.path.abspath(filename)
+            if name not in modules or filename.startswith(arch_dir + os.sep):
+                deps[filename] = self.file_digest(filename)
+        return sorted(deps.items())
+
+    def read_cache(self, cache_path):
+        """Write the output cached in cache_path to the output directory,
+        and return whether there was a usable cache entry."""
+        try:
+            with open(cache_path, "rb") as f:
+                cache_format, deps, outputs = pickle.loads(
+                    zlib.decompress(f.read())
+                )
+            if cache_format != ISAParser.cache_format:
+                return False
+            for filename, digest in deps:
+                if self.file_digest(filename) != digest:
+                    return False
+        except (
+            OSError,
+            zlib.error,
+            pickle.UnpicklingError,
+            EOFError,
+            ValueError,
+        ):
+            return False
+
+        for name, contents in outputs.items():
+            filename = os.path.join(self.output_dir, name)
+            try:
+                with open(filename) as f:
+                    if f.read() == contents:
+                        continue
+            except (OSError, ValueError):
+                pass
+            with open(filename, "w") as f:
+                f.write(contents)
+
+        # Mark the entry as recently used so that it is not pruned.
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return True
+
+    def write_cache(self, cache_path, deps):
+        """Cache everything written to the output directory in cache_path,
+        and prune old entries for the same ISA description."""
+        outputs = {}
+        for name in self.written:
+            with open(os.path.join(self.output_dir, name)) as f:
+                outputs[name] = f.read()
+        data = pickle.dumps(
+            (ISAParser.cache_format, deps, outputs),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+        # The outputs have already been written to the build directory, so
+        # if the cache directory is unwritable this build is unaffected; the
+        # next one just parses the ISA description again.
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(data, 1))
+            os.replace(tmp_path, cache_path)
+
+            prefix = glob.escape(cache_path.rsplit("-", 1)[0])
+            entries = glob.glob(f"{prefix}-*.pkl")
+            entries.sort(key=os.path.getmtime, reverse=True)
+            for entry in entries[ISAParser.cache_entries :]:
+                os.remove(entry)
+        except OSError:
+            pass
+
     AlreadyGenerated = {}
 
-    def _parse_isa_desc(self, isa_desc_file):
-        """Read in and parse the ISA description."""
+    def _parse_isa_desc(self, isa_desc_file, force=False):
+        """Read in and parse the ISA description. Unless force is set, the
+        output is restored from the cache (see cache_path) instead if none
+        of the inputs have changed since it was last generated.
+
+        Setting the GEM5_ISA_PARSER_FORCE environment variable to anything
+        but an empty string or 0 also sets force, e.g.
+        `GEM5_ISA_PARSER_FORCE=1 scons ...` if the cache is suspected to be
+        stale. Only the ISA descriptions SCons rebuilds are parsed, and
+        their cache entries are replaced with the new output."""
 
         # The build system can end up running the ISA parser twice: once to
         # finalize the build dependencies, and then to actually generate
@@ -1679,12 +1837,26 @@ StaticInstPtr
         # do this up front.
         isa_desc = self.read_and_flatten(isa_desc_file)
 
+        force = force or os.getenv("GEM5_ISA_PARSER_FORCE", "") not in (
+            "",
+            "0",
+        )
+        cache_path = self.cache_path(isa_desc_file, isa_desc)
+        if cache_path and not force and self.read_cache(cache_path):
+            ISAParser.AlreadyGenerated[isa_desc_file] = None
+            return
+        modules = set(sys.modules)
+
         # Initialize lineno tracker
         self.lex.lineno = LineTracker(isa_desc_file)
 
         # Parse.
         self.parse_string(isa_desc)
 
+        if cache_path:
+            deps = self.module_deps(os.path.abspath(isa_desc_file), modules)
+            self.write_cache(cache_path, deps)
+
         ISAParser.AlreadyGenerated[isa_desc_file] = None
 
     def parse_isa_desc(self, *args, **kwargs):
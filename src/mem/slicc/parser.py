@@ -37,6 +37,7 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
 import os.path
 import re
 import sys
@@ -61,6 +62,7 @@ class SLICC(Grammar):
         self.verbose = verbose
         self.symtab = SymbolTable(self)
         self.base_dir = base_dir
+        self.sources = {}
 
         try:
             self.decl_list = self.parse_file(filename, **kwargs)
@@ -82,8 +84,32 @@ class SLICC(Grammar):
     def process(self):
         self.decl_list.generate()
 
-    def writeCodeFiles(self, code_path, includes):
-        self.symtab.writeCodeFiles(code_path, includes)
+    def parse_file(self, filename, **kwargs):
+        with open(filename) as f:
+            data = f.read()
+        self.sources[filename] = hashlib.sha1(data.encode()).hexdigest()
+        return self.parse_string(data, filename, **kwargs)
+
+    def machineSources(self):
+        """Map each machine to the files that only declare things within
+        that machine, including any files included from within it"""
+        decls = self.decl_list.decls
+        machines = [d for d in decls if isinstance(d, ast.MachineAST)]
+        shared = {
+            d.location.filename
+            for d in decls
+            if not isinstance(d, ast.MachineAST)
+        }
+
+        sources = {}
+        for machine in machines:
+            files = {d.location.filename for d in machine.decls.decls}
+            files.add(machine.location.filename)
+            sources[machine.ident] = files - shared
+        return sources
+
+    def writeCodeFiles(self, code_path, includes, jobs=1):
+        self.symtab.writeCodeFiles(code_path, includes, jobs)
 
     def writeHTMLFiles(self, html_path):
         self.symtab.writeHTMLFiles(html_path)
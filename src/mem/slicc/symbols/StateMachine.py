@@ -254,6 +254,15 @@ class StateMachine(Symbol):
                 in_msg_bufs[buf_name].append(port)
         return port_to_buf_map, in_msg_bufs, msg_bufs
 
+    def codeFiles(self):
+        return [
+            f"{self.ident}_Controller.py",
+            f"{self.ident}_Controller.hh",
+            f"{self.ident}_Controller.cc",
+            f"{self.ident}_Transitions.cc",
+            f"{self.ident}_Wakeup.cc",
+        ]
+
     def writeCodeFiles(self, path, includes):
         self.printControllerPython(path)
         self.printControllerHH(path)
@@ -97,6 +97,10 @@ class Symbol(PairContainer):
     def warning(self, message, *args):
         self.location.warning(message, *args)
 
+    def codeFiles(self):
+        """Names of the files that writeCodeFiles writes"""
+        return []
+
     def writeHTMLFiles(self, path):
         pass
 
@@ -25,13 +25,43 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import functools
+import hashlib
+import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
 
+import code_formatter
+
+import slicc
 from slicc.generate import html
 from slicc.symbols.StateMachine import StateMachine
 from slicc.symbols.Type import Type
 from slicc.util import Location
 
+# Symbols that forked workers generate code for; see writeCodeFiles
+_writing = []
+
+
+@functools.lru_cache(maxsize=None)
+def generatorDigest():
+    """Hash the source of SLICC and code_formatter, so that changes to the
+    generators themselves invalidate generated code"""
+    paths = [code_formatter.__file__]
+    for root, dirs, files in os.walk(os.path.dirname(slicc.__file__)):
+        paths.extend(os.path.join(root, f) for f in files if f.endswith(".py"))
+
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _writeCodeFiles(index, path, includes):
+    _writing[index].writeCodeFiles(path, includes)
+
 
 def makeDir(path):
     """Make a directory if it doesn't exist.  If the path does exist,
@@ -133,7 +163,40 @@ class SymbolTable:
             if isinstance(symbol, type):
                 yield symbol
 
-    def writeCodeFiles(self, path, includes):
+    def sourceKeys(self, includes):
+        """Return a key for each symbol that changes whenever any of the
+        source files that its generated code depends on change.
+
+        A machine only depends on the files its own declarations come from
+        and the files declaring things outside of any machine; everything
+        declared outside of a machine (e.g., MachineType) depends on all of
+        the files."""
+        sources = self.slicc.sources
+        machines = self.slicc.machineSources().values()
+        shared = set(sources).difference(*machines)
+
+        keys = {}
+        for symbol in self.sym_vec:
+            filename = symbol.location.filename
+            deps = set().union(*(f for f in machines if filename in f))
+            deps = (deps | shared) if deps else set(sources)
+
+            digest = hashlib.sha1()
+            digest.update(generatorDigest().encode())
+            for item in [type(symbol).__name__, str(symbol), *includes]:
+                digest.update(item.encode() + b"\0")
+            for filename in sorted(deps):
+                digest.update(f"{filename}\0{sources[filename]}\0".encode())
+            keys[symbol] = digest.hexdigest()
+        return keys
+
+    def writeCodeFiles(self, path, includes, jobs=1):
+        """Write the code for every symbol to path.
+
+        The key of the symbol behind each generated file is cached in path,
+        and symbols whose files all exist with an unchanged key are skipped.
+        Machines are written by up to jobs processes at once.
+        """
         makeDir(path)
 
         code = self.codeFormatter()
@@ -147,8 +210,54 @@ class SymbolTable:
 
         code.write(path, "Types.hh")
 
-        for symbol in self.sym_vec:
-            symbol.writeCodeFiles(path, includes)
+        cache_path = os.path.join(path, f".{self.slicc.protocol}.slicc-cache")
+        try:
+            with open(cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+
+        keys = self.sourceKeys(includes)
+        stale = [
+            symbol
+            for symbol in self.sym_vec
+            if any(
+                cache.get(f) != keys[symbol]
+                or not os.path.exists(os.path.join(path, f))
+                for f in symbol.codeFiles()
+            )
+        ]
+
+        machines = [s for s in stale if isinstance(s, StateMachine)]
+        jobs = min(jobs or 1, len(machines))
+        for symbol in stale:
+            if jobs < 2 or symbol not in machines:
+                symbol.writeCodeFiles(path, includes)
+
+        if jobs > 1:
+            # Fork so that the workers inherit the symbol table rather than
+            # having to pickle it
+            _writing[:] = machines
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(jobs, mp_context=context) as executor:
+                futures = [
+                    executor.submit(_writeCodeFiles, i, path, includes)
+                    for i in range(len(machines))
+                ]
+                for future in futures:
+                    future.result()
+            _writing.clear()
+
+        written = {
+            f: keys[symbol]
+            for symbol in self.sym_vec
+            for f in symbol.codeFiles()
+        }
+        if written != cache:
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(written, f, indent=0, sort_keys=True)
+            os.replace(tmp_path, cache_path)
 
     def writeHTMLFiles(self, path):
         makeDir(path)
@@ -207,6 +207,11 @@ class Type(Symbol):
             return True
         return False
 
+    def codeFiles(self):
+        if self.isExternal:
+            return []
+        return [f"{self.c_ident}.hh", f"{self.c_ident}.cc"]
+
     def writeCodeFiles(self, path, includes):
         if self.isExternal:
             # Do nothing
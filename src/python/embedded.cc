@@ -48,6 +48,7 @@
 #include <cstdlib>
 #include <iostream>
 #include <list>
+#include <vector>
 
 namespace py = pybind11;
 
@@ -70,29 +71,40 @@ EmbeddedPython::getList()
 
 /*
  * Uncompress and unmarshal the code object stored in the
- * EmbeddedPython
+ * EmbeddedPython. Code which is stored uncompressed (zlen == len) is
+ * unmarshalled directly from the embedded data, without a copy.
  */
 py::object
 EmbeddedPython::getCode() const
 {
-    Bytef marshalled[len];
+    auto marshal = py::module_::import("marshal");
+    if (zlen == len)
+        return marshal.attr("loads")(py::memoryview::from_memory(code, len));
+
+    std::vector<Bytef> marshalled(len);
     uLongf unzlen = len;
-    int ret = uncompress(marshalled, &unzlen, (const Bytef *)code, zlen);
+    int ret = uncompress(marshalled.data(), &unzlen, (const Bytef *)code,
+            zlen);
     if (ret != Z_OK) {
         std::cerr << "Could not uncompress code: " << zError(ret) << std::endl;
         std::abort();
     }
     assert(unzlen == (uLongf)len);
 
-    auto marshal = py::module_::import("marshal");
-    return marshal.attr("loads")(py::bytes((char *)marshalled, len));
+    return marshal.attr("loads")(
+            py::bytes((const char *)marshalled.data(), len));
 }
 
+/*
+ * Add the module to the importer. The code object is only uncompressed and
+ * unmarshalled when the module is imported.
+ */
 bool
 EmbeddedPython::addModule() const
 {
     auto importer = py::module_::import("importer");
-    importer.attr("add_module")(abspath, modpath, getCode());
+    importer.attr("add_module")(abspath, modpath,
+            py::cpp_function([this]() { return getCode(); }));
     return true;
 }
 
@@ -51,7 +51,9 @@ namespace gem5
 {
 
 /*
- * Data structure describing an embedded python file.
+ * Data structure describing an embedded python file. The marshalled code
+ * object is zlen bytes of zlib compressed data, or is stored uncompressed
+ * if zlen == len.
  */
 struct EmbeddedPython
 {
@@ -24,11 +24,15 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
 import json
+import os
+import pickle
 from math import ceil
 from pathlib import Path
 from typing import (
     List,
+    Optional,
     Tuple,
 )
 
@@ -36,6 +40,16 @@ from m5.objects import SpatterKernelType
 from m5.params import Addr
 from m5.util import inform
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The version of the format of the prepared kernels cached by
+# `prepare_kernels`. Bump this if the cached data, or how it's prepared,
+# changes.
+_PREPARED_KERNELS_FORMAT = 1
+
 
 class SpatterKernel:
     """This class encapsulates one kernel in a spatter trace.
@@ -171,6 +185,14 @@ class SpatterKernel:
     def empty(self):
         return len(self._trace) == 0
 
+    def _trace_list(self, end=None) -> List[int]:
+        # The trace is either a list, or a NumPy array prepared by
+        # `prepare_kernels`.
+        trace = self._trace if end is None else self._trace[:end]
+        if isinstance(trace, list):
+            return trace
+        return trace.tolist() if hasattr(trace, "tolist") else list(trace)
+
     def cxx_call_args(self):
         return [
             self._id,
@@ -184,14 +206,16 @@ class SpatterKernel:
             self._base_index_addr,
             self._value_size,
             self._base_value_addr,
-            self._trace,
+            # The trace may be a NumPy array, which is converted to a list
+            # of ints in one go rather than element by element by pybind.
+            self._trace_list(),
         ]
 
     def __str__(self):
         return (
             f"SpatterKernel(id={self._id}, delta={self._delta}, "
             f"count={self._count}, type={self._type}, "
-            f"trace[:8]={self._trace[:8]}"
+            f"trace[:8]={self._trace_list(8)}"
         )
 
 
@@ -278,28 +302,80 @@ def unroll_trace(
         )
 
     og_len = len(original_trace)
+    if np is not None and og_len > 0:
+        ret_count, ret_trace = _unroll_array(
+            np.asarray(original_trace, dtype=np.int64),
+            delta,
+            count,
+            min_elements,
+            fill_zero,
+            fill_pattern,
+        )
+        if isinstance(original_trace, list):
+            ret_trace = ret_trace.tolist()
+        return ret_count, ret_trace
+
     ret_count = count
-    ret_trace = original_trace
+    ret_trace = list(original_trace)
     while (len(ret_trace) < min_elements) and ret_count > 1:
         ret_trace += [element + delta for element in ret_trace[-og_len:]]
         ret_count -= 1
     if (len(ret_trace) < min_elements) and fill_zero:
-        inform(
-            "You have chosen to fill the trace with zero "
-            f"until it reaches at least {min_elements} elements."
-        )
+        _inform_fill_zero(min_elements)
         ret_trace += [0] * (min_elements - len(ret_trace))
     if (len(ret_trace) < min_elements) and fill_pattern:
-        inform(
-            "You have chosen to fill the trace with the pattern "
-            "(without dectementing count) until it "
-            f"reaches at least {min_elements} elements."
-        )
+        _inform_fill_pattern(min_elements)
         while len(ret_trace) < min_elements:
             ret_trace += [element + delta for element in ret_trace[-og_len:]]
     return ret_count, ret_trace
 
 
+def _inform_fill_zero(min_elements: int) -> None:
+    inform(
+        "You have chosen to fill the trace with zero "
+        f"until it reaches at least {min_elements} elements."
+    )
+
+
+def _inform_fill_pattern(min_elements: int) -> None:
+    inform(
+        "You have chosen to fill the trace with the pattern "
+        "(without dectementing count) until it "
+        f"reaches at least {min_elements} elements."
+    )
+
+
+def _unroll_array(
+    original_trace: "np.ndarray",
+    delta: int,
+    count: int,
+    min_elements: int,
+    fill_zero: bool,
+    fill_pattern: bool,
+) -> Tuple[int, "np.ndarray"]:
+    """
+    Unrolls a (non-empty) trace as `unroll_trace` does, in one broadcast add
+    of the multiples of `delta` to the trace.
+    """
+    og_len = len(original_trace)
+    # The number of copies of the trace needed to have `min_elements`.
+    copies = max(1, ceil(min_elements / og_len))
+    unrolled = min(copies, max(1, count))
+    ret_count = count - (unrolled - 1)
+    if unrolled < copies and fill_pattern:
+        _inform_fill_pattern(min_elements)
+        unrolled = copies
+
+    steps = np.arange(unrolled, dtype=np.int64) * delta
+    ret_trace = (steps[:, None] + original_trace[None, :]).ravel()
+    if len(ret_trace) < min_elements and fill_zero:
+        _inform_fill_zero(min_elements)
+        ret_trace = np.concatenate(
+            (ret_trace, np.zeros(min_elements - len(ret_trace), np.int64))
+        )
+    return ret_count, ret_trace
+
+
 def partition_trace(original_trace, num_partitions, interleave_size):
     if len(original_trace) < (num_partitions * interleave_size):
         raise ValueError(
@@ -311,6 +387,14 @@ def partition_trace(original_trace, num_partitions, interleave_size):
             "or it being folded too many times. You can solve "
             "this issue by using the `unroll_trace` function. "
         )
+    if np is not None:
+        partitions = _partition_array(
+            np.asarray(original_trace), num_partitions, interleave_size
+        )
+        if isinstance(original_trace, list):
+            partitions = [partition.tolist() for partition in partitions]
+        return partitions
+
     partitions = [[] for _ in range(num_partitions)]
     num_leaves = ceil(len(original_trace) / interleave_size)
     for i in range(num_leaves):
@@ -322,6 +406,122 @@ def partition_trace(original_trace, num_partitions, interleave_size):
     return partitions
 
 
+def _partition_array(
+    original_trace: "np.ndarray", num_partitions: int, interleave_size: int
+) -> List["np.ndarray"]:
+    """
+    Partitions a trace as `partition_trace` does. The whole rounds of
+    leaves (`interleave_size` elements for each partition) are viewed as a
+    (round, partition, element) array, so each partition is a strided view,
+    and the remaining leaves, fewer than one per partition, are appended.
+    """
+    round_size = num_partitions * interleave_size
+    num_rounds = len(original_trace) // round_size
+    rounds = original_trace[: num_rounds * round_size].reshape(
+        num_rounds, num_partitions, interleave_size
+    )
+    rest = original_trace[num_rounds * round_size :]
+    return [
+        np.concatenate(
+            (
+                rounds[:, i, :].ravel(),
+                rest[i * interleave_size : (i + 1) * interleave_size],
+            )
+        )
+        for i in range(num_partitions)
+    ]
+
+
+def _compact(trace: "np.ndarray") -> "np.ndarray":
+    """Stores a trace as 32-bit indices, as gem5::SpatterGen takes them, if
+    they fit.
+    """
+    if len(trace) and trace.min() >= 0 and trace.max() <= 0xFFFFFFFF:
+        return trace.astype(np.uint32)
+    return trace
+
+
+def _prepare_traces(
+    trace_data: bytes, num_cores: int, interleave_size: int
+) -> List[Tuple[int, int, str, List]]:
+    """
+    Returns the delta, unrolled count, type, and per core traces of each
+    kernel of a spatter trace.
+    """
+    prepared = []
+    for kernel in json.loads(trace_data):
+        delta, count, type, og_trace = parse_kernel(kernel)
+        if np is not None:
+            og_trace = np.asarray(og_trace, dtype=np.int64)
+        new_count, unrolled_trace = unroll_trace(
+            og_trace,
+            delta,
+            count,
+            num_cores * interleave_size,
+            fill_pattern=True,
+        )
+        traces = partition_trace(unrolled_trace, num_cores, interleave_size)
+        if np is not None:
+            traces = [_compact(trace) for trace in traces]
+        prepared.append((delta, new_count, type.value, traces))
+    return prepared
+
+
+def _get_prepared_kernels_cache_path(
+    trace_data: bytes, num_cores: int, interleave_size: int
+) -> Optional[Path]:
+    """
+    Returns the location of the cached prepared kernels of a trace, or
+    ``None`` if prepared kernels are not to be cached. They are only cached
+    if NumPy is installed.
+
+    Caches are kept in ``GEM5_SPATTER_CACHE_DIR`` if set, otherwise in
+    ``~/.cache/gem5/spatter``. Setting ``GEM5_SPATTER_CACHE_DIR`` to an
+    empty string disables caching.
+    """
+    cache_dir = os.getenv(
+        "GEM5_SPATTER_CACHE_DIR",
+        os.path.join(Path.home(), ".cache", "gem5", "spatter"),
+    )
+    if not cache_dir or np is None:
+        return None
+    digest = hashlib.sha256(trace_data).hexdigest()
+    return Path(cache_dir) / f"{digest}-{num_cores}-{interleave_size}.pkl"
+
+
+def _load_prepared_kernels(
+    cache_path: Path,
+) -> Optional[List[Tuple[int, int, str, List]]]:
+    try:
+        with open(cache_path, "rb") as f:
+            cache_format, prepared = pickle.load(f)
+    except Exception:
+        return None
+    if cache_format != _PREPARED_KERNELS_FORMAT:
+        return None
+    return prepared
+
+
+def _save_prepared_kernels(
+    cache_path: Path, prepared: List[Tuple[int, int, str, List]]
+) -> None:
+    # If the prepared kernels can't be saved (e.g., the cache directory is on
+    # a full or read-only filesystem), the next simulation that uses this
+    # trace partitions it from scratch, as it would without a cache.
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (_PREPARED_KERNELS_FORMAT, prepared),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
 def prepare_kernels(
     trace_path: Path,
     num_cores: int,
@@ -339,6 +539,9 @@ def prepare_kernels(
     it will ask `unroll_trace` to fill the trace with elements from the
     pattern. It will return a list of list of kernels where each list of
     kernels represents a kernel with a length of `num_cores`.
+    If NumPy is installed, the traces are prepared as NumPy arrays, and are
+    cached (see `GEM5_SPATTER_CACHE_DIR`) keyed by the contents of the trace,
+    `num_cores`, and `interleave_size`.
     Args:
         trace_path (Path): Path to the spatter trace.
         num_cores (int): Number of cores to partition the trace.
@@ -349,19 +552,18 @@ def prepare_kernels(
         List[List[SpatterKernel]]: A list of list of kernels where each list
         of kernels represents a kernel with a length of `num_cores`.
     """
-    trace_file = trace_path.open("r")
-    kernels = json.load(trace_file)
+    trace_data = Path(trace_path).read_bytes()
+    cache_path = _get_prepared_kernels_cache_path(
+        trace_data, num_cores, interleave_size
+    )
+    prepared = _load_prepared_kernels(cache_path) if cache_path else None
+    if prepared is None:
+        prepared = _prepare_traces(trace_data, num_cores, interleave_size)
+        if cache_path:
+            _save_prepared_kernels(cache_path, prepared)
+
     ret = []
-    for i, kernel in enumerate(kernels):
-        delta, count, type, og_trace = parse_kernel(kernel)
-        new_count, unrolled_trace = unroll_trace(
-            og_trace,
-            delta,
-            count,
-            num_cores * interleave_size,
-            fill_pattern=True,
-        )
-        traces = partition_trace(unrolled_trace, num_cores, interleave_size)
+    for i, (delta, new_count, type, traces) in enumerate(prepared):
         temp = []
         for j, trace in enumerate(traces):
             temp.append(
@@ -369,7 +571,7 @@ def prepare_kernels(
                     kernel_id=i,
                     kernel_delta=delta,
                     kernel_count=new_count,
-                    kernel_type=type,
+                    kernel_type=SpatterKernelType(type),
                     base_index=j * interleave_size,
                     indices_per_stride=interleave_size,
                     stride_size=interleave_size * num_cores,
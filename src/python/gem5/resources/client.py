@@ -46,6 +46,7 @@ from _m5 import core
 
 from gem5.gem5_default_config import config
 
+from .client_api.abstract_client import resource_sort_key
 from .client_api.atlasclient import AtlasClient
 from .client_api.client_query import ClientQuery
 from .client_api.jsonclient import JSONClient
@@ -358,26 +359,4 @@ def _sort_resources(resources: List) -> List:
 
     :return: A list of sorted resources.
     """
-
-    def sort_tuple(resource: Dict) -> Tuple:
-        """This is used for sorting resources by ID and version. First
-        the ID is sorted, then the version. In cases where the version
-        contains periods, it's assumed this is to separate a
-        ``major.minor.hotfix`` style versioning system. In which case, the
-        value separated in the most-significant position is sorted before
-        those less significant. If the value is a digit it is cast as an
-        int, otherwise, it is cast as a string, to lower-case.
-        """
-        to_return = (resource["id"].lower(),)
-        for val in resource["resource_version"].split("."):
-            if val.isdigit():
-                to_return += (int(val),)
-            else:
-                to_return += (str(val).lower(),)
-        return to_return
-
-    return sorted(
-        resources,
-        key=lambda resource: sort_tuple(resource),
-        reverse=True,
-    )
+    return sorted(resources, key=resource_sort_key, reverse=True)
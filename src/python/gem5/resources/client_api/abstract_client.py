@@ -29,6 +29,7 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from functools import lru_cache
 from typing import (
     Any,
     Dict,
@@ -40,6 +41,31 @@ from typing import (
 from .client_query import ClientQuery
 
 
+@lru_cache(maxsize=None)
+def _version_key(resource_version: str) -> Tuple:
+    """Returns the sort key of a resource version. Resource versions are
+    shared by many resources, so the key of each is computed only once.
+    """
+    return tuple(
+        int(val) if val.isdigit() else val.lower()
+        for val in resource_version.split(".")
+    )
+
+
+def resource_sort_key(resource: Dict) -> Tuple:
+    """This is used for sorting resources by ID and version. First
+    the ID is sorted, then the version. In cases where the version
+    contains periods, it's assumed this is to separate a
+    ``major.minor.hotfix`` style versioning system. In which case, the
+    value separated in the most-significant position is sorted before
+    those less significant. If the value is a digit it is cast as an
+    int, otherwise, it is cast as a string, to lower-case.
+    """
+    return (resource["id"].lower(),) + _version_key(
+        resource["resource_version"]
+    )
+
+
 class AbstractClient(ABC):
     def _url_validator(self, url: str) -> bool:
         """
@@ -87,29 +113,7 @@ class AbstractClient(ABC):
 
         :return: A list of sorted resources.
         """
-
-        def sort_tuple(resource: Dict) -> Tuple:
-            """This is used for sorting resources by ID and version. First
-            the ID is sorted, then the version. In cases where the version
-            contains periods, it's assumed this is to separate a
-            ``major.minor.hotfix`` style versioning system. In which case, the
-            value separated in the most-significant position is sorted before
-            those less significant. If the value is a digit it is cast as an
-            int, otherwise, it is cast as a string, to lower-case.
-            """
-            to_return = (resource["id"].lower(),)
-            for val in resource["resource_version"].split("."):
-                if val.isdigit():
-                    to_return += (int(val),)
-                else:
-                    to_return += (str(val).lower(),)
-            return to_return
-
-        return sorted(
-            resources,
-            key=lambda resource: sort_tuple(resource),
-            reverse=True,
-        )
+        return sorted(resources, key=resource_sort_key, reverse=True)
 
     def filter_incompatible_resources(
         self,
@@ -148,6 +152,7 @@ class AbstractClient(ABC):
             for version in resource["gem5_versions"]:
                 if gem5_version.startswith(version):
                     filtered_resources.append(resource)
+                    break
         return filtered_resources
 
     def get_resources_by_id(
@@ -162,5 +167,22 @@ class AbstractClient(ABC):
                             - gem5_version: The version of gem5.
 
         :return: A list of all the Resources with the given ID.
+
+        Results are cached for the lifetime of the client, so repeating a
+        query (e.g., obtaining the same resource for several simulations)
+        does not search, sort and filter the source's resources again.
         """
-        return self.get_resources(client_queries=client_queries)
+        key = tuple(
+            (
+                query.get_resource_id(),
+                query.get_resource_version(),
+                query.get_gem5_version(),
+            )
+            for query in client_queries
+        )
+        # Clients do not call ``AbstractClient.__init__``, so the cache is
+        # created on first use.
+        cache = self.__dict__.setdefault("_resources_by_id_cache", {})
+        if key not in cache:
+            cache[key] = self.get_resources(client_queries=client_queries)
+        return dict(cache[key])
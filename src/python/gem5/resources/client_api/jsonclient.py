@@ -36,12 +36,19 @@ from typing import (
     Union,
 )
 from urllib import request
-from urllib.error import URLError
+from urllib.error import (
+    HTTPError,
+    URLError,
+)
 
 from m5.util import warn
 
 from .abstract_client import AbstractClient
 from .client_query import ClientQuery
+from .resource_catalogue import (
+    ResourceCatalogue,
+    get_catalogue_cache_path,
+)
 
 
 class JSONClient(AbstractClient):
@@ -49,26 +56,97 @@ class JSONClient(AbstractClient):
         """
         Initializes a JSON client.
 
+        The resources are indexed in a ``ResourceCatalogue``, which is cached
+        on disk. The cached catalogue is reused while the source is unchanged,
+        as determined by a local file's size and mtime or a remote file's
+        ``ETag`` or ``Last-Modified`` header.
+
         :param path: The path to the Resource, either URL or local.
         """
         self.path = path
-        self.resources = []
+        cache_path = get_catalogue_cache_path(str(self.path))
+        cached = ResourceCatalogue.load(cache_path) if cache_path else None
 
         if Path(self.path).is_file():
-            self.resources = json.load(open(self.path))
+            st = Path(self.path).stat()
+            source_key = ("file", st.st_size, st.st_mtime_ns)
+            if cached and cached.get_source_key() == source_key:
+                self._catalogue = cached
+            else:
+                with open(self.path) as f:
+                    self._catalogue = self._build_catalogue(
+                        self._resources_from_json(json.load(f)),
+                        source_key,
+                        cache_path,
+                    )
         elif not self._url_validator(self.path):
             raise Exception(
                 f"Resources location '{self.path}' is not a valid path or URL."
             )
         else:
             req = request.Request(self.path)
+            if cached and cached.get_source_key():
+                header, value = cached.get_source_key()
+                if header == "ETag":
+                    req.add_header("If-None-Match", value)
+                else:
+                    req.add_header("If-Modified-Since", value)
             try:
                 response = request.urlopen(req)
+            except HTTPError as e:
+                if e.code != 304:
+                    raise Exception(
+                        f"Unable to open Resources location '{self.path}': {e}"
+                    )
+                # 304 Not Modified: the cached catalogue is up to date.
+                response = None
             except URLError as e:
                 raise Exception(
                     f"Unable to open Resources location '{self.path}': {e}"
                 )
-            self.resources = json.loads(response.read().decode("utf-8"))
+            if response is None:
+                self._catalogue = cached
+            else:
+                source_key = None
+                if response.headers.get("ETag"):
+                    source_key = ("ETag", response.headers["ETag"])
+                elif response.headers.get("Last-Modified"):
+                    source_key = (
+                        "Last-Modified",
+                        response.headers["Last-Modified"],
+                    )
+                self._catalogue = self._build_catalogue(
+                    self._resources_from_json(
+                        json.loads(response.read().decode("utf-8"))
+                    ),
+                    source_key,
+                    cache_path,
+                )
+        self.resources = self._catalogue.get_resources_json()
+
+    @staticmethod
+    def _resources_from_json(data: Any) -> List[Dict[str, Any]]:
+        """
+        Returns the list of resources in a loaded resources JSON. A lockfile
+        written by ``prefetch_resources`` may be given in place of a
+        resources JSON, in which case the resources it records are returned.
+        """
+        if isinstance(data, dict) and "resources" in data:
+            return [entry["resource"] for entry in data["resources"].values()]
+        return data
+
+    def _build_catalogue(
+        self,
+        resources: List[Dict[str, Any]],
+        source_key: Optional[Tuple],
+        cache_path: Optional[Path],
+    ) -> ResourceCatalogue:
+        catalogue = ResourceCatalogue(
+            resources, self.sort_resources, source_key=source_key
+        )
+        if cache_path and source_key:
+            catalogue.save(cache_path)
+        return catalogue
 
     def get_resources_json(self) -> List[Dict[str, Any]]:
         """Returns a JSON representation of the resources."""
@@ -78,59 +156,4 @@ class JSONClient(AbstractClient):
         self,
         client_queries: List[ClientQuery],
     ) -> Dict[str, Any]:
-        def filter_resource(resource, client_queries):
-            for resource_query in client_queries:
-                gem5_version_match = False
-                resource_version_match = False
-
-                if (
-                    resource_query.get_gem5_version() is not None
-                    and not resource_query.get_gem5_version().startswith(
-                        "DEVELOP"
-                    )
-                ):
-                    gem5_version_match = (
-                        resource_query.get_gem5_version()
-                        in resource["gem5_versions"]
-                    )
-                else:
-                    gem5_version_match = True
-
-                if resource_query.get_resource_version() is not None:
-                    resource_version_match = (
-                        resource["resource_version"]
-                        == resource_query.get_resource_version()
-                    )
-                else:
-                    resource_version_match = True
-
-                resource_id_match = (
-                    resource_query.get_resource_id() == resource["id"]
-                )
-
-                if (
-                    gem5_version_match
-                    and resource_version_match
-                    and resource_id_match
-                ):
-                    return True
-
-            return False
-
-        filtered_resources = filter(
-            lambda resource: filter_resource(resource, client_queries),
-            self.resources,
-        )
-
-        resources_by_id = {}
-        for resource in filtered_resources:
-            if resource["id"] in resources_by_id.keys():
-                resources_by_id[resource["id"]].append(resource)
-            else:
-                resources_by_id[resource["id"]] = [resource]
-
-        # Sort the resoruces by resoruce version and get the latest version.
-        for id, resource_list in resources_by_id.items():
-            resources_by_id[id] = self.sort_resources(resource_list)[0]
-
-        return resources_by_id
+        return self._catalogue.get_resources(client_queries)
@@ -0,0 +1,206 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+
+from .client_query import ClientQuery
+
+"""
+An indexed catalogue of the resources held by a client.
+
+The catalogue is built once from a client's list of resources and answers
+``ClientQuery`` lookups by ID, and by ID and version, with dictionary lookups
+rather than a scan of every resource. It may be persisted to a cache file so
+that later processes need not parse and index the source again.
+"""
+
+# Bumped whenever the layout of the pickled catalogue changes.
+_CATALOGUE_FORMAT = 1
+
+
+class ResourceCatalogue:
+    def __init__(
+        self,
+        resources: List[Dict[str, Any]],
+        sort_resources: Callable[[List], List],
+        source_key: Optional[Tuple] = None,
+    ):
+        """
+        :param resources: The resources, as loaded from the resources JSON.
+        :param sort_resources: The function used to sort a list of resources
+                               with the same ID, latest version first. This is
+                               ``AbstractClient.sort_resources``.
+        :param source_key: A value identifying the version of the source the
+                           resources were loaded from (e.g., its mtime or
+                           ETag). Used to invalidate a persisted catalogue.
+        """
+        self._resources = resources
+        self._source_key = source_key
+
+        # ID -> resources with that ID, sorted latest version first.
+        self._by_id: Dict[str, List[Dict[str, Any]]] = {}
+        for resource in resources:
+            self._by_id.setdefault(resource["id"], []).append(resource)
+        for id, resource_list in self._by_id.items():
+            self._by_id[id] = sort_resources(resource_list)
+
+        # (ID, version) -> positions, in `_by_id[id]`, of the resources with
+        # that version.
+        self._by_id_version: Dict[Tuple[str, str], List[int]] = {}
+        # ID -> the gem5 versions each resource in `_by_id[id]` supports.
+        self._gem5_versions: Dict[str, List[FrozenSet[str]]] = {}
+        for id, resource_list in self._by_id.items():
+            for position, resource in enumerate(resource_list):
+                self._by_id_version.setdefault(
+                    (id, resource["resource_version"]), []
+                ).append(position)
+            self._gem5_versions[id] = [
+                frozenset(resource.get("gem5_versions", []))
+                for resource in resource_list
+            ]
+
+    def get_source_key(self) -> Optional[Tuple]:
+        return self._source_key
+
+    def get_resources_json(self) -> List[Dict[str, Any]]:
+        """Returns the resources, in the order of the source."""
+        return self._resources
+
+    def _matching_positions(self, client_query: ClientQuery) -> List[int]:
+        """
+        Returns the positions, in ``_by_id`` for the query's ID, of the
+        resources matching a query. The matching rules are those of
+        ``JSONClient.get_resources``.
+        """
+        id = client_query.get_resource_id()
+        if id not in self._by_id:
+            return []
+
+        resource_version = client_query.get_resource_version()
+        if resource_version is not None:
+            positions = self._by_id_version.get((id, resource_version), [])
+        else:
+            positions = range(len(self._by_id[id]))
+
+        gem5_version = client_query.get_gem5_version()
+        if gem5_version is None or gem5_version.startswith("DEVELOP"):
+            return list(positions)
+        gem5_versions = self._gem5_versions[id]
+        return [p for p in positions if gem5_version in gem5_versions[p]]
+
+    def get_resources(
+        self, client_queries: List[ClientQuery]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns, for each queried ID, the latest version of the resource
+        which matches any of the queries for that ID. IDs with no matching
+        resource are omitted.
+
+        :param client_queries: The queries to match resources against.
+        """
+        best: Dict[str, int] = {}
+        for client_query in client_queries:
+            positions = self._matching_positions(client_query)
+            if not positions:
+                continue
+            id = client_query.get_resource_id()
+            position = min(positions)
+            if id not in best or position < best[id]:
+                best[id] = position
+        return {id: self._by_id[id][position] for id, position in best.items()}
+
+    def save(self, cache_path: Path) -> None:
+        """
+        Writes the catalogue to a cache file. If the cache directory cannot
+        be written, the catalogue is simply rebuilt from the resources JSON
+        the next time the client is created.
+
+        :param cache_path: The location of the cache file.
+        """
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    (_CATALOGUE_FORMAT, self),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    @classmethod
+    def load(cls, cache_path: Path) -> Optional["ResourceCatalogue"]:
+        """
+        Reads a catalogue written by ``save``. ``None`` is returned if there
+        is no usable catalogue at ``cache_path``.
+
+        :param cache_path: The location of the cache file.
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                catalogue_format, catalogue = pickle.load(f)
+        except Exception:
+            return None
+        if catalogue_format != _CATALOGUE_FORMAT or not isinstance(
+            catalogue, cls
+        ):
+            return None
+        return catalogue
+
+
+def get_catalogue_cache_path(source: str) -> Optional[Path]:
+    """
+    Returns the location of the cache file for the catalogue of a resources
+    source, or ``None`` if catalogues are not to be cached.
+
+    Caches are kept in ``GEM5_RESOURCE_CATALOGUE_DIR`` if set, otherwise in
+    ``~/.cache/gem5/catalogues``. Setting ``GEM5_RESOURCE_CATALOGUE_DIR`` to
+    an empty string disables caching.
+
+    :param source: The path or URL of the resources JSON.
+    """
+    cache_dir = os.getenv(
+        "GEM5_RESOURCE_CATALOGUE_DIR",
+        os.path.join(Path.home(), ".cache", "gem5", "catalogues"),
+    )
+    if not cache_dir:
+        return None
+    name = hashlib.md5(str(source).encode()).hexdigest()
+    return Path(cache_dir) / f"{name}.catalogue"
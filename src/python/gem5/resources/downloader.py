@@ -25,15 +25,22 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import gzip
+import hashlib
+import json
 import os
 import random
 import shutil
 import tarfile
+import threading
 import time
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import (
+    Any,
+    BinaryIO,
+    Callable,
     Dict,
     List,
     Optional,
@@ -52,9 +59,12 @@ from ..utils.socks_ssl_context import get_proxy_context
 from .client import get_resource_json_obj
 from .client import list_resources as client_list_resources
 from .md5_utils import (
+    MD5_CACHE_SUFFIX,
+    md5_cached,
     md5_dir,
     md5_file,
 )
+from .resource_store import get_resource_store
 
 """
 This Python module contains functions used to download, list, and obtain
@@ -62,24 +72,137 @@ information about resources from resources.gem5.org.
 """
 
 
-def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
+# Files smaller than this are downloaded in a single stream.
+_RANGED_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+
+# The size of each range requested when downloading in parallel.
+_RANGED_DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def _get_ranged_download_size(url: str) -> Optional[int]:
     """
-    Downloads a file.
+    Returns the size of the file at ``url`` if the server supports range
+    requests, otherwise ``None``.
 
-    The function will run a Truncated Exponential Backoff algorithm to retry
-    the download if the HTTP Status Code returned is deemed retryable.
+    :param url: The URL of the file to be downloaded.
+    """
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request) as response:
+            if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+                return None
+            length = response.headers.get("Content-Length")
+            return int(length) if length is not None else None
+    except (HTTPError, ValueError):
+        return None
+
+
+def _download_ranged(
+    url: str,
+    download_to: str,
+    total_size: int,
+    num_connections: int,
+    chunk_size: int = _RANGED_DOWNLOAD_CHUNK_SIZE,
+) -> None:
+    """
+    Downloads a file as a set of byte ranges fetched in parallel.
+
+    The ranges are written into ``<download_to>.part`` and the indices of the
+    completed ranges are recorded in ``<download_to>.part.json``. If the
+    download is interrupted, a later call with the same URL only fetches the
+    ranges which are missing. Once all ranges are present the partial file
+    is renamed to ``download_to``.
 
     :param url: The URL of the file to download.
 
     :param download_to: The location the downloaded file is to be stored.
 
-    :param max_attempts: The max number of download attempts before stopping.
-                         The default is 6. This translates to roughly 1 minute
-                         of retrying before stopping.
+    :param total_size: The size of the file, in bytes.
+
+    :param num_connections: The number of ranges fetched at once.
+
+    :param chunk_size: The size of each range, in bytes.
+    """
+    part_path = f"{download_to}.part"
+    state_path = f"{part_path}.json"
+
+    chunks = [
+        (start, min(start + chunk_size, total_size) - 1)
+        for start in range(0, total_size, chunk_size)
+    ]
+
+    done = set()
+    if os.path.exists(part_path) and os.path.exists(state_path):
+        with open(state_path) as f:
+            try:
+                state = json.load(f)
+            except json.JSONDecodeError:
+                state = {}
+        if state.get("url") == url and state.get("size") == total_size:
+            done = set(state["done"])
+    if not done:
+        with open(part_path, "wb") as f:
+            f.truncate(total_size)
+
+    state_lock = threading.Lock()
+
+    with tqdm(
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        miniters=1,
+        total=total_size,
+        initial=sum(chunks[i][1] - chunks[i][0] + 1 for i in done),
+        desc=f"Downloading {download_to}",
+    ) as t:
+
+        def fetch(index: int) -> None:
+            start, end = chunks[index]
+            request = urllib.request.Request(
+                url, headers={"Range": f"bytes={start}-{end}"}
+            )
+            with urllib.request.urlopen(request) as fr:
+                if fr.status != 206:
+                    raise Exception(
+                        f"Server did not honour the range request for '{url}'"
+                    )
+                with open(part_path, "r+b") as fw:
+                    fw.seek(start)
+                    for block in iter(lambda: fr.read(1024 * 1024), b""):
+                        fw.write(block)
+                        if t is not None:
+                            t.update(len(block))
+            with state_lock:
+                done.add(index)
+                with open(state_path, "w") as f:
+                    json.dump(
+                        {"url": url, "size": total_size, "done": list(done)},
+                        f,
+                    )
+
+        with ThreadPoolExecutor(max_workers=num_connections) as executor:
+            # `list` is used to raise any exception thrown by a worker.
+            list(
+                executor.map(
+                    fetch, [i for i in range(len(chunks)) if i not in done]
+                )
+            )
+
+    os.replace(part_path, download_to)
+    os.remove(state_path)
+
+
+def _run_with_retries(action: Callable[[], Any], max_attempts: int) -> Any:
     """
+    Runs a download action, returning its result.
 
-    # TODO: This whole setup will only work for single files we can get via
-    # wget. We also need to support git clones going forward.
+    The function will run a Truncated Exponential Backoff algorithm to retry
+    the action if the HTTP Status Code returned is deemed retryable.
+
+    :param action: The function which performs the download.
+
+    :param max_attempts: The max number of attempts before stopping.
+    """
 
     attempt = 0
     while True:
@@ -88,34 +211,7 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
         # number of download attempts has been reached or if a HTTP status code
         # other than 408, 429, or 5xx is received.
         try:
-            proxy_context = get_proxy_context()
-            if proxy_context:
-                # get the file as a bytes blob
-                request = urllib.request.Request(url)
-                with urllib.request.urlopen(
-                    request, context=proxy_context
-                ) as fr:
-                    with tqdm.wrapattr(
-                        open(download_to, "wb"),
-                        "write",
-                        miniters=1,
-                        desc="Downloading {download_to}",
-                        total=getattr(fr, "length", None),
-                    ) as fw:
-                        for chunk in fr:
-                            fw.write(chunk)
-            else:
-                with tqdm(
-                    unit="B",
-                    unit_scale=True,
-                    unit_divisor=1024,
-                    miniters=1,
-                    desc=f"Downloading {download_to}",
-                ) as t:
-                    urllib.request.urlretrieve(
-                        url, download_to, reporthook=progress_hook(t)
-                    )
-            return
+            return action()
         except HTTPError as e:
             # If the error code retrieved is retryable, we retry using a
             # Truncated Exponential backoff algorithm, truncating after
@@ -165,6 +261,238 @@ def _download(url: str, download_to: str, max_attempts: int = 6) -> None:
             )
 
 
+def _download(
+    url: str,
+    download_to: str,
+    max_attempts: int = 6,
+    num_connections: int = 4,
+) -> None:
+    """
+    Downloads a file.
+
+    The function will run a Truncated Exponential Backoff algorithm to retry
+    the download if the HTTP Status Code returned is deemed retryable.
+
+    If the server supports range requests and the file is large, the file is
+    downloaded over several connections at once. Such downloads are resumed,
+    rather than restarted, when retried.
+
+    :param url: The URL of the file to download.
+
+    :param download_to: The location the downloaded file is to be stored.
+
+    :param max_attempts: The max number of download attempts before stopping.
+                         The default is 6. This translates to roughly 1 minute
+                         of retrying before stopping.
+
+    :param num_connections: The max number of connections used to download a
+                            single file. The default is 4.
+    """
+
+    # TODO: This whole setup will only work for single files we can get via
+    # wget. We also need to support git clones going forward.
+
+    def download() -> None:
+        proxy_context = get_proxy_context()
+        if proxy_context:
+            # get the file as a bytes blob
+            request = urllib.request.Request(url)
+            with urllib.request.urlopen(request, context=proxy_context) as fr:
+                with tqdm.wrapattr(
+                    open(download_to, "wb"),
+                    "write",
+                    miniters=1,
+                    desc="Downloading {download_to}",
+                    total=getattr(fr, "length", None),
+                ) as fw:
+                    for chunk in fr:
+                        fw.write(chunk)
+            return
+
+        total_size = None
+        if num_connections > 1:
+            total_size = _get_ranged_download_size(url)
+        if total_size is not None and total_size >= _RANGED_DOWNLOAD_MIN_SIZE:
+            _download_ranged(
+                url=url,
+                download_to=download_to,
+                total_size=total_size,
+                num_connections=num_connections,
+            )
+            return
+        with tqdm(
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            miniters=1,
+            desc=f"Downloading {download_to}",
+        ) as t:
+            urllib.request.urlretrieve(
+                url, download_to, reporthook=progress_hook(t)
+            )
+
+    _run_with_retries(download, max_attempts)
+
+
+def _open_gzip_stream(fileobj: BinaryIO) -> BinaryIO:
+    """
+    Returns a stream of the decompressed contents of a gzipped stream. The
+    ``isal`` or ``zlib-ng`` implementations are used if installed, as they
+    decompress considerably faster than the standard library.
+
+    :param fileobj: The gzipped stream. It need not be seekable.
+    """
+    try:
+        from isal import igzip
+
+        return igzip.GzipFile(fileobj=fileobj, mode="rb")
+    except ImportError:
+        pass
+    try:
+        from zlib_ng import gzip_ng
+
+        return gzip_ng.GzipFile(fileobj=fileobj, mode="rb")
+    except ImportError:
+        pass
+    return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+
+def _stream_extract(
+    source: BinaryIO, to_path: str, unzip: bool, untar: bool
+) -> Optional[str]:
+    """
+    Writes a resource to ``to_path`` in a single pass over ``source``,
+    decompressing and unpacking it as it is read. The resource is built at a
+    temporary location next to ``to_path`` and renamed into place once
+    complete, so ``to_path`` never holds a partial resource.
+
+    :param source: The stream of the resource as downloaded.
+
+    :param to_path: The location the resource is to be stored.
+
+    :param unzip: If ``True``, the stream is gunzipped.
+
+    :param untar: If ``True``, the stream is unpacked as a tar archive into
+                  a directory at ``to_path``.
+
+    :returns: The md5 of the resource, computed as it is written, if it is a
+              file. ``None`` if it is a directory.
+    """
+    stream = _open_gzip_stream(source) if unzip else source
+    tmp_path = f"{to_path}.{os.getpid()}.partial"
+    md5sum = None
+    try:
+        if untar:
+            os.makedirs(tmp_path)
+            abs_tmp_path = os.path.abspath(tmp_path)
+            # Mode "r|" reads the archive as a stream, without seeking.
+            with tarfile.open(fileobj=stream, mode="r|") as tar:
+                for member in tar:
+                    member_path = os.path.abspath(
+                        os.path.join(tmp_path, member.name)
+                    )
+                    if (
+                        os.path.commonprefix([abs_tmp_path, member_path])
+                        != abs_tmp_path
+                    ):
+                        raise Exception("Attempted Path Traversal in Tar File")
+                    tar.extract(member, tmp_path)
+        else:
+            hash = hashlib.md5()
+            with open(tmp_path, "wb") as f:
+                for block in iter(lambda: stream.read(1024 * 1024), b""):
+                    hash.update(block)
+                    f.write(block)
+            md5sum = hash.hexdigest()
+        os.replace(tmp_path, to_path)
+    except BaseException:
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path)
+        elif os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return md5sum
+
+
+def _stream_download(
+    url: str,
+    to_path: str,
+    unzip: bool,
+    untar: bool,
+    max_attempts: int = 6,
+    num_connections: int = 4,
+) -> Optional[str]:
+    """
+    Downloads a resource, decompressing and unpacking it as it arrives.
+
+    Large files on servers which support range requests are instead
+    downloaded as ``_download`` does, in parallel ranges which are resumed
+    rather than restarted when retried, to ``<to_path>.download``. They are
+    then decompressed and unpacked from there, and the download is removed.
+    Anything else is streamed straight into place without an intermediate
+    copy, and each retry restarts the download from the beginning.
+
+    :param url: The URL of the resource to download.
+
+    :param to_path: The location the resource is to be stored.
+
+    :param unzip: If ``True``, the resource is gunzipped.
+
+    :param untar: If ``True``, the resource is unpacked as a tar archive.
+
+    :param max_attempts: The max number of download attempts before stopping.
+
+    :param num_connections: The max number of connections used to download a
+                            single file. The default is 4.
+
+    :returns: The md5 of the resource if it is a file, otherwise ``None``.
+    """
+    download_to = f"{to_path}.download"
+
+    def download() -> Optional[str]:
+        file_uri_path = _file_uri_to_path(url)
+        proxy_context = None if file_uri_path else get_proxy_context()
+
+        total_size = None
+        if not file_uri_path and not proxy_context and num_connections > 1:
+            total_size = _get_ranged_download_size(url)
+        if total_size is not None and total_size >= _RANGED_DOWNLOAD_MIN_SIZE:
+            _download_ranged(
+                url=url,
+                download_to=download_to,
+                total_size=total_size,
+                num_connections=num_connections,
+            )
+            file_uri_path = Path(download_to)
+
+        if file_uri_path:
+            source = open(file_uri_path, "rb")
+            total = file_uri_path.stat().st_size
+        else:
+            request = urllib.request.Request(url)
+            if proxy_context:
+                source = urllib.request.urlopen(request, context=proxy_context)
+            else:
+                source = urllib.request.urlopen(request)
+            total = getattr(source, "length", None)
+        with source:
+            with tqdm.wrapattr(
+                source,
+                "read",
+                miniters=1,
+                desc=f"Downloading {to_path}",
+                total=total,
+            ) as fr:
+                return _stream_extract(fr, to_path, unzip=unzip, untar=untar)
+
+    try:
+        return _run_with_retries(download, max_attempts)
+    finally:
+        # Only the partial download (``.part``) is kept for resuming later.
+        if os.path.exists(download_to):
+            os.remove(download_to)
+
+
 def list_resources(
     clients: Optional[List] = None, gem5_version: Optional[str] = None
 ) -> Dict[str, List[str]]:
@@ -199,6 +527,7 @@ def get_resource(
     clients: Optional[List] = None,
     gem5_version: Optional[str] = core.gem5Version,
     quiet: bool = False,
+    resource_json: Optional[Dict] = None,
 ) -> None:
     """
     Obtains a gem5 resource and stored it to a specified location. If the
@@ -236,6 +565,10 @@ def get_resource(
     :param quiet: If ``True``, no output will be printed to the console (baring
                   exceptions). ``False`` by default.
 
+    :param resource_json: The resource's JSON object, if it has already been
+                          obtained from the clients. If ``None``, the clients
+                          are queried for it. ``None`` by default.
+
     :raises Exception: An exception is thrown if a file is already present at
                        ``to_path`` but it does not have the correct md5 sum. An
                        exception will also be thrown is a directory is present
@@ -248,35 +581,50 @@ def get_resource(
     # minutes.Most resources should be downloaded and decompressed in this
     # timeframe, even on the most constrained of systems.
     with FileLock(f"{to_path}.lock", timeout=900):
-        resource_json = get_resource_json_obj(
-            resource_name,
-            resource_version=resource_version,
-            clients=clients,
-            gem5_version=gem5_version,
-        )
+        if resource_json is None:
+            resource_json = get_resource_json_obj(
+                resource_name,
+                resource_version=resource_version,
+                clients=clients,
+                gem5_version=gem5_version,
+            )
+
+        # If a resource store is set, the md5 of resources it has already
+        # verified are not recomputed, and resources already in the store
+        # are linked into place rather than downloaded.
+        store = get_resource_store()
 
         if os.path.exists(to_path):
-            if os.path.isfile(to_path):
-                md5 = md5_file(Path(to_path))
+            if store is not None:
+                md5 = store.get_manifest().verified_md5(Path(to_path))
             else:
-                md5 = md5_dir(Path(to_path))
+                md5 = md5_cached(Path(to_path))
 
             if md5 == resource_json["md5sum"]:
                 # In this case, the file has already been download, no need to
                 # do so again.
                 return
             elif download_md5_mismatch:
-                if os.path.isfile(to_path):
+                if os.path.isfile(to_path) or os.path.islink(to_path):
                     os.remove(to_path)
                 else:
                     shutil.rmtree(to_path)
+                if os.path.exists(f"{to_path}{MD5_CACHE_SUFFIX}"):
+                    os.remove(f"{to_path}{MD5_CACHE_SUFFIX}")
             else:
                 raise Exception(
                     "There already a file present at '{}' but "
                     "its md5 value is invalid.".format(to_path)
                 )
 
-        download_dest = to_path
+        if store is not None and store.contains(resource_json["md5sum"]):
+            if not quiet:
+                print(
+                    f"Resource '{resource_name}' found in the resource store "
+                    f"'{store.get_root()}'. Linking to '{to_path}'..."
+                )
+            store.link_into(resource_json["md5sum"], Path(to_path))
+            return
 
         # This if-statement is remain backwards compatable with the older,
         # string-based way of doing things. It can be refactored away over
@@ -304,89 +652,67 @@ def get_resource(
             and resource_json["is_tar_archive"]
         )
 
-        tar_extension = ".tar"
-        if run_tar_extract:
-            download_dest += tar_extension
-
-        zip_extension = ".gz"
-        if run_unzip:
-            download_dest += zip_extension
-
-        file_uri_path = _file_uri_to_path(resource_json["url"])
-        if file_uri_path:
-            if not file_uri_path.exists():
-                raise Exception(
-                    f"Could not find file at path '{file_uri_path}'"
+        # Compressed and archived resources are decompressed and unpacked as
+        # they are downloaded, in a single pass, rather than being written to
+        # disk and then decompressed and unpacked into further copies. Large
+        # ones which can be downloaded in resumable ranges are the exception;
+        # see `_stream_download`.
+        downloaded_md5 = None
+        url = resource_json["url"]
+        file_uri_path = _file_uri_to_path(url)
+        if file_uri_path and not file_uri_path.exists():
+            raise Exception(f"Could not find file at path '{file_uri_path}'")
+
+        if run_unzip or run_tar_extract:
+            if not quiet:
+                print(
+                    f"Resource '{resource_name}' was not found locally. "
+                    f"Downloading and unpacking to '{to_path}'..."
                 )
+            downloaded_md5 = _stream_download(
+                url=url,
+                to_path=to_path,
+                unzip=run_unzip,
+                untar=run_tar_extract,
+            )
+            if not quiet:
+                print(f"Finished obtaining resource '{resource_name}'.")
+        elif file_uri_path:
             print(
                 "Resource '{}' is being copied from '{}' to '{}'...".format(
                     resource_name,
-                    urlparse(resource_json["url"]).path,
-                    download_dest,
+                    urlparse(url).path,
+                    to_path,
                 )
             )
-            shutil.copy(file_uri_path, download_dest)
+            shutil.copy(file_uri_path, to_path)
         else:
-            # TODO: Might be nice to have some kind of download status bar here..
             if not quiet:
                 print(
                     f"Resource '{resource_name}' was not found locally. "
-                    f"Downloading to '{download_dest}'..."
+                    f"Downloading to '{to_path}'..."
                 )
 
-            # Get the URL.
-            url = resource_json["url"]
-
-            _download(url=url, download_to=download_dest)
+            _download(url=url, download_to=to_path)
             if not quiet:
                 print(f"Finished downloading resource '{resource_name}'.")
 
-        if run_unzip:
-            if not quiet:
-                print(
-                    f"Decompressing resource '{resource_name}' "
-                    f"('{download_dest}')..."
-                )
-            unzip_to = download_dest[: -len(zip_extension)]
-            with gzip.open(download_dest, "rb") as f:
-                with open(unzip_to, "wb") as o:
-                    shutil.copyfileobj(f, o)
-            os.remove(download_dest)
-            download_dest = unzip_to
-            if not quiet:
-                print(f"Finished decompressing resource '{resource_name}'.")
-
-        if run_tar_extract:
-            if not quiet:
+        if store is not None:
+            # Only resources which match their md5sum are stored, otherwise
+            # a bad download would be served to every later request.
+            if downloaded_md5 is None:
+                if os.path.isfile(to_path):
+                    downloaded_md5 = md5_file(Path(to_path))
+                else:
+                    downloaded_md5 = md5_dir(Path(to_path))
+            if downloaded_md5 == resource_json["md5sum"]:
+                store.ingest(Path(to_path), downloaded_md5)
+            elif not quiet:
                 print(
-                    f"Unpacking the the resource '{resource_name}' "
-                    f"('{download_dest}')"
+                    f"Resource '{resource_name}' has md5 '{downloaded_md5}' "
+                    f"but '{resource_json['md5sum']}' was expected. It will "
+                    "not be added to the resource store."
                 )
-            unpack_to = download_dest[: -len(tar_extension)]
-            with tarfile.open(download_dest) as f:
-
-                def is_within_directory(directory, target):
-                    abs_directory = os.path.abspath(directory)
-                    abs_target = os.path.abspath(target)
-
-                    prefix = os.path.commonprefix([abs_directory, abs_target])
-
-                    return prefix == abs_directory
-
-                def safe_extract(
-                    tar, path=".", members=None, *, numeric_owner=False
-                ):
-                    for member in tar.getmembers():
-                        member_path = os.path.join(path, member.name)
-                        if not is_within_directory(path, member_path):
-                            raise Exception(
-                                "Attempted Path Traversal in Tar File"
-                            )
-
-                    tar.extractall(path, members, numeric_owner=numeric_owner)
-
-                safe_extract(f, unpack_to)
-            os.remove(download_dest)
 
 
 def _file_uri_to_path(uri: str) -> Optional[Path]:
@@ -26,8 +26,61 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import hashlib
+import json
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Type
+from typing import (
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+# The size of the blocks passed to the hash. ``hashlib`` releases the GIL
+# while hashing blocks this large, so other threads can read ahead.
+_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Files smaller than this are read whole by the read-ahead threads when
+# hashing a directory. Larger files are streamed by the hashing thread.
+_READ_AHEAD_MAX_SIZE = 64 * 1024 * 1024
+
+# The suffix of the sidecar file in which ``md5_cached`` records hashes.
+MD5_CACHE_SUFFIX = ".md5cache"
+
+
+def _stat_signature(path: Path) -> List:
+    """
+    Returns a cheap signature of a file or directory which changes if its
+    contents are likely to have changed.
+
+    For a file this is its size, mtime, and inode. For a directory it is a
+    digest of the signatures of every entry within it.
+
+    :param path: The path to obtain the signature of.
+    """
+    st = os.stat(path)
+    if not path.is_dir():
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    digest = hashlib.md5()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            file_st = os.stat(file_path)
+            digest.update(
+                "{}:{}:{}:{}\n".format(
+                    os.path.relpath(file_path, path),
+                    file_st.st_size,
+                    file_st.st_mtime_ns,
+                    file_st.st_ino,
+                ).encode()
+            )
+    return [st.st_ino, digest.hexdigest()]
 
 
 def _md5_update_from_file(
@@ -35,7 +88,8 @@ def _md5_update_from_file(
 ) -> Type[hashlib.md5]:
     assert filename.is_file()
 
-    if filename.stat().st_size < 1024 * 1024 * 100:
+    size = filename.stat().st_size
+    if size < 1024 * 1024 * 100:
         from ..utils.progress_bar import FakeTQDM
 
         # if the file is less than 100MB, no need to show a progress bar.
@@ -43,28 +97,92 @@ def _md5_update_from_file(
     else:
         from ..utils.progress_bar import tqdm
 
-    with tqdm.wrapattr(
-        open(str(filename), "rb"),
-        "read",
+    if size == 0:
+        # Empty files cannot be memory mapped.
+        return hash
+
+    with tqdm(
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
         miniters=1,
         desc=f"Computing md5sum on {filename}",
-        total=filename.stat().st_size,
-    ) as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash.update(chunk)
+        total=size,
+    ) as t:
+        with open(str(filename), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                view = memoryview(m)
+                try:
+                    for offset in range(0, size, _BLOCK_SIZE):
+                        block = view[offset : offset + _BLOCK_SIZE]
+                        hash.update(block)
+                        block.release()
+                        if t is not None:
+                            t.update(min(_BLOCK_SIZE, size - offset))
+                finally:
+                    view.release()
     return hash
 
 
-def _md5_update_from_dir(
-    directory: Path, hash: Type[hashlib.md5]
-) -> Type[hashlib.md5]:
+def _dir_hash_items(directory: Path) -> Iterator[Tuple[bytes, Optional[Path]]]:
+    """
+    Yields the items hashed by ``md5_dir``, in the order they are hashed.
+
+    Each item is the encoded name of an entry and, if the entry is a file,
+    its path. The order matches a depth-first walk in which the entries of
+    each directory are sorted case-insensitively.
+    """
     assert directory.is_dir()
     for path in sorted(directory.iterdir(), key=lambda p: str(p).lower()):
-        hash.update(path.name.encode())
         if path.is_file():
-            hash = _md5_update_from_file(path, hash)
-        elif path.is_dir():
-            hash = _md5_update_from_dir(path, hash)
+            yield path.name.encode(), path
+        else:
+            yield path.name.encode(), None
+            if path.is_dir():
+                yield from _dir_hash_items(path)
+
+
+def _read_small_file(path: Path) -> Optional[bytes]:
+    if path.stat().st_size >= _READ_AHEAD_MAX_SIZE:
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _md5_update_from_dir(
+    directory: Path,
+    hash: Type[hashlib.md5],
+    max_workers: Optional[int] = None,
+) -> Type[hashlib.md5]:
+    # An md5 can only be computed sequentially, so the files are still hashed
+    # in order. A pool of threads reads the small files ahead of the hashing
+    # thread so the I/O of many files overlaps. At most `2 * max_workers`
+    # files are held in memory at once.
+    if max_workers is None:
+        max_workers = min(8, os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+
+        def hash_next() -> None:
+            name, path, future = pending.popleft()
+            hash.update(name)
+            if path is not None:
+                data = future.result()
+                if data is None:
+                    _md5_update_from_file(path, hash)
+                else:
+                    hash.update(data)
+
+        for name, path in _dir_hash_items(directory):
+            future = None
+            if path is not None:
+                future = executor.submit(_read_small_file, path)
+            pending.append((name, path, future))
+            while len(pending) > 2 * max_workers:
+                hash_next()
+        while pending:
+            hash_next()
     return hash
 
 
@@ -105,3 +223,37 @@ def md5_dir(directory: Path) -> str:
         if empty files are included or filenames are changed.
     """
     return str(_md5_update_from_dir(directory, hashlib.md5()).hexdigest())
+
+
+def md5_cached(path: Path) -> str:
+    """
+    Gets the md5 value of a file or directory, as ``md5`` does, but records
+    the value in a ``<path>.md5cache`` sidecar file. Later calls return the
+    recorded value without rehashing, until the size, mtime, or inode of the
+    path (or, for a directory, of any file within it) changes.
+
+    The sidecar is not written if its location is not writable.
+
+    :param path: The path to get the md5 of.
+    """
+    path = Path(path)
+    sidecar = Path(f"{path}{MD5_CACHE_SUFFIX}")
+    signature = _stat_signature(path)
+
+    try:
+        with open(sidecar) as f:
+            entry = json.load(f)
+        if entry["stat"] == signature:
+            return entry["md5"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    md5sum = md5(path)
+    try:
+        tmp_sidecar = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp_sidecar, "w") as f:
+            json.dump({"md5": md5sum, "stat": signature}, f)
+        os.replace(tmp_sidecar, sidecar)
+    except OSError:
+        pass
+    return md5sum
@@ -0,0 +1,247 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from _m5 import core
+
+from .client import get_multiple_resource_json_obj
+from .client_api.client_query import ClientQuery
+from .downloader import get_resource
+from .resource import _get_default_resource_dir
+
+"""
+This Python module contains functions to obtain a set of resources up front,
+before a simulation is configured.
+
+``prefetch_resources`` resolves all the requested resources, and the
+resources they depend on, in as few client queries as possible, then
+downloads them concurrently. It can write a lockfile recording the local path
+and md5 of each resource. The lockfile is also a valid resources JSON source
+(e.g., via ``GEM5_RESOURCE_JSON``), so later runs can obtain the same
+resources without querying the clients.
+"""
+
+
+def _get_dependencies(
+    resource_json: Dict[str, Any]
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Returns the IDs and versions of the resources a resource refers to:
+    the resources of a workload, and the workloads of a suite.
+    """
+    if resource_json["category"] == "workload":
+        return [
+            (resource["id"], resource["resource_version"])
+            for resource in resource_json["resources"].values()
+        ]
+    if resource_json["category"] == "suite":
+        return [
+            (workload["id"], workload["resource_version"])
+            for workload in resource_json["workloads"]
+        ]
+    return []
+
+
+def _resolve(
+    client_queries: List[ClientQuery], clients: Optional[List[str]]
+) -> List[Dict[str, Any]]:
+    """
+    Returns the JSON objects of the resources matching a set of queries.
+
+    The clients return one resource per ID for each request, so queries for
+    different versions of the same ID are made in separate requests. All
+    other queries are made in a single request.
+    """
+    batches: List[List[ClientQuery]] = []
+    for client_query in client_queries:
+        for batch in batches:
+            if all(
+                other.get_resource_id() != client_query.get_resource_id()
+                for other in batch
+            ):
+                batch.append(client_query)
+                break
+        else:
+            batches.append([client_query])
+
+    resolved = []
+    for batch in batches:
+        resolved.extend(get_multiple_resource_json_obj(batch, clients))
+    return resolved
+
+
+def prefetch_resources(
+    resource_ids: List[str],
+    resource_versions: Optional[List[Optional[str]]] = None,
+    resource_directory: Optional[str] = None,
+    download_md5_mismatch: bool = True,
+    clients: Optional[List[str]] = None,
+    gem5_version: Optional[str] = core.gem5Version,
+    max_workers: int = 4,
+    lockfile: Optional[str] = None,
+    quiet: bool = False,
+) -> Dict[str, Any]:
+    """
+    Obtains a set of resources, and all the resources they depend on, ahead
+    of their use.
+
+    The resources are resolved level by level: the requested resources in
+    one client query, then the resources they refer to in the next, and so
+    on. Each distinct ``id@version`` is resolved and downloaded once, however
+    many workloads or suites refer to it.
+
+    :param resource_ids: The IDs of the resources to obtain.
+    :param resource_versions: The version of each resource in
+                              ``resource_ids``. An entry of ``None`` obtains
+                              the latest compatible version. If ``None``, the
+                              latest compatible version of every resource is
+                              obtained.
+    :param resource_directory: The directory in which the resources are to
+                               be stored. If not set, the environment variable
+                               ``GEM5_RESOURCE_DIR`` is used, else the default
+                               used by ``obtain_resource``.
+    :param download_md5_mismatch: If a resource is present, but does not have
+                                  the correct md5 value, the resource will be
+                                  deleted and re-downloaded if this value is
+                                  ``True``. Otherwise an exception will be
+                                  thrown. ``True`` by default.
+    :param clients: A list of clients to search for the resources. If not
+                    set, all clients are searched.
+    :param gem5_version: The gem5 version to use to filter incompatible
+                         resource versions. By default set to the current gem5
+                         version.
+    :param max_workers: The max number of resources downloaded at once.
+    :param lockfile: If set, the lockfile is written to this path.
+    :param quiet: If ``True``, suppress output. ``False`` by default.
+
+    :returns: The lockfile contents. The ``resources`` entry maps each
+              ``id@version`` to the resource's local path (``None`` for
+              resources with nothing to download, such as workloads), md5sum,
+              and JSON object.
+    """
+    if resource_versions is None:
+        resource_versions = [None] * len(resource_ids)
+    if len(resource_versions) != len(resource_ids):
+        raise Exception(
+            "The number of resource versions must match the number of "
+            "resource IDs."
+        )
+
+    if resource_directory is None:
+        resource_directory = os.getenv(
+            "GEM5_RESOURCE_DIR", _get_default_resource_dir()
+        )
+
+    # Resolve the requested resources, then their dependencies, one level
+    # at a time.
+    resolved: Dict[str, Dict[str, Any]] = {}
+    requested = set(zip(resource_ids, resource_versions))
+    client_queries = [
+        ClientQuery(id, version, gem5_version=gem5_version)
+        for id, version in requested
+    ]
+    while client_queries:
+        next_queries = []
+        for resource_json in _resolve(client_queries, clients):
+            key = f"{resource_json['id']}@{resource_json['resource_version']}"
+            if key in resolved:
+                continue
+            resolved[key] = resource_json
+            for dependency in _get_dependencies(resource_json):
+                if dependency not in requested:
+                    requested.add(dependency)
+                    next_queries.append(
+                        ClientQuery(*dependency, gem5_version=gem5_version)
+                    )
+        client_queries = next_queries
+
+    # Determine where each resource is to be stored, as `obtain_resource`
+    # would.
+    to_paths: Dict[str, Optional[str]] = {}
+    keys_by_path: Dict[str, str] = {}
+    for key, resource_json in resolved.items():
+        if not resource_json.get("url"):
+            to_paths[key] = None
+            continue
+        to_path = os.path.join(resource_directory, resource_json["id"])
+        if to_path in keys_by_path:
+            raise Exception(
+                f"Resources '{keys_by_path[to_path]}' and '{key}' would both "
+                f"be stored at '{to_path}'. Only one version of a resource "
+                "can be prefetched to a resource directory."
+            )
+        keys_by_path[to_path] = key
+        to_paths[key] = to_path
+
+    Path(resource_directory).mkdir(parents=True, exist_ok=True)
+
+    def fetch(key: str) -> None:
+        resource_json = resolved[key]
+        get_resource(
+            resource_name=resource_json["id"],
+            to_path=to_paths[key],
+            download_md5_mismatch=download_md5_mismatch,
+            resource_version=resource_json["resource_version"],
+            clients=clients,
+            gem5_version=gem5_version,
+            quiet=quiet,
+            resource_json=resource_json,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # `list` is used to raise any exception thrown by a download.
+        list(executor.map(fetch, [k for k, p in to_paths.items() if p]))
+
+    lock = {
+        "gem5_version": gem5_version,
+        "resources": {
+            key: {
+                "local_path": to_paths[key],
+                "md5sum": resource_json.get("md5sum"),
+                "resource": resource_json,
+            }
+            for key, resource_json in sorted(resolved.items())
+        },
+    }
+
+    if lockfile:
+        with open(lockfile, "w") as f:
+            json.dump(lock, f, indent=4)
+        if not quiet:
+            print(f"Wrote resources lockfile '{lockfile}'.")
+
+    return lock
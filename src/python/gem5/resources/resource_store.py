@@ -0,0 +1,259 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import (
+    Dict,
+    Optional,
+)
+
+from ..utils.filelock import FileLock
+from .md5_utils import (
+    _stat_signature,
+    md5,
+)
+
+"""
+This Python module contains a content-addressed store for gem5 resources.
+
+Resources in the store are kept under their md5sum and are linked into the
+``to_path`` requested by ``get_resource``. Many gem5 processes, even ones
+using different resource directories, can therefore share a single copy of
+each disk image, kernel, or binary.
+
+Alongside the store a manifest of verified hashes is kept. Each entry records
+the md5 of a path and a signature of the path's ``stat`` (size, mtime, and
+inode). While the signature is unchanged the md5 does not need to be
+recomputed.
+
+The store is enabled by setting the ``GEM5_RESOURCE_STORE`` environment
+variable to the directory in which the store is to be kept.
+"""
+
+
+class VerifiedHashManifest:
+    """
+    An on-disk record of the md5 values of paths which have already been
+    verified.
+
+    The manifest is a JSON file mapping absolute paths to their md5 and
+    ``stat`` signature. Updates are made under a ``FileLock`` and written
+    atomically so the manifest may be shared between gem5 processes.
+    """
+
+    def __init__(self, manifest_path: Path):
+        """
+        :param manifest_path: The location of the manifest file. It is
+                              created on the first call to ``record``.
+        """
+        self._manifest_path = Path(manifest_path)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self._manifest_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _update(self, path: Path, entry: Optional[Dict]) -> None:
+        self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{self._manifest_path}.lock", timeout=60):
+            manifest = self._load()
+            key = os.path.abspath(path)
+            if entry is None:
+                manifest.pop(key, None)
+            else:
+                manifest[key] = entry
+            tmp_path = f"{self._manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self._manifest_path)
+
+    def lookup(self, path: Path) -> Optional[str]:
+        """
+        Returns the recorded md5 of a path, or ``None`` if the path has not
+        been recorded or has changed since it was recorded.
+
+        :param path: The file or directory to look up.
+        """
+        entry = self._load().get(os.path.abspath(path))
+        if entry is None or not os.path.exists(path):
+            return None
+        if entry["stat"] != _stat_signature(Path(path)):
+            return None
+        return entry["md5"]
+
+    def record(self, path: Path, md5sum: str) -> None:
+        """
+        Records the md5 of a path along with its current ``stat`` signature.
+
+        :param path: The file or directory which has been verified.
+        :param md5sum: The md5 of the path.
+        """
+        self._update(
+            path, {"md5": md5sum, "stat": _stat_signature(Path(path))}
+        )
+
+    def forget(self, path: Path) -> None:
+        """
+        Removes a path from the manifest.
+
+        :param path: The file or directory to remove.
+        """
+        self._update(path, None)
+
+    def verified_md5(self, path: Path) -> str:
+        """
+        Returns the md5 of a path. The recorded value is used if the path is
+        unchanged, otherwise the md5 is computed and recorded.
+
+        :param path: The file or directory to obtain the md5 of.
+        """
+        md5sum = self.lookup(path)
+        if md5sum is None:
+            md5sum = md5(Path(path))
+            self.record(path, md5sum)
+        return md5sum
+
+
+class ResourceStore:
+    """
+    A content-addressed store of gem5 resources, keyed by md5sum.
+
+    Objects are kept at ``<root>/objects/<md5[:2]>/<md5>``. Files are hard
+    linked into place where possible, falling back to symbolic links, and
+    directories are always symbolically linked.
+    """
+
+    def __init__(self, root: Path):
+        """
+        :param root: The directory in which the store is kept.
+        """
+        self._root = Path(root)
+        self._manifest = VerifiedHashManifest(self._root / "manifest.json")
+
+    def get_root(self) -> Path:
+        return self._root
+
+    def get_manifest(self) -> VerifiedHashManifest:
+        return self._manifest
+
+    def object_path(self, md5sum: str) -> Path:
+        """
+        Returns the location in the store of the object with the given md5.
+
+        :param md5sum: The md5 of the object.
+        """
+        return self._root / "objects" / md5sum[:2] / md5sum
+
+    def contains(self, md5sum: str) -> bool:
+        """
+        Returns ``True`` if a verified object with the given md5 is in the
+        store. An object whose contents no longer match its md5 is removed.
+
+        :param md5sum: The md5 of the object.
+        """
+        obj = self.object_path(md5sum)
+        if not obj.exists():
+            return False
+        if self._manifest.verified_md5(obj) == md5sum:
+            return True
+        self._remove(obj)
+        self._manifest.forget(obj)
+        return False
+
+    def link_into(self, md5sum: str, to_path: Path) -> None:
+        """
+        Places the object with the given md5 at ``to_path``.
+
+        :param md5sum: The md5 of the object. It must be in the store.
+        :param to_path: The location at which the object is to be placed.
+                        Anything already at this location is replaced.
+        """
+        obj = self.object_path(md5sum)
+        assert obj.exists()
+        to_path = Path(to_path)
+        to_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # The link is made at a temporary location and renamed into place so
+        # that other processes never see a partially created link.
+        tmp_path = Path(f"{to_path}.{os.getpid()}.link")
+        self._remove(tmp_path)
+        if obj.is_dir():
+            os.symlink(obj, tmp_path, target_is_directory=True)
+        else:
+            try:
+                os.link(obj, tmp_path)
+            except OSError:
+                # Hard links are not possible across file systems.
+                os.symlink(obj, tmp_path)
+
+        if to_path.is_dir() and not to_path.is_symlink():
+            shutil.rmtree(to_path)
+        os.replace(tmp_path, to_path)
+
+    def ingest(self, path: Path, md5sum: str) -> None:
+        """
+        Moves a verified file or directory into the store and links it back
+        into its original location.
+
+        :param path: The file or directory to be moved into the store.
+        :param md5sum: The md5 of the path.
+        """
+        obj = self.object_path(md5sum)
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(f"{obj}.lock", timeout=900):
+            if obj.exists():
+                # Another process stored the same object first.
+                self._remove(Path(path))
+            else:
+                tmp_obj = Path(f"{obj}.{os.getpid()}.tmp")
+                shutil.move(str(path), str(tmp_obj))
+                os.replace(tmp_obj, obj)
+            self._manifest.record(obj, md5sum)
+        self.link_into(md5sum, path)
+        self._manifest.record(path, md5sum)
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        if path.is_symlink() or path.is_file():
+            os.remove(path)
+        elif path.is_dir():
+            shutil.rmtree(path)
+
+
+def get_resource_store() -> Optional[ResourceStore]:
+    """
+    Returns the resource store set via the ``GEM5_RESOURCE_STORE`` environment
+    variable, or ``None`` if the variable is not set.
+    """
+    root = os.getenv("GEM5_RESOURCE_STORE")
+    if not root:
+        return None
+    return ResourceStore(Path(root))
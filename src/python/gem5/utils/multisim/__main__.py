@@ -52,8 +52,19 @@ def main():
         help="The path to the config script specifying the simulations to run using multisim.",
     )
 
+    parser.add_argument(
+        "--rerun-completed",
+        action="store_true",
+        help="Run all the simulations, including those which have already "
+        "completed a run in the output directory. By default these are "
+        "skipped, so an interrupted set of simulations can be resumed.",
+    )
+
     args = parser.parse_args()
-    run(module_path=Path(args.config))
+    run(
+        module_path=Path(args.config),
+        rerun_completed=args.rerun_completed,
+    )
 
 
 if __name__ == "__m5_main__":
@@ -50,11 +50,14 @@ This script is then passed to the child processes to load.
 """
 
 import importlib
+import json
 import multiprocessing
+import time
 from pathlib import Path
 from typing import (
+    Dict,
+    List,
     Optional,
-    Set,
 )
 
 # A global variable which __main__.py flips to `True` when multisim is run as
@@ -67,7 +70,16 @@ module_run = False
 # threads.
 _num_processes = None
 
-_multi_sim: Set["Simulator"] = set()
+# The simulators to run, keyed by ID. A dict, rather than a set, as the
+# simulators must be kept in the order they were added (see `schedule`).
+_multi_sim: Dict[str, "Simulator"] = {}
+
+# The cost hints of the simulators, keyed by simulator ID. See `add_simulator`.
+_costs: Dict[str, float] = {}
+
+# The name of the file written to a simulator's output directory once it has
+# completed a run. It records the wallclock time of the run.
+_completion_record_file = "multisim_complete.json"
 
 
 def _load_module(module_path: Path) -> None:
@@ -79,79 +91,102 @@ def _load_module(module_path: Path) -> None:
     spec.loader.exec_module(modulevar)
 
 
-def _get_simulator_ids_child_process(id_list, module_path: Path) -> None:
-    """Get the ids of the simulations to be run.
+def _get_simulator_info_child_process(info, module_path: Path) -> None:
+    """Get the ids, and cost hints, of the simulations to be run and the
+    number of processes to run them with.
 
     This function is passed to the Python multiprocessing module and run with
-    the correct module path in the `_get_simulator_ids` function. This function
-    is run in a child process which loads the module (config script) then reads
-    the IDs.
+    the correct module path in the `_get_simulator_info` function. This
+    function is run in a child process which loads the module (config script)
+    then reads the simulators and settings it added.
 
     Note: We run this as child process as we cannot load the config script as
     a module in the main process. This function is used in
-    `get_simulator_ids` and should be used separately.
+    `_get_simulator_info` and should not be used separately.
     """
 
     _load_module(module_path)
     global _multi_sim
-    if len(id_list) != 0:
-        id_list *= 0
-    id_list.extend([sim.get_id() for sim in _multi_sim])
+    info["ids"] = list(_multi_sim)
+    info["num_processes"] = _num_processes
+    info["costs"] = dict(_costs)
+
+
+def _get_simulator_info(config_module_path: Path) -> Dict:
+    """Determines the IDs of the simulations we are to run, their cost hints,
+    and the number of processes to run them with. The only way we can know is
+    by importing the module, which we can only do in the child processes. We
+    therefore create a child process with the sole purpose of importing the
+    module and returning this information via a `multiprocessing.Manager`
+    dictionary. The module is imported only once for all the information.
+
+    :returns: A dictionary with the simulator IDs (``"ids"``), the number of
+    processes (``"num_processes"``), and the cost hints of the simulators
+    given one (``"costs"``).
+    """
 
+    manager = multiprocessing.Manager()
+    info = manager.dict()
+    p = multiprocessing.Process(
+        target=_get_simulator_info_child_process,
+        args=(info, config_module_path),
+    )
+    p.start()
+    p.join()
+    return dict(info)
 
-def _get_num_processes_child_process(
-    num_processes_dict, module_path: Path
-) -> None:
-    """Get the ids of the simulations to be run.
 
-    This function is passed to the Python multiprocessing module and run with
-    the correct module path in the `_get_simulator_ids` function. This function
-    is run in a child process which loads the module (config script) then reads
-    the IDs.
+def get_simulator_ids(config_module_path: Path) -> list[str]:
+    """Returns the IDs of the simulations specified in a config script.
 
-    Note: We run this as child process as we cannot load the config script as
-    a module in the main process. This function is used in
-    `get_simulator_ids` and should be used separately.
+    The config script is imported in a child process, as it cannot be imported
+    in the main process. See `_get_simulator_info`.
     """
+    return _get_simulator_info(config_module_path)["ids"]
 
-    _load_module(module_path)
-    global _num_processes
-    num_processes_dict["num_processes"] = _num_processes
 
+def get_num_processes(config_module_path: Path) -> Optional[int]:
+    """Returns the number of processes set by a config script, or `None` if
+    not set.
 
-def get_simulator_ids(config_module_path: Path) -> list[str]:
-    """This is a  hack to determine the IDs of the simulations we are to run.
-    The only way we can know is by importing the module, which we can only do
-    in the child processes. We therefore create a child process with the
-    sole purpose of importing the module and returning the IDs via
-    a `multiprocessing.Manager` dictionary.
-
-    This function handles the creation of the `multiprocessing.Manager` and the
-    `multiprocessing.Process`. It then waits for the process to finish to then
-    return the ids as a set of strings.
+    The config script is imported in a child process, as it cannot be imported
+    in the main process. See `_get_simulator_info`.
     """
+    return _get_simulator_info(config_module_path)["num_processes"]
 
-    manager = multiprocessing.Manager()
-    id_list = manager.list()
-    p = multiprocessing.Process(
-        target=_get_simulator_ids_child_process,
-        args=(id_list, config_module_path),
-    )
-    p.start()
-    p.join()
-    return id_list
 
+def _get_outdir(id: str) -> Path:
+    """Returns the output directory of the simulator with the ID specified."""
+    import m5
 
-def get_num_processes(config_module_path: Path) -> Optional[int]:
-    manager = multiprocessing.Manager()
-    num_processes_dict = manager.dict()
-    p = multiprocessing.Process(
-        target=_get_num_processes_child_process,
-        args=(num_processes_dict, config_module_path),
-    )
-    p.start()
-    p.join()
-    return num_processes_dict["num_processes"]
+    return Path(m5.options.outdir) / Path(id)
+
+
+def _read_completion_record(id: str) -> Optional[Dict]:
+    """Returns the completion record of the simulator with the ID specified,
+    or `None` if it has not completed a run in the current output directory.
+    """
+    try:
+        with open(_get_outdir(id) / _completion_record_file) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _run_simulator(simulator: "Simulator") -> None:
+    """Run a simulator in its output directory. Once the simulation has run, a
+    completion record with the wallclock time of the run is written to the
+    output directory.
+    """
+    subdir = _get_outdir(simulator.get_id())
+    simulator.override_outdir(subdir)
+
+    start = time.time()
+    simulator.run()
+    wallclock = time.time() - start
+
+    with open(subdir / _completion_record_file, "w") as f:
+        json.dump({"id": simulator.get_id(), "wallclock": wallclock}, f)
 
 
 def _run(module_path: Path, id: str) -> None:
@@ -160,25 +195,49 @@ def _run(module_path: Path, id: str) -> None:
     _load_module(module_path)
 
     global _multi_sim
-    sim_list = [sim for sim in _multi_sim if sim.get_id() == id]
+    assert id in _multi_sim, f"No simulator with id '{id}' found."
 
-    assert len(sim_list) != 0, f"No simulator with id '{id}' found."
-    assert len(sim_list) == 1, f"Multiple simulators with id '{id}' found."
-    import m5
+    _run_simulator(_multi_sim[id])
+
+
+def schedule(
+    ids: List[str], costs: Dict[str, float], wallclocks: Dict[str, float]
+) -> List[str]:
+    """Orders the simulators so the longest run first. Running the longest
+    simulations first minimizes the time until all simulations have finished,
+    as the short simulations fill the gaps left at the end.
 
-    subdir = Path(Path(m5.options.outdir) / Path(sim_list[0].get_id()))
-    sim_list[0].override_outdir(subdir)
+    The cost of a simulator is its cost hint, if given one. Otherwise it is
+    the wallclock time of its previous run, if known. Simulators with no known
+    cost are run first, in the order they were added, as they may be the
+    longest.
 
-    sim_list[0].run()
+    :param ids: The IDs of the simulators, in the order they were added.
+    :param costs: The cost hints of the simulators given one.
+    :param wallclocks: The wallclock times, in seconds, of the previous runs
+    of the simulators.
+    """
+    unknown = [id for id in ids if id not in costs and id not in wallclocks]
+    known = [id for id in ids if id in costs or id in wallclocks]
+    known.sort(key=lambda id: costs.get(id, wallclocks.get(id)), reverse=True)
+    return unknown + known
 
 
-def run(module_path: Path, processes: Optional[int] = None) -> None:
+def run(
+    module_path: Path,
+    processes: Optional[int] = None,
+    rerun_completed: bool = False,
+) -> None:
     """Run the simulators specified in the module in parallel.
 
     :param module_path: The path to the module containing the simulators to
     run.
     :param processes: The number of processes to run in parallel. If not
-    specified, the number of available threads will be used.
+    specified, the number set in the module via `set_num_processes` is used,
+    or the number of available threads if neither is set.
+    :param rerun_completed: If `False`, simulators which have completed a run
+    in their output directory are not run again. This allows an interrupted
+    set of simulations to be resumed. If `True`, all the simulators are run.
     """
 
     assert len(_multi_sim) == 0, (
@@ -186,16 +245,36 @@ def run(module_path: Path, processes: Optional[int] = None) -> None:
         "(prior to determining number of jobs)."
     )
 
-    # Get the simulator IDs. This both provides us a list of targets
-    # and, by-proxy, the number of jobs.
-    ids = get_simulator_ids(module_path)
-    max_num_processes = get_num_processes(module_path)
+    # Get the simulator IDs, and settings, with one import of the module. The
+    # IDs both provide us a list of targets and, by-proxy, the number of jobs.
+    info = _get_simulator_info(module_path)
+    ids = info["ids"]
+    max_num_processes = processes or info["num_processes"]
 
     assert len(_multi_sim) == 0, (
         "Simulators instantiated in main thread instead of child thread "
         "(after determining number of jobs)."
     )
 
+    records = {id: _read_completion_record(id) for id in ids}
+    if not rerun_completed:
+        completed = [id for id in ids if records[id]]
+        for id in completed:
+            print(
+                f"Skipping simulator '{id}': already completed in "
+                f"'{_get_outdir(id)}'."
+            )
+        ids = [id for id in ids if not records[id]]
+    if not ids:
+        return
+
+    wallclocks = {
+        id: record["wallclock"]
+        for id, record in records.items()
+        if record and "wallclock" in record
+    }
+    ids = schedule(ids, info["costs"], wallclocks)
+
     # Setup the multiprocessing pool. If the number of processes is not
     # specified (i.e. `None`) the default is the number or available threads.
     from ..multiprocessing.context import gem5Context
@@ -205,8 +284,14 @@ def run(module_path: Path, processes: Optional[int] = None) -> None:
     # Use the starmap function to create N child processes each with same
     # module path (the config script specifying all simulations using MultiSim)
     # but a different ID. The ID is used to select the correct simulator to
-    # run.
-    pool.starmap(_run, zip([module_path for _ in range(len(ids))], tuple(ids)))
+    # run. A `chunksize` of 1 ensures the simulators are handed to the
+    # processes in the scheduled order, and that each runs in a new process (a
+    # gem5 process can only run one simulation).
+    pool.starmap(
+        _run,
+        zip([module_path for _ in range(len(ids))], tuple(ids)),
+        chunksize=1,
+    )
 
 
 def set_num_processes(num_processes: int) -> None:
@@ -228,7 +313,9 @@ def num_simulators() -> int:
     return len(_multi_sim)
 
 
-def add_simulator(simulator: "Simulator") -> None:
+def add_simulator(
+    simulator: "Simulator", cost: Optional[float] = None
+) -> None:
     """Add a single simulator to the Multisim. Doing so informs the simulators
     to run this simulator via multiprocessing.
 
@@ -243,6 +330,10 @@ def add_simulator(simulator: "Simulator") -> None:
     :param id: The id of the simulator. This is used to reference the
     simulation. This is particularly important when referencing the correct
     m5out subdirectory.
+    :param cost: An estimate of the cost (e.g., the runtime) of the
+    simulation, in any unit common to all the simulators. The simulations with
+    the highest cost are run first. If not set, the wallclock time of the
+    simulator's previous run is used, if known.
     """
 
     global _multi_sim
@@ -251,7 +342,12 @@ def add_simulator(simulator: "Simulator") -> None:
         # simulators. This is used to ensure that the simulator has a unique
         # id.
         simulator.set_id(f"sim_{len(_multi_sim)}")
-    _multi_sim.add(simulator)
+    id = simulator.get_id()
+    if _multi_sim.get(id, simulator) is not simulator:
+        raise ValueError(f"Multiple simulators with id '{id}' added.")
+    _multi_sim[id] = simulator
+    if cost is not None:
+        _costs[simulator.get_id()] = cost
 
     # The following code is used to enable a user to run a single simulation
     # from the config script, based on an ID, in the case the config script is
@@ -293,8 +389,4 @@ def add_simulator(simulator: "Simulator") -> None:
                 "(`-l`)  flag."
             )
         elif args.id == simulator.get_id():
-            import m5
-
-            subdir = Path(Path(m5.options.outdir) / Path(simulator.get_id()))
-            simulator.override_outdir(subdir)
-            simulator.run()
+            _run_simulator(simulator)
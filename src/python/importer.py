@@ -24,10 +24,23 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import atexit
 import importlib
 import importlib.abc
 import importlib.util
+import marshal
 import os
+import struct
+import sys
+import time
+
+# The times spent executing each module loaded by the importer, as a map of
+# the module path to (inclusive, exclusive) seconds. The exclusive time of a
+# module doesn't include the time spent executing the embedded modules it
+# imports, but does include imports of modules which aren't embedded (e.g.,
+# the standard library).
+import_times = {}
+_loading = []
 
 
 class ByteCodeLoader(importlib.abc.Loader):
@@ -36,36 +49,117 @@ class ByteCodeLoader(importlib.abc.Loader):
         self.code = code
 
     def exec_module(self, module):
-        exec(self.code, module.__dict__)
+        # Nested imports subtract their inclusive time from the exclusive
+        # time of the module importing them.
+        _loading.append(0.0)
+        start = time.perf_counter()
+        try:
+            exec(self.code, module.__dict__)
+        finally:
+            inclusive = time.perf_counter() - start
+            exclusive = inclusive - _loading.pop()
+            if _loading:
+                _loading[-1] += inclusive
+            import_times[module.__name__] = (inclusive, exclusive)
 
     def get_code(self, _):
         return self.code
 
 
+def _get_cache_dir():
+    """
+    Returns the directory of the cache of bytecode compiled from source in
+    override mode. This is ``$M5_PY_CACHE_DIR`` if set, with an empty value
+    disabling the cache, otherwise ``gem5/pycache`` in the user's cache
+    directory.
+    """
+    cache_dir = os.environ.get("M5_PY_CACHE_DIR")
+    if cache_dir is not None:
+        return cache_dir or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "gem5", "pycache")
+
+
+class _SourceCache:
+    """
+    A cache of code objects compiled from python source files. An entry is
+    keyed by the file's path and is valid while the file's mtime and size,
+    and the interpreter's bytecode version, are unchanged.
+    """
+
+    _header = struct.Struct("<4sQQ")
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, abspath):
+        name = abspath.lstrip(os.sep).replace(os.sep, "%")
+        return os.path.join(self.cache_dir, f"{name}.pyc")
+
+    def get_code(self, abspath):
+        st = os.stat(abspath)
+        header = self._header.pack(
+            importlib.util.MAGIC_NUMBER, st.st_mtime_ns, st.st_size
+        )
+        entry = self._entry_path(abspath) if self.cache_dir else None
+
+        if entry:
+            try:
+                with open(entry, "rb") as f:
+                    data = f.read()
+                if data.startswith(header):
+                    return marshal.loads(memoryview(data)[len(header) :])
+            except (OSError, ValueError, EOFError, TypeError):
+                pass
+
+        with open(abspath) as f:
+            code = compile(f.read(), abspath, "exec")
+
+        if entry:
+            # The entry is written to a temporary file and moved into place,
+            # so concurrent gem5 processes never read a partial entry.
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = f"{entry}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(header)
+                    f.write(marshal.dumps(code))
+                os.replace(tmp, entry)
+            except OSError:
+                pass
+
+        return code
+
+
 # Simple importer that allows python to import data from a dict of
 # code objects.  The keys are the module path, and the items are the
-# filename and bytecode of the file.
+# filename and a function returning the bytecode of the file. The
+# bytecode of a module is only decoded when the module is imported.
 class CodeImporter:
     def __init__(self):
         self.modules = {}
         override_var = os.environ.get("M5_OVERRIDE_PY_SOURCE", "false")
         self.override = override_var.lower() in ("true", "yes")
+        self.source_cache = _SourceCache(_get_cache_dir())
 
-    def add_module(self, abspath, modpath, code):
+    def add_module(self, abspath, modpath, get_code):
         if modpath in self.modules:
             raise AttributeError(f"{modpath} already found in importer")
 
-        self.modules[modpath] = (abspath, code)
+        self.modules[modpath] = (abspath, get_code)
 
     def find_spec(self, fullname, path, target=None):
         if fullname not in self.modules:
             return None
 
-        abspath, code = self.modules[fullname]
+        abspath, get_code = self.modules[fullname]
 
         if self.override and os.path.exists(abspath):
-            src = open(abspath).read()
-            code = compile(src, abspath, "exec")
+            code = self.source_cache.get_code(abspath)
+        else:
+            code = get_code()
 
         is_package = os.path.basename(abspath) == "__init__.py"
         spec = importlib.util.spec_from_loader(
@@ -77,6 +171,36 @@ class CodeImporter:
         return spec
 
 
+def write_import_times(out):
+    """
+    Writes the time spent executing each module loaded by the importer,
+    slowest (exclusive of embedded imports) first.
+
+    :param out: The file to write to.
+    """
+    total = sum(exclusive for _, exclusive in import_times.values())
+    print(f"{'exclusive (ms)':>15} {'inclusive (ms)':>15}  module", file=out)
+    for modpath, (inclusive, exclusive) in sorted(
+        import_times.items(), key=lambda item: item[1][1], reverse=True
+    ):
+        print(
+            f"{exclusive * 1000:15.2f} {inclusive * 1000:15.2f}  {modpath}",
+            file=out,
+        )
+    print(
+        f"{total * 1000:15.2f} {'':15}  total of {len(import_times)} modules",
+        file=out,
+    )
+
+
+def _write_import_times_at_exit(path):
+    if path == "-":
+        write_import_times(sys.stderr)
+    else:
+        with open(path, "w") as f:
+            write_import_times(f)
+
+
 # Create an importer and add it to the meta_path so future imports can
 # use it.  There's currently nothing in the importer, but calls to
 # add_module can be used to add code.
@@ -84,9 +208,14 @@ def install():
     importer = CodeImporter()
     global add_module
     add_module = importer.add_module
-    import sys
 
     sys.meta_path.insert(0, importer)
 
+    # Setting M5_IMPORT_TIMES to a file ("-" for stderr) writes the time
+    # spent importing each embedded module to it when gem5 exits.
+    import_times_path = os.environ.get("M5_IMPORT_TIMES")
+    if import_times_path:
+        atexit.register(_write_import_times_at_exit, import_times_path)
+
     # Injected into this module's namespace by the c++ code that loads it.
     _init_all_embedded()
@@ -40,6 +40,7 @@
 
 import inspect
 import sys
+from contextlib import contextmanager
 from functools import wraps
 from types import (
     FunctionType,
@@ -121,6 +122,15 @@ instanceDict = {}
 # Did any of the SimObjects lack a header file?
 noCxxHeader = False
 
+# The names of the params of each SimObject class whose type is a subclass of
+# a given type, keyed by (SimObject class, type). Used to resolve
+# Parent.any/Parent.all proxies without checking every param of an object.
+_params_of_type = {}
+
+# The memoized results of `SimObject.find_all`, keyed by SimObject then type.
+# `None` unless enabled by `memoize_find_all`.
+_find_all_memo = None
+
 
 def public_value(key, value):
     return key.startswith("_") or isinstance(
@@ -314,6 +324,7 @@ class MetaSimObject(type):
         assert not hasattr(pdesc, "name")
         pdesc.name = name
         cls._params[name] = pdesc
+        _params_of_type.clear()
         if hasattr(pdesc, "default"):
             cls._set_param(name, pdesc.default, pdesc)
 
@@ -740,6 +751,10 @@ class SimObject(metaclass=MetaSimObject):
         self._ccObject = None  # pointer to C++ object
         self._ccParams = None
         self._instantiated = False  # really "cloned"
+        # The descendants, and path, of the object once the hierarchy is
+        # frozen. See `freeze_descendants`.
+        self._frozen_descendants = None
+        self._frozen_path = None
         self._init_called = True  # Checked so subclasses don't forget __init__
 
         # Clone children specified at class level.  No need for a
@@ -887,6 +902,7 @@ class SimObject(metaclass=MetaSimObject):
                 e.args = (msg,)
                 raise
             self._values[attr] = value
+            self._forget_find_all()
 
             # If we assign NULL to an attr that is a SimObject,
             # remove the corresponding children
@@ -960,6 +976,7 @@ class SimObject(metaclass=MetaSimObject):
         child = self._children[name]
         child.clear_parent(self)
         del self._children[name]
+        self._forget_find_all()
 
     # Add a new child to this object.
     def add_child(self, name, child):
@@ -980,6 +997,7 @@ class SimObject(metaclass=MetaSimObject):
         if not isNullPointer(child):
             child.set_parent(self, name)
             self._children[name] = child
+            self._forget_find_all()
 
     # Take SimObject-valued parameters that haven't been explicitly
     # assigned as children and make them children of the object that
@@ -998,6 +1016,8 @@ class SimObject(metaclass=MetaSimObject):
                 self.add_child(key, val)
 
     def path(self):
+        if self._frozen_path is not None:
+            return self._frozen_path
         if not self._parent:
             return f"<orphan {self.__class__}>"
         elif isinstance(self._parent, MetaSimObject):
@@ -1024,6 +1044,30 @@ class SimObject(metaclass=MetaSimObject):
     def ini_str(self):
         return self.path()
 
+    # Returns the names of the params of this object whose type is a
+    # subclass of ptype.
+    def _get_params_of_type(self, ptype):
+        key = (self.__class__, ptype)
+        names = _params_of_type.get(key)
+        if names is None:
+            names = [
+                pname
+                for pname, pdesc in self._params.items()
+                if issubclass(pdesc.ptype, ptype)
+            ]
+            _params_of_type[key] = names
+        return names
+
+    # Drop the memoized find_all results of this object and its ancestors,
+    # as the children or params of this object have changed.
+    def _forget_find_all(self):
+        if _find_all_memo is None:
+            return
+        obj = self
+        while isinstance(obj, SimObject):
+            _find_all_memo.pop(obj, None)
+            obj = obj._parent
+
     def find_any(self, ptype):
         if isinstance(self, ptype):
             return self, True
@@ -1042,18 +1086,27 @@ class SimObject(metaclass=MetaSimObject):
                     )
                 found_obj = child
         # search param space
-        for pname, pdesc in self._params.items():
-            if issubclass(pdesc.ptype, ptype):
-                match_obj = self._values[pname]
-                if found_obj != None and found_obj != match_obj:
-                    raise AttributeError(
-                        "parent.any matched more than one: %s and %s"
-                        % (found_obj.path, match_obj.path)
-                    )
-                found_obj = match_obj
+        for pname in self._get_params_of_type(ptype):
+            match_obj = self._values[pname]
+            if found_obj != None and found_obj != match_obj:
+                raise AttributeError(
+                    "parent.any matched more than one: %s and %s"
+                    % (found_obj.path, match_obj.path)
+                )
+            found_obj = match_obj
         return found_obj, found_obj != None
 
     def find_all(self, ptype):
+        if _find_all_memo is None:
+            return self._find_all(ptype), True
+
+        memo = _find_all_memo.setdefault(self, {})
+        if ptype not in memo:
+            memo[ptype] = self._find_all(ptype)
+        # Return a copy, so the memoized result is not changed by the caller
+        return list(memo[ptype]), True
+
+    def _find_all(self, ptype):
         all = {}
         # search children
         for child in self._children.values():
@@ -1075,14 +1128,13 @@ class SimObject(metaclass=MetaSimObject):
                     child_all, done = child.find_all(ptype)
                     all.update(dict(zip(child_all, [done] * len(child_all))))
         # search param space
-        for pname, pdesc in self._params.items():
-            if issubclass(pdesc.ptype, ptype):
-                match_obj = self._values[pname]
-                if not isproxy(match_obj) and not isNullPointer(match_obj):
-                    all[match_obj] = True
+        for pname in self._get_params_of_type(ptype):
+            match_obj = self._values[pname]
+            if not isproxy(match_obj) and not isNullPointer(match_obj):
+                all[match_obj] = True
         # Also make sure to sort the keys based on the objects' path to
         # ensure that the order is the same on all hosts
-        return sorted(all.keys(), key=lambda o: o.path()), True
+        return sorted(all.keys(), key=lambda o: o.path())
 
     def unproxy(self, base):
         return self
@@ -1110,51 +1162,53 @@ class SimObject(metaclass=MetaSimObject):
                 port.unproxy(self)
 
     def print_ini(self, ini_file):
-        print("[" + self.path() + "]", file=ini_file)  # .ini section header
-
         instanceDict[self.path()] = self
+        ini_file.write(self.ini_section())
+
+    # Returns the section of this object in the config.ini: the section
+    # header, a line per param and port, and a blank line.
+    def ini_section(self):
+        lines = ["[" + self.path() + "]"]  # .ini section header
 
         if hasattr(self, "type"):
-            print(f"type={self.type}", file=ini_file)
+            lines.append(f"type={self.type}")
 
         if len(self._children.keys()):
-            print(
+            lines.append(
                 "children=%s"
                 % " ".join(
                     self._children[n].get_name()
                     for n in sorted(self._children.keys())
-                ),
-                file=ini_file,
+                )
             )
 
         for param in sorted(self._params.keys()):
             value = self._values.get(param)
             if value != None:
-                print(
-                    f"{param}={self._values[param].ini_str()}",
-                    file=ini_file,
-                )
+                lines.append(f"{param}={value.ini_str()}")
 
         for port_name in sorted(self._ports.keys()):
             port = self._port_refs.get(port_name, None)
             if port != None:
-                print(f"{port_name}={port.ini_str()}", file=ini_file)
+                lines.append(f"{port_name}={port.ini_str()}")
 
-        print(file=ini_file)  # blank line between objects
+        lines.append("\n")  # blank line between objects
+        return "\n".join(lines)
 
-    # generate a tree of dictionaries expressing all the parameters in the
-    # instantiated system for use by scripts that want to do power, thermal
-    # visualization, and other similar tasks
-    def get_config_as_dict(self):
-        d = attrdict()
+    # Returns the entries of this object in the config.json, in order. The
+    # children of the object are returned as SimObjects (or
+    # SimObjectVectors) rather than as dictionaries, so that they can be
+    # converted, or written, as they are reached.
+    def config_items(self):
+        d = {}
         if hasattr(self, "type"):
-            d.type = self.type
+            d["type"] = self.type
         if hasattr(self, "cxx_class"):
-            d.cxx_class = self.cxx_class
+            d["cxx_class"] = self.cxx_class
         # Add the name and path of this object to be able to link to
         # the stats
-        d.name = self.get_name()
-        d.path = self.path()
+        d["name"] = self.get_name()
+        d["path"] = self.path()
 
         for param in sorted(self._params.keys()):
             value = self._values.get(param)
@@ -1162,11 +1216,10 @@ class SimObject(metaclass=MetaSimObject):
                 d[param] = value.config_value()
 
         for n in sorted(self._children.keys()):
-            child = self._children[n]
             # Use the name of the attribute (and not get_name()) as
             # the key in the JSON dictionary to capture the hierarchy
             # in the Python code that assembled this system
-            d[n] = child.get_config_as_dict()
+            d[n] = self._children[n]
 
         for port_name in sorted(self._ports.keys()):
             port = self._port_refs.get(port_name, None)
@@ -1177,6 +1230,17 @@ class SimObject(metaclass=MetaSimObject):
 
         return d
 
+    # generate a tree of dictionaries expressing all the parameters in the
+    # instantiated system for use by scripts that want to do power, thermal
+    # visualization, and other similar tasks
+    def get_config_as_dict(self):
+        d = attrdict()
+        for key, value in self.config_items().items():
+            if isinstance(value, (SimObject, SimObjectVector)):
+                value = value.get_config_as_dict()
+            d[key] = value
+        return d
+
     def getCCParams(self):
         if self._ccParams:
             return self._ccParams
@@ -1267,6 +1331,11 @@ class SimObject(metaclass=MetaSimObject):
         return self._ccObject
 
     def descendants(self):
+        if self._frozen_descendants is not None:
+            return iter(self._frozen_descendants)
+        return self._walk_descendants()
+
+    def _walk_descendants(self):
         yield self
         # The order of the dict is implementation dependent, so sort
         # it based on the key (name) to ensure the order is the same
@@ -1274,6 +1343,19 @@ class SimObject(metaclass=MetaSimObject):
         for name, child in sorted(self._children.items()):
             yield from child.descendants()
 
+    # Walk the hierarchy once, and keep the descendants of this object, in
+    # order, for all later calls to `descendants()`. The path of each
+    # descendant is also computed once and kept. This must only be called
+    # once the hierarchy can no longer change (i.e., in `m5.instantiate`,
+    # once the params have been unproxied).
+    def freeze_descendants(self):
+        descendants = list(self._walk_descendants())
+        # The descendants are in pre-order, so the path of each parent is
+        # already kept when the path of its children is computed.
+        for obj in descendants:
+            obj._frozen_path = obj.path()
+        self._frozen_descendants = descendants
+
     # Call C++ to create C++ object corresponding to this object
     def createCCObject(self):
         if self.abstract:
@@ -1404,6 +1486,21 @@ baseClasses = allClasses.copy()
 baseInstances = instanceDict.copy()
 
 
+# Memoize the results of `SimObject.find_all` while in this context. This is
+# used while the params of a hierarchy are unproxied, where the same subtrees
+# are searched for the same types by many Parent.all proxies. The memoized
+# results of an object are dropped whenever its children or params change.
+@contextmanager
+def memoize_find_all():
+    global _find_all_memo
+
+    _find_all_memo = {}
+    try:
+        yield
+    finally:
+        _find_all_memo = None
+
+
 def clear():
     global allClasses, instanceDict, noCxxHeader
 
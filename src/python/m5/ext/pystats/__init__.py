@@ -31,6 +31,7 @@ from .group import (
     SimObjectVectorGroup,
 )
 from .jsonloader import JsonLoader
+from .lazyloader import LazySimStat
 from .serializable_stat import SerializableStat
 from .simstat import SimStat
 from .statistic import (
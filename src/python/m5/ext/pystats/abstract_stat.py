@@ -24,10 +24,16 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import fnmatch
+import gc
 import re
+import weakref
+from bisect import bisect_left
+from functools import lru_cache
 from typing import (
     Any,
     Callable,
+    Dict,
     List,
     Optional,
     Pattern,
@@ -37,6 +43,134 @@ from typing import (
 
 from .serializable_stat import SerializableStat
 
+_VECTOR_INDEX = re.compile("[0-9]+$")
+
+
+@lru_cache(maxsize=4096)
+def _split_vector_name(item: str) -> Optional[Tuple[str, int]]:
+    """Splits a name such as "cpu0" into its SimObject name and index (e.g.,
+    ("cpu", 0)). Returns ``None`` if the name does not end in an index.
+    """
+    match = _VECTOR_INDEX.search(item)
+    if not match:
+        return None
+    return item[: match.start()], int(match.group())
+
+
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> Tuple[Pattern, str]:
+    """Returns the regular expression of a glob pattern and the literal
+    prefix all paths matching the pattern start with.
+    """
+    prefix = re.match(r"[^*?\[]*", pattern).group()
+    return re.compile(fnmatch.translate(pattern)), prefix
+
+
+class _PathIndex:
+    """
+    A flattened index of all the descendants of a statistic, in the order
+    they are returned by ``children(recursive=True)``.
+
+    For each descendant the index holds its name, the position of its parent
+    in the index (-1 for children of the indexed statistic), and whether it
+    is listed by ``children`` (the elements of SimObject vectors are not).
+    The lookups built from these (by name, and by dotted path) are only
+    built when first needed.
+    """
+
+    def __init__(self, root: "AbstractStat"):
+        self.version = AbstractStat._structure_version
+        self.names: List[Any] = []
+        self.stats: List["AbstractStat"] = []
+        self.parents: List[int] = []
+        self.listed: List[bool] = []
+        self._by_name: Optional[Dict[str, List[int]]] = None
+        self._paths: Optional[List[str]] = None
+        self._sorted_paths: Optional[Tuple[List[str], List[int]]] = None
+
+        names = self.names
+        stats = self.stats
+        parents = self.parents
+        listed = self.listed
+        # Whether the statistics of each class can have children. Checked
+        # so that the leaves, most statistics, need not be asked.
+        has_children: Dict[type, bool] = {}
+
+        def add(stat: "AbstractStat", parent: int) -> None:
+            for name, child, child_listed in stat._index_children():
+                position = len(stats)
+                names.append(name)
+                stats.append(child)
+                parents.append(parent)
+                listed.append(child_listed)
+
+                cls = type(child)
+                if cls not in has_children:
+                    has_children[cls] = (
+                        cls._index_children is not AbstractStat._index_children
+                    )
+                if has_children[cls]:
+                    add(child, position)
+
+        # The index adds many objects, but no garbage, so collection is
+        # paused while it is built. Otherwise the cyclic garbage collector
+        # repeatedly scans the whole stats tree, more than doubling the
+        # time taken.
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            add(root, -1)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def by_name(self) -> Dict[str, List[int]]:
+        """Returns the positions of the listed descendants with each name.
+        Statistics of the same name (e.g., in each core of a system) are
+        common, so a search need only match each name once.
+        """
+        if self._by_name is None:
+            by_name = {}
+            for position, (name, listed) in enumerate(
+                zip(self.names, self.listed)
+            ):
+                if listed and isinstance(name, str):
+                    by_name.setdefault(name, []).append(position)
+            self._by_name = by_name
+        return self._by_name
+
+    def paths(self) -> List[str]:
+        """Returns the dotted path of each descendant."""
+        if self._paths is None:
+            paths = []
+            for name, parent in zip(self.names, self.parents):
+                paths.append(
+                    f"{paths[parent]}.{name}" if parent >= 0 else str(name)
+                )
+            self._paths = paths
+        return self._paths
+
+    def paths_with_prefix(self, prefix: str) -> List[int]:
+        """Returns the positions of the descendants whose path starts with
+        ``prefix``, found by a binary search of the sorted paths. The
+        positions are in the order of the paths.
+        """
+        if self._sorted_paths is None:
+            order = sorted(
+                range(len(self.stats)), key=self.paths().__getitem__
+            )
+            self._sorted_paths = ([self._paths[i] for i in order], order)
+        sorted_paths, order = self._sorted_paths
+
+        start = bisect_left(sorted_paths, prefix)
+        if not prefix:
+            return order[start:]
+        # The first string after all those starting with the prefix.
+        end = bisect_left(
+            sorted_paths, prefix[:-1] + chr(ord(prefix[-1]) + 1), lo=start
+        )
+        return order[start:end]
+
 
 class AbstractStat(SerializableStat):
     """
@@ -45,6 +179,18 @@ class AbstractStat(SerializableStat):
     All PyStats are JsonSerializable.
     """
 
+    # Incremented whenever the children of any statistic may have changed
+    # (i.e., an attribute of a Group, or the value of a Vector, is set).
+    # Path indexes built before the change are then rebuilt on next use.
+    # Changes made within the value dictionary of a Vector are not seen.
+    _structure_version = 0
+
+    # The path index of each statistic which has been searched. These are
+    # not kept as attributes as the attributes of a Group are its children.
+    _path_indexes: "weakref.WeakKeyDictionary[AbstractStat, _PathIndex]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def children(
         self,
         predicate: Optional[Callable[[str], bool]] = None,
@@ -68,6 +214,20 @@ class AbstractStat(SerializableStat):
         """
         return []
 
+    def _index_children(self) -> List[Tuple[Any, "AbstractStat", bool]]:
+        """Returns the children of this statistic for the path index. Each
+        is returned as its name, the child, and whether the child itself is
+        listed by ``children`` (rather than only its descendants).
+        """
+        return []
+
+    def _get_path_index(self) -> _PathIndex:
+        index = AbstractStat._path_indexes.get(self)
+        if index is None or index.version != AbstractStat._structure_version:
+            index = _PathIndex(self)
+            AbstractStat._path_indexes[self] = index
+        return index
+
     def find(self, regex: Union[str, Pattern]) -> List["AbstractStat"]:
         """Find all stats that match the name, recursively through all the
         SimStats.
@@ -89,9 +249,57 @@ class AbstractStat(SerializableStat):
             pattern = re.compile(regex)
         else:
             pattern = regex
-        return self.children(
-            lambda _name: re.match(pattern, _name), recursive=True
-        )
+        match = pattern.match
+        index = self._get_path_index()
+        positions = [
+            position
+            for name, name_positions in index.by_name().items()
+            if match(name)
+            for position in name_positions
+        ]
+        positions.sort()
+        return [index.stats[position] for position in positions]
+
+    def find_paths(
+        self, pattern: Union[str, Pattern], glob: bool = False
+    ) -> Dict[str, "AbstractStat"]:
+        """Find all stats whose dotted path, relative to this stat, matches a
+        regular expression or glob pattern. Elements of SimObject vectors are
+        named by their index.
+
+        .. code-block::
+
+            >>> simstat.find_paths("system.cpu.*.numCycles", glob=True)
+            {'system.cpu.0.numCycles': 1000, 'system.cpu.1.numCycles': 998}
+
+
+        :param pattern: The regular expression, or glob pattern, used to
+                        search. A regular expression must match from the
+                        start of the path. A glob pattern must match the
+                        whole path, and its ``*`` also matches ``.``.
+        :param glob: If ``True``, ``pattern`` is a glob pattern. ``False`` by
+                     default.
+
+        :returns: The matching stats, keyed by their path.
+        """
+        index = self._get_path_index()
+        if glob:
+            pattern, prefix = _compile_glob(pattern)
+            candidates = index.paths_with_prefix(prefix)
+        else:
+            if isinstance(pattern, str):
+                pattern = re.compile(pattern)
+            candidates = range(len(index.stats))
+
+        match = pattern.match
+        paths = index.paths()
+        positions = [
+            position for position in candidates if match(paths[position])
+        ]
+        positions.sort()
+        return {
+            paths[position]: index.stats[position] for position in positions
+        }
 
     def _get_vector_item(self, item: str) -> Optional[Tuple[str, int, Any]]:
         """It has been the case in gem5 that SimObject vectors are stored as
@@ -101,16 +309,11 @@ class AbstractStat(SerializableStat):
         split into a SimObject name and index, or if the SimObject does not
         exit at `Simobject[index]`, the function returns None.
         """
-        regex = re.compile("[0-9]+$")
-        match = regex.search(item)
-        if not match:
+        split = _split_vector_name(item)
+        if not split:
             return None
 
-        match_str = match.group()
-
-        assert match_str.isdigit(), f"Regex match must be a digit: {match_str}"
-        vector_index = int(match_str)
-        vector_name = item[: (-1 * len(match_str))]
+        vector_name, vector_index = split
 
         if hasattr(self, vector_name):
             vector = getattr(self, vector_name)
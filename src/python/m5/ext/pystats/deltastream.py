@@ -0,0 +1,361 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Delta streams of SimStat dumps.
+
+When stats are dumped periodically most statistics do not change between one
+dump and the next. A delta stream stores the first dump in full and each
+later dump as only the statistics which changed since the previous dump.
+
+The stream is a JSON-lines file. Each line is a record of one dump and is
+only ever appended, so a stream being written by a running simulation can be
+read at any time. A record is either:
+
+* ``{"full": true, "index": <n>, "simstat": <SimStat JSON>}``, a complete
+  dump (a keyframe), or
+* ``{"full": false, "index": <n>, "changed": [[<path>, <value>], ...],
+  "removed": [<path>, ...]}``, the changes since the previous dump.
+
+A path is a list of the keys, and list indices, leading to a value in the
+SimStat JSON. Values are whole statistics (e.g., a Scalar or a Vector), or the
+non-statistic values of groups (e.g., a group's ``name``).
+
+Usage
+-----
+
+.. code-block::
+
+        from m5.ext.pystats.deltastream import DeltaStreamReader
+
+        with DeltaStreamReader("m5out/stats.jsonl") as stream:
+            print(f"{len(stream)} dumps")
+            simstat = stream.get(10)
+"""
+
+import json
+from bisect import bisect_right
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .jsonloader import (
+    json_to_simstat,
+    json_to_stat,
+)
+from .simstat import SimStat
+
+# The "type" values of JSON objects which are groups of statistics rather
+# than statistics.
+_GROUP_TYPES = ("SimObject", "SimObjectVector", "Group")
+
+PathType = Tuple[Union[str, int], ...]
+
+
+def _is_statistic(tree: Any) -> bool:
+    # Statistics constructed without a type (e.g., Vectors) have a null type.
+    return (
+        isinstance(tree, dict)
+        and "type" in tree
+        and tree["type"] not in _GROUP_TYPES
+    )
+
+
+def flatten(
+    tree: Any, path: PathType = (), flat: Optional[Dict] = None
+) -> Dict[PathType, Any]:
+    """
+    Flattens the JSON of a SimStat into a map of the path of each statistic,
+    and of each non-statistic value, to its JSON value.
+
+    :param tree: The JSON of a SimStat, as returned by ``SimStat.to_json``.
+    :param path: The path of ``tree`` within the SimStat.
+    :param flat: The map to add the values to. A new map if not set.
+    """
+    if flat is None:
+        flat = {}
+    if isinstance(tree, dict) and tree and not _is_statistic(tree):
+        items = tree.items()
+    elif isinstance(tree, list) and tree:
+        items = enumerate(tree)
+    else:
+        flat[path] = tree
+        return flat
+
+    for key, value in items:
+        flatten(value, path + (key,), flat)
+    return flat
+
+
+def _extend_to(node: List, index: int) -> None:
+    if len(node) <= index:
+        node.extend([None] * (index + 1 - len(node)))
+
+
+def _set_path(tree: Any, path: List[Union[str, int]], value: Any) -> Any:
+    """
+    Sets the value at a path of a JSON tree, creating any missing objects and
+    lists on the way. Returns the tree, which is replaced if the path is
+    empty.
+    """
+    if not path:
+        return value
+    node = tree
+    for key, next_key in zip(path, path[1:]):
+        if isinstance(node, list):
+            _extend_to(node, key)
+            missing = node[key] is None
+        else:
+            missing = key not in node
+        if missing:
+            node[key] = [] if isinstance(next_key, int) else {}
+        node = node[key]
+    if isinstance(node, list):
+        _extend_to(node, path[-1])
+    node[path[-1]] = value
+    return tree
+
+
+def _remove_path(tree: Any, path: List[Union[str, int]]) -> None:
+    """
+    Removes the value at a path of a JSON tree. Only the value itself is
+    removed: objects and lists the removal leaves empty are kept, as they may
+    still be in the dump. The writer records the removal of a whole object or
+    list as a path of its own.
+    """
+    node = tree
+    for key in path[:-1]:
+        node = node[key]
+    del node[path[-1]]
+
+
+def _removed_paths(
+    previous: Dict[PathType, Any], flat: Dict[PathType, Any]
+) -> List[PathType]:
+    """
+    Returns the paths of the values in the previous dump which are not in
+    the next. Where a whole object or list was removed, only its path is
+    returned rather than the paths of all of the values in it.
+
+    :param previous: The flattened JSON of the previous dump.
+    :param flat: The flattened JSON of the next dump.
+    """
+    present = set()
+    for path in flat:
+        for end in range(len(path) + 1):
+            present.add(path[:end])
+
+    removed = {}
+    for path in previous:
+        if path in present:
+            continue
+        end = 1
+        while path[:end] in present:
+            end += 1
+        removed[path[:end]] = None
+    return list(removed)
+
+
+def _apply(tree: Any, record: Dict[str, Any]) -> Any:
+    """Applies a delta record to the JSON tree of the previous dump."""
+    # Removals are made from the end of lists first, so that the positions
+    # of the other values to be removed are not changed.
+    for path in sorted(record["removed"], reverse=True):
+        _remove_path(tree, path)
+    for path, value in record["changed"]:
+        tree = _set_path(tree, path, value)
+    return tree
+
+
+class DeltaStreamWriter:
+    """
+    Writes a sequence of SimStat dumps to a delta stream.
+    """
+
+    def __init__(self, path: str, keyframe_interval: int = 0):
+        """
+        :param path: The location of the stream. Any existing file at this
+                     location is replaced by the first dump.
+        :param keyframe_interval: If set, every ``keyframe_interval``-th dump
+                                  is written in full. This bounds the number
+                                  of records read to reconstruct a dump. By
+                                  default only the first dump is written in
+                                  full.
+        """
+        self._path = path
+        self._keyframe_interval = keyframe_interval
+        self._index = 0
+        self._previous: Optional[Dict[PathType, Any]] = None
+
+    def write(self, simstat: Union[SimStat, Dict[str, Any]]) -> None:
+        """
+        Appends a dump to the stream.
+
+        :param simstat: The SimStat to dump, or its JSON.
+        """
+        tree = simstat.to_json() if isinstance(simstat, SimStat) else simstat
+        flat = flatten(tree)
+
+        previous = self._previous
+        if previous is None or (
+            self._keyframe_interval
+            and self._index % self._keyframe_interval == 0
+        ):
+            record = {"full": True, "index": self._index, "simstat": tree}
+        else:
+            record = {
+                "full": False,
+                "index": self._index,
+                "changed": [
+                    [list(path), value]
+                    for path, value in flat.items()
+                    if path not in previous or previous[path] != value
+                ],
+                "removed": [
+                    list(path) for path in _removed_paths(previous, flat)
+                ],
+            }
+
+        with open(self._path, "w" if self._index == 0 else "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")))
+            f.write("\n")
+        self._previous = flat
+        self._index += 1
+
+
+class DeltaStreamReader:
+    """
+    Reads the dumps of a delta stream.
+
+    On opening, the stream is scanned for where each record starts, without
+    decoding the records. A dump is reconstructed by decoding the latest
+    keyframe at or before it and applying the deltas which follow.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: The location of the stream.
+        """
+        self._path = path
+        self._file: IO[bytes] = open(path, "rb")
+        self._offsets: List[int] = []
+        self._keyframes: List[int] = []
+        self._end = 0
+        self.refresh()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "DeltaStreamReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def refresh(self) -> int:
+        """
+        Finds any records appended to the stream since it was last scanned
+        (e.g., by a simulation which is still running). A partially written
+        final record is ignored until it is complete.
+
+        :returns: The number of dumps in the stream.
+        """
+        self._file.seek(self._end)
+        for line in self._file:
+            if not line.endswith(b"\n"):
+                break
+            if line.startswith(b'{"full":true'):
+                self._keyframes.append(len(self._offsets))
+            self._offsets.append(self._end)
+            self._end += len(line)
+        return len(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _read_record(self, index: int) -> Dict[str, Any]:
+        self._file.seek(self._offsets[index])
+        return json.loads(self._file.readline())
+
+    def get_json(self, index: int) -> Dict[str, Any]:
+        """
+        Returns the SimStat JSON of a dump.
+
+        :param index: The index of the dump. Negative indices count from the
+                      last dump.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(
+                f"Dump {index} is not in '{self._path}', which has "
+                f"{len(self)} dumps."
+            )
+
+        keyframe = self._keyframes[bisect_right(self._keyframes, index) - 1]
+        tree = self._read_record(keyframe)["simstat"]
+        for delta in range(keyframe + 1, index + 1):
+            tree = _apply(tree, self._read_record(delta))
+        return tree
+
+    def get(self, index: int) -> SimStat:
+        """
+        Returns the SimStat of a dump.
+
+        :param index: The index of the dump. Negative indices count from the
+                      last dump.
+        """
+        return _to_simstat(self.get_json(index))
+
+    def __getitem__(self, index: int) -> SimStat:
+        return self.get(index)
+
+    def __iter__(self) -> Iterator[SimStat]:
+        """Iterates over the SimStat of each dump, in order. Each record is
+        decoded only once.
+        """
+        tree = None
+        for index in range(len(self)):
+            record = self._read_record(index)
+            tree = (
+                record["simstat"] if record["full"] else _apply(tree, record)
+            )
+            yield _to_simstat(tree)
+
+
+def _to_simstat(tree: Dict[str, Any]) -> SimStat:
+    # The PyStats objects are decoded from a copy of the JSON, as converting
+    # the JSON objects consumes them.
+    return json_to_simstat(
+        json.loads(json.dumps(tree), object_hook=json_to_stat)
+    )
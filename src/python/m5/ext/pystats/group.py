@@ -30,6 +30,7 @@ from typing import (
     Dict,
     List,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -63,6 +64,21 @@ class Group(AbstractStat):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        AbstractStat._structure_version += 1
+
+    def __delattr__(self, name: str) -> None:
+        super().__delattr__(name)
+        AbstractStat._structure_version += 1
+
+    def _index_children(self) -> List[Tuple[Any, AbstractStat, bool]]:
+        return [
+            (attr, obj, True)
+            for attr, obj in self.__dict__.items()
+            if isinstance(obj, AbstractStat)
+        ]
+
     def children(
         self,
         predicate: Optional[Callable[[str], bool]] = None,
@@ -118,6 +134,11 @@ class SimObjectVectorGroup(Group):
         if isinstance(item, int):
             return item >= 0 and item < len(self)
 
+    def _index_children(self) -> List[Tuple[Any, AbstractStat, bool]]:
+        return [
+            (index, child, False) for index, child in enumerate(self.value)
+        ]
+
     def children(
         self,
         predicate: Optional[Callable[[str], bool]] = None,
@@ -25,19 +25,124 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import json
+import re
 from json.decoder import JSONDecodeError
 from typing import (
     IO,
+    Any,
+    Dict,
     Union,
 )
 
-from .group import Group
+from .group import (
+    Group,
+    SimObjectGroup,
+    SimObjectVectorGroup,
+)
 from .simstat import SimStat
 from .statistic import (
     Distribution,
     Scalar,
+    SparseHist,
     Statistic,
+    Vector,
+    Vector2d,
 )
+from .storagetype import StorageType
+from .timeconversion import TimeConversion
+
+_INTEGER_KEY = re.compile(r"-?[0-9]+")
+_FLOAT_KEY = re.compile(r"-?[0-9]+\.[0-9]+")
+
+
+def _parse_index(key: str) -> Union[str, int, float]:
+    """
+    JSON object keys are always strings. The keys of Vectors,
+    Distributions, and SparseHists are returned to the ints, or floats, they
+    were when the stats were dumped.
+    """
+    if _INTEGER_KEY.fullmatch(key):
+        return int(key)
+    if _FLOAT_KEY.fullmatch(key):
+        return float(key)
+    return key
+
+
+def _parse_value(value: Dict[str, Any]) -> Dict[Union[str, int, float], Any]:
+    return {_parse_index(key): stat for key, stat in value.items()}
+
+
+def json_to_stat(d: Dict[str, Any]) -> Union[Dict[str, Any], Statistic, Group]:
+    """
+    Converts a JSON object, as decoded from a stats JSON dump, into the
+    PyStats object it was dumped from. Objects without a ``type`` (e.g., the
+    values of a Vector) are returned unchanged.
+
+    This is intended for use as a ``json`` ``object_hook``.
+
+    :param d: The decoded JSON object. Its children have already been
+              converted.
+    """
+    if "type" not in d:
+        return d
+
+    stat_type = d.pop("type")
+    if stat_type == "Scalar":
+        if isinstance(d.get("datatype"), str):
+            d["datatype"] = StorageType[d["datatype"]]
+        return Scalar(**d)
+    elif stat_type is None and isinstance(d.get("value"), dict):
+        # Vectors, and 2d Vectors, constructed without a type are dumped with
+        # a null type.
+        value = _parse_value(d["value"])
+        vector_class = Vector
+        if value and all(isinstance(v, Vector) for v in value.values()):
+            vector_class = Vector2d
+        return vector_class(value=value, description=d.get("description"))
+    elif stat_type == "Vector":
+        return Vector(
+            value=_parse_value(d["value"]),
+            type=stat_type,
+            description=d.get("description"),
+        )
+    elif stat_type == "Vector2d":
+        return Vector2d(
+            value=_parse_value(d["value"]),
+            type=stat_type,
+            description=d.get("description"),
+        )
+    elif stat_type == "Distribution":
+        d["value"] = _parse_value(d["value"])
+        return Distribution(**d)
+    elif stat_type == "SparseHist":
+        return SparseHist(
+            value=_parse_value(d["value"]),
+            description=d.get("description"),
+        )
+    elif stat_type == "SimObject":
+        return SimObjectGroup(**d)
+    elif stat_type == "SimObjectVector":
+        return SimObjectVectorGroup(**d)
+    elif stat_type == "Group":
+        return Group(**d)
+
+    raise ValueError(f"SimStat object has invalid type {stat_type}")
+
+
+def json_to_simstat(d: Union[Dict[str, Any], Group]) -> SimStat:
+    """
+    Converts the top-level JSON object of a stats JSON dump, as converted by
+    ``json_to_stat``, into a SimStat.
+
+    :param d: The decoded top-level JSON object. When a single root was
+              dumped this has the root's ``SimObject`` type, so will have
+              been converted into a ``SimObjectGroup``.
+    """
+    if isinstance(d, Group):
+        d = dict(d.__dict__)
+    if isinstance(d.get("time_conversion"), dict):
+        d["time_conversion"] = TimeConversion(**d["time_conversion"])
+    return SimStat(**d)
 
 
 class JsonLoader(json.JSONDecoder):
@@ -58,32 +163,10 @@ class JsonLoader(json.JSONDecoder):
     """
 
     def __init__(self):
-        super().__init__(self, object_hook=self.__json_to_simstat)
-
-    def __json_to_simstat(self, d: dict) -> Union[SimStat, Statistic, Group]:
-        if "type" in d:
-            if d["type"] == "Scalar":
-                d.pop("type", None)
-                return Scalar(**d)
-
-            elif d["type"] == "Distribution":
-                d.pop("type", None)
-                return Distribution(**d)
-
-            elif d["type"] == "Group":
-                return Group(**d)
-
-            elif d["type"] == "Vector":
-                d.pop("type", None)
-                d.pop("time_conversion", None)
-                return Vector(d)
-
-            else:
-                raise ValueError(
-                    f"SimStat object has invalid type {d['type']}"
-                )
-        else:
-            return SimStat(**d)
+        super().__init__(object_hook=json_to_stat)
+
+    def decode(self, s: str) -> SimStat:
+        return json_to_simstat(super().decode(s))
 
 
 def load(json_file: IO) -> SimStat:
@@ -0,0 +1,473 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Lazy loading of SimStat JSON dumps.
+
+``jsonloader.load`` builds the PyStats object of every statistic in a dump.
+For large systems this is slow and uses a lot of memory when only a few
+statistics are of interest. ``LazySimStat`` instead memory-maps the dump and,
+on first access, indexes where each JSON object and array lies in the file.
+Only the subtrees which are requested are then decoded into PyStats objects.
+The index is kept alongside the dump, so later loads of the same dump do not
+need to index it again.
+
+``LazySimStat.columns`` exports the values of Vectors, Distributions, and the
+like as NumPy arrays, and ``stack_columns`` stacks these across many runs for
+bulk analysis. NumPy is only needed for these functions.
+
+Usage
+-----
+
+.. code-block::
+
+        from m5.ext.pystats.lazyloader import LazySimStat
+
+        with LazySimStat("m5out/stats.json") as stats:
+            ipc = stats.get("system.processor.cores0.core.ipc")
+            l2 = stats.get("system.cache_hierarchy.l2cache")
+"""
+
+import json
+import mmap
+import os
+import pickle
+import re
+from array import array
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .jsonloader import (
+    json_to_simstat,
+    json_to_stat,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A JSON string, including any escaped quotes or structural characters within
+# it.
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# The tokens which are needed to index a JSON document. Everything else
+# (numbers, literals, commas, and colons) is skipped by ``finditer``. Objects
+# and arrays with no objects or arrays within them are matched whole, so the
+# many leaf statistics of a dump are each a single token.
+_TOKEN = re.compile(
+    b"|".join(
+        (
+            # An object key.
+            b"(" + _STRING + rb")\s*:",
+            # An object, or array, with no objects or arrays within it.
+            rb"\{[^{}\[\]\"]*(?:" + _STRING + rb"[^{}\[\]\"]*)*\}",
+            rb"\[[^{}\[\]\"]*(?:" + _STRING + rb"[^{}\[\]\"]*)*\]",
+            # A string value.
+            _STRING,
+            # The start or end of a nested object or array.
+            rb"[{}\[\]]",
+        )
+    )
+)
+
+# The suffix of the file in which the index of a dump is kept.
+INDEX_SUFFIX = ".index"
+
+# Bumped whenever the layout of the pickled index changes.
+_INDEX_FORMAT = 1
+
+_QUOTE = ord('"')
+_CLOSE = (ord("}"), ord("]"))
+
+# The types of statistic exported by ``LazySimStat.columns``. Vectors, and
+# Vector2ds, constructed without a type are dumped with a null type, so are
+# also exported.
+_COLUMN_TYPES = ("Vector", "Vector2d", "Distribution", "SparseHist")
+
+PathType = Union[str, Sequence[Union[str, int]]]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "NumPy is required for the columnar export of stats. It can be "
+            "installed with `pip install numpy`."
+        )
+
+
+class LazySimStat:
+    """
+    A read-only view of a SimStat JSON dump which decodes statistics only
+    when they are requested.
+
+    Statistics are found by their path: the names of the groups leading to
+    the statistic, separated by ``.`` (e.g., ``system.cpu.numCycles``). As
+    with the PyStats objects, the elements of a SimObject vector may be
+    named either ``cpu.0`` or ``cpu0``, and the elements of a Vector by
+    their index or subname (``vector.0``). A path may also be given as a
+    sequence of names, which is needed when a name contains a ``.``.
+    """
+
+    def __init__(self, path: str, cache_index: bool = True):
+        """
+        :param path: The location of the SimStat JSON dump.
+        :param cache_index: If ``True``, the index is kept alongside the dump
+                            (at ``path`` + ``INDEX_SUFFIX``) so that the dump
+                            need not be indexed again while it is unchanged.
+                            ``True`` by default.
+        """
+        self._path = path
+        self._cache_index = cache_index
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # The index is built on first access. Each JSON object or array is a
+        # node, with node 0 the top-level object. `_starts` and `_ends` hold
+        # the location of each node in the file, and `_children` maps each
+        # node containing objects or arrays to the names of those children.
+        # Array elements are named by their position.
+        self._starts: Optional[array] = None
+        self._ends: Optional[array] = None
+        self._children: Dict[int, Dict[Union[str, int], int]] = {}
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self) -> "LazySimStat":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _build_index(self) -> None:
+        buffer = self._buffer
+        starts = array("q")
+        ends = array("q")
+        children = self._children
+
+        # For each open node: the node and, for arrays, the number of its
+        # elements seen so far.
+        stack: List[List] = []
+        key: Optional[bytes] = None
+        for match in _TOKEN.finditer(buffer):
+            if match.lastindex:
+                key = match.group(1)
+                continue
+
+            start, end = match.span()
+            first = buffer[start]
+            if first == _QUOTE:
+                continue
+            if end - start == 1 and first in _CLOSE:
+                ends[stack.pop()[0]] = end
+                continue
+
+            node = len(starts)
+            starts.append(start)
+            ends.append(end)
+            if stack:
+                parent = stack[-1]
+                if parent[1] is None:
+                    name = (
+                        json.loads(key) if b"\\" in key else key[1:-1].decode()
+                    )
+                else:
+                    name = parent[1]
+                    parent[1] += 1
+                children.setdefault(parent[0], {})[name] = node
+            if end - start == 1:
+                # A nested object or array, which is open until its end.
+                stack.append([node, 0 if first == ord("[") else None])
+
+        if not starts or buffer[starts[0]] != ord("{"):
+            raise ValueError(f"'{self._path}' is not a SimStat JSON dump.")
+        self._starts = starts
+        self._ends = ends
+
+    def _get_signature(self) -> Tuple[int, int]:
+        stat = os.stat(self._path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self) -> bool:
+        try:
+            with open(f"{self._path}{INDEX_SUFFIX}", "rb") as f:
+                index_format, signature, starts, ends, children = pickle.load(
+                    f
+                )
+        except Exception:
+            return False
+        if index_format != _INDEX_FORMAT or signature != self._get_signature():
+            return False
+        self._starts, self._ends, self._children = starts, ends, children
+        return True
+
+    def _save_index(self) -> None:
+        # The index is written next to the stats file, which may be in a
+        # read-only output directory. If it can't be written, the next
+        # loader just scans the file again.
+        index_path = f"{self._path}{INDEX_SUFFIX}"
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    (
+                        _INDEX_FORMAT,
+                        self._get_signature(),
+                        self._starts,
+                        self._ends,
+                        self._children,
+                    ),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+    def _get_index(self) -> Dict[int, Dict[Union[str, int], int]]:
+        if self._starts is None:
+            if not (self._cache_index and self._load_index()):
+                self._build_index()
+                if self._cache_index:
+                    self._save_index()
+        return self._children
+
+    @staticmethod
+    def _split_path(path: PathType) -> List[Union[str, int]]:
+        if isinstance(path, str):
+            return [name for name in path.split(".") if name]
+        return list(path)
+
+    def _child(self, node: int, name: Union[str, int]) -> Optional[int]:
+        # Object members are named by strings and array elements by ints.
+        candidates = [name, str(name)]
+        if isinstance(name, str) and name.isdigit():
+            candidates.append(int(name))
+
+        # The elements of SimObject vectors, and of Vectors, are found
+        # within their "value".
+        children = self._children.get(node, {})
+        for container in (children, self._children.get(children.get("value"))):
+            for candidate in candidates:
+                if container and candidate in container:
+                    return container[candidate]
+
+        if isinstance(name, int):
+            return None
+
+        # SimObject vector elements may also be named as, e.g., "cpu0".
+        match = re.search("[0-9]+$", name)
+        if match and match.start() > 0:
+            vector = self._child(node, name[: match.start()])
+            if vector is not None:
+                return self._child(vector, int(match.group()))
+        return None
+
+    def _find(self, path: PathType) -> int:
+        self._get_index()
+        node = 0
+        for name in self._split_path(path):
+            child = self._child(node, name)
+            if child is None:
+                raise KeyError(f"No statistic '{path}' in '{self._path}'.")
+            node = child
+        return node
+
+    def _decode(self, node: int, object_hook=None) -> Any:
+        data = self._buffer[self._starts[node] : self._ends[node]]
+        return json.loads(data, object_hook=object_hook)
+
+    def _get(self, path: PathType, object_hook) -> Any:
+        names = self._split_path(path)
+        if not names:
+            return json_to_simstat(
+                self._decode(self._find(names), object_hook)
+            )
+
+        parent = self._find(names[:-1])
+        node = self._child(parent, names[-1])
+        if node is not None:
+            return self._decode(node, object_hook)
+
+        # Values which are not objects or arrays are not indexed, so are
+        # found by decoding their parent.
+        value = self._decode(parent)
+        if isinstance(value, dict) and names[-1] in value:
+            return value[names[-1]]
+        raise KeyError(f"No statistic '{path}' in '{self._path}'.")
+
+    def get(self, path: PathType) -> Any:
+        """
+        Decodes the statistic, or group of statistics, at a path into its
+        PyStats object. Only that part of the dump is decoded.
+
+        :param path: The path of the statistic. The empty path returns the
+                     SimStat of the whole dump.
+
+        :returns: The PyStats object at the path. For values which are not
+                  JSON objects (e.g., a group's ``name``) the value is
+                  returned.
+        """
+        return self._get(path, json_to_stat)
+
+    def __getitem__(self, path: PathType) -> Any:
+        return self.get(path)
+
+    def __contains__(self, path: PathType) -> bool:
+        names = self._split_path(path)
+        try:
+            parent = self._find(names[:-1])
+        except KeyError:
+            return False
+        if not names or self._child(parent, names[-1]) is not None:
+            return True
+        value = self._decode(parent)
+        return isinstance(value, dict) and names[-1] in value
+
+    def keys(self, path: PathType = "") -> List[Union[str, int]]:
+        """
+        Returns the names of the groups and statistics at a path, without
+        decoding them. Values which are not JSON objects (e.g., a group's
+        ``name``) are not included.
+
+        :param path: The path of the group. By default the top level.
+        """
+        return list(self._children.get(self._find(path), {}))
+
+    def columns(
+        self, regex: Optional[Union[str, Pattern]] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Exports the values of each Vector, Vector2d, Distribution, and
+        SparseHist in the dump as a NumPy array. Vector2ds are exported as 2D
+        arrays, with a row per x index. All other types are exported as 1D
+        arrays, in the order of the dump.
+
+        :param regex: If set, only statistics whose path matches this regular
+                      expression (anywhere in the path) are exported.
+
+        :returns: A map of each statistic's path to its values. Elements of
+                  SimObject vectors are named by their index, e.g.,
+                  ``system.cpu.0.statistic``.
+        """
+        _require_numpy()
+        children = self._get_index()
+        if isinstance(regex, str):
+            regex = re.compile(regex)
+
+        columns = {}
+        to_visit = [(0, "")]
+        while to_visit:
+            node, path = to_visit.pop()
+            node_children = children.get(node, {})
+            value = node_children.get("value")
+            if value is not None and value in children:
+                if self._buffer[self._starts[value]] == ord("["):
+                    # A SimObject vector. Its elements are named by index.
+                    for index, element in children[value].items():
+                        to_visit.append((element, f"{path}.{index}"))
+                    continue
+                if regex is None or regex.search(path):
+                    stat = self._decode(node)
+                    if stat.get("type") in _COLUMN_TYPES or (
+                        stat.get("type") is None
+                        and isinstance(stat["value"], dict)
+                    ):
+                        columns[path] = _to_array(stat)
+                        continue
+
+            for name, child in node_children.items():
+                to_visit.append((child, f"{path}.{name}" if path else name))
+
+        return dict(sorted(columns.items()))
+
+
+def _to_array(stat: Dict[str, Any]) -> "np.ndarray":
+    values = stat["value"].values()
+    if values and all(isinstance(v["value"], dict) for v in values):
+        # A Vector2d, each value of which is a Vector.
+        return np.array(
+            [[s["value"] for s in v["value"].values()] for v in values],
+            dtype=np.float64,
+        )
+    return np.fromiter(
+        (s["value"] for s in values), dtype=np.float64, count=len(values)
+    )
+
+
+def lazy_load(path: str, cache_index: bool = True) -> LazySimStat:
+    """
+    Opens a SimStat JSON dump for lazy loading. See ``LazySimStat``.
+
+    :param path: The location of the SimStat JSON dump.
+    :param cache_index: If ``True``, the index of the dump is kept alongside
+                        it. ``True`` by default.
+    """
+    return LazySimStat(path, cache_index=cache_index)
+
+
+def stack_columns(
+    paths: List[str], regex: Optional[Union[str, Pattern]] = None
+) -> Dict[str, "np.ndarray"]:
+    """
+    Exports the values of the same statistics from many SimStat JSON dumps
+    (e.g., the dumps of many runs) as NumPy arrays with a row per dump.
+
+    :param paths: The locations of the SimStat JSON dumps.
+    :param regex: If set, only statistics whose path matches this regular
+                  expression are exported. See ``LazySimStat.columns``.
+
+    :returns: A map of each statistic's path to an array of its values in
+              each dump. Statistics which are not in every dump are omitted.
+    """
+    _require_numpy()
+    per_dump = []
+    for path in paths:
+        with LazySimStat(path) as stats:
+            per_dump.append(stats.columns(regex))
+    if not per_dump:
+        return {}
+
+    stacked = {}
+    for name in per_dump[0]:
+        if all(name in columns for columns in per_dump):
+            values = [columns[name] for columns in per_dump]
+            if len({v.shape for v in values}) != 1:
+                raise ValueError(
+                    f"The statistic '{name}' has a different size in some of "
+                    "the dumps."
+                )
+            stacked[name] = np.stack(values)
+    return stacked
@@ -32,6 +32,7 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -124,6 +125,11 @@ class Vector(Statistic):
                 item = float(item)
         return item in self.value
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "value":
+            AbstractStat._structure_version += 1
+
     def __iner__(self) -> None:
         return iter(self.value)
 
@@ -159,6 +165,13 @@ class Vector(Statistic):
         assert self.value != None
         return sum(float(self.value[key]) for key in self.values)
 
+    def _index_children(self) -> List[Tuple[Any, AbstractStat, bool]]:
+        return [
+            (key, obj, True)
+            for key, obj in self.value.items()
+            if isinstance(obj, AbstractStat)
+        ]
+
     def children(
         self,
         predicate: Optional[Callable[[str], bool]] = None,
@@ -203,6 +216,18 @@ class Vector2d(Statistic):
             description=description,
         )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "value":
+            AbstractStat._structure_version += 1
+
+    def _index_children(self) -> List[Tuple[Any, AbstractStat, bool]]:
+        return [
+            (key, obj, True)
+            for key, obj in self.value.items()
+            if isinstance(obj, AbstractStat)
+        ]
+
     def x_size(self) -> int:
         """Returns the number of elements in the x dimension."""
         assert self.value is not None
@@ -254,6 +254,13 @@ def parse_options():
         default="config.dot",
         help="Create DOT & pdf outputs of the configuration [Default: %default]",
     )
+    option(
+        "--background-config",
+        action="store_true",
+        default=False,
+        help="Write the config.ini, config.json, and DOT outputs in a"
+        + " background thread while the C++ objects are created",
+    )
     option(
         "--dot-dvfs-config",
         metavar="FILE",
@@ -261,6 +268,13 @@ def parse_options():
         help="Create DOT & pdf outputs of the DVFS configuration"
         + " [Default: %default]",
     )
+    option(
+        "--instantiate-timing",
+        metavar="FILE",
+        default=None,
+        help="Write the time taken by each phase of m5.instantiate() to FILE"
+        + " [Default: %default]",
+    )
 
     # Debugging options
     group("Debugging Options")
@@ -468,7 +482,13 @@ def main():
         debug.help()
 
     if options.list_sim_objects:
-        from . import SimObject
+        from . import (
+            SimObject,
+            objects,
+        )
+
+        # Import all the SimObjects, if m5.objects is imported lazily.
+        objects.__all__
 
         done = True
         print("SimObjects:")
@@ -24,6 +24,102 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-for module in __spec__.loader_state:
-    if module.startswith("m5.objects."):
-        exec(f"from {module} import *")
+"""
+The SimObjects, and related names, of all the ``m5.objects`` modules.
+
+By default every ``m5.objects`` module is imported when this package is
+imported. If the ``M5_LAZY_OBJECTS`` environment variable is set to "true",
+the modules are instead imported on demand: on first access of a name (e.g.,
+``m5.objects.System``), only the module defining it is imported, using an
+index of the names defined by each module generated at build time
+(``m5.objects_index``). ``from m5.objects import *`` imports every module, as
+in the default mode.
+"""
+
+import importlib as _importlib
+import os as _os
+import sys as _sys
+import types as _types
+
+_modules = [
+    module
+    for module in __spec__.loader_state
+    if module.startswith("m5.objects.")
+]
+
+
+def _import_all():
+    """Imports all the names of all the m5.objects modules into this
+    package.
+    """
+    for module in _modules:
+        exec(f"from {module} import *", globals())
+
+
+_lazy = _os.environ.get("M5_LAZY_OBJECTS", "false").lower() in ("true", "yes")
+
+if _lazy:
+    try:
+        from m5.objects_index import index as _index
+    except ImportError:
+        _index = {}
+    # The index covers the modules of all builds, so only modules in this
+    # build are kept.
+    _present = set(_modules)
+    _index = {
+        name: module for name, module in _index.items() if module in _present
+    }
+
+    class _LazyObjectsModule(_types.ModuleType):
+        def __setattr__(self, name, value):
+            # Importing an m5.objects module binds the module to its name in
+            # this package. This would hide the SimObject of the same name,
+            # which is imported on demand instead.
+            if (
+                isinstance(value, _types.ModuleType)
+                and value.__name__ == f"{__name__}.{name}"
+                and name in _index
+            ):
+                return
+            super().__setattr__(name, value)
+
+    _sys.modules[__name__].__class__ = _LazyObjectsModule
+
+    def __getattr__(name):
+        global _lazy
+
+        if name == "__all__":
+            # `from m5.objects import *` imports every module.
+            if _lazy:
+                _lazy = False
+                _import_all()
+            return [key for key in globals() if not key.startswith("_")]
+
+        if name.startswith("__"):
+            raise AttributeError(
+                f"module 'm5.objects' has no attribute '{name}'"
+            )
+
+        module = _index.get(name) if _lazy else None
+        if module is None:
+            # The name is not defined by an m5.objects module (e.g., it is
+            # imported from m5.params by the modules), or does not exist, so
+            # all the modules are imported, as in the default mode.
+            if _lazy:
+                _lazy = False
+                _import_all()
+            if name in globals():
+                return globals()[name]
+            raise AttributeError(
+                f"module 'm5.objects' has no attribute '{name}'"
+            )
+
+        value = getattr(_importlib.import_module(module), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_index))
+
+else:
+    _import_all()
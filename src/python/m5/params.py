@@ -187,6 +187,12 @@ class ParamDesc:
         if attr == "ptype":
             from . import SimObject
 
+            if self.ptype_str not in SimObject.allClasses:
+                # If m5.objects is imported lazily, the module defining the
+                # class may not have been imported yet.
+                from . import objects
+
+                getattr(objects, self.ptype_str, None)
             ptype = SimObject.allClasses[self.ptype_str]
             assert isSimObjectClass(ptype)
             self.ptype = ptype
@@ -40,12 +40,15 @@
 import atexit
 import os
 import sys
+import time
 
-from m5.util.dot_writer import (
-    do_dot,
-    do_dvfs_dot,
+from m5.util.config_writer import (
+    ConfigWriter,
+    write_dot,
+    write_ini,
+    write_json,
 )
-from m5.util.dot_writer_ruby import do_ruby_dot
+from m5.util.dot_writer import do_dvfs_dot
 
 import _m5.core
 
@@ -91,6 +94,8 @@ def instantiate(ckpt_dir=None):
     if not root:
         fatal("Need to instantiate Root() before calling instantiate()")
 
+    timer = _PhaseTimer()
+
     # we need to fix the global frequency
     ticks.fixGlobalFrequency()
 
@@ -98,34 +103,53 @@ def instantiate(ckpt_dir=None):
     # hierarchy so we catch them with future descendants() walks
     for obj in root.descendants():
         obj.adoptOrphanParams()
+    timer.end_phase("adoptOrphanParams")
 
-    # Unproxy in sorted order for determinism
-    for obj in root.descendants():
-        obj.unproxyParams()
+    # Unproxy in sorted order for determinism. The searches of Parent.all
+    # proxies are memoized, as many params search the same subtrees.
+    with SimObject.memoize_find_all():
+        for obj in root.descendants():
+            obj.unproxyParams()
+    timer.end_phase("unproxyParams")
+
+    # The hierarchy no longer changes, so the sorted order of the SimObjects
+    # (and their paths) is found once and used by all the following passes.
+    root.freeze_descendants()
+    timer.end_phase("freeze_descendants")
 
     if options.dump_config:
-        ini_file = open(os.path.join(options.outdir, options.dump_config), "w")
-        # Print ini sections in sorted order for easier diffing
-        for obj in sorted(root.descendants(), key=lambda o: o.path()):
-            obj.print_ini(ini_file)
-        ini_file.close()
-
-    if options.json_config:
-        try:
-            import json
-
-            json_file = open(
-                os.path.join(options.outdir, options.json_config), "w"
-            )
-            d = root.get_config_as_dict()
-            json.dump(d, json_file, indent=4)
-            json_file.close()
-        except ImportError:
-            pass
+        # Register the SimObjects by path, so that they can be found by
+        # resolveSimObject.
+        for obj in root.descendants():
+            SimObject.instanceDict[obj.path()] = obj
+
+    config_writer = None
+    if getattr(options, "background_config", False):
+        # The hierarchy is frozen, so the config files are written while
+        # the C++ objects are created, and are finished by the end of
+        # instantiate().
+        config_writer = ConfigWriter(
+            root,
+            options.outdir,
+            ini_file=options.dump_config,
+            json_file=options.json_config,
+            dot_file=options.dot_config,
+        )
+        config_writer.start()
+        timer.end_phase("start_config_writer")
+    else:
+        if options.dump_config:
+            # Print ini sections in sorted order for easier diffing
+            write_ini(root, os.path.join(options.outdir, options.dump_config))
+            timer.end_phase("dump_config")
+
+        if options.json_config:
+            write_json(root, os.path.join(options.outdir, options.json_config))
+            timer.end_phase("json_config")
 
-    if options.dot_config:
-        do_dot(root, options.outdir, options.dot_config)
-        do_ruby_dot(root, options.outdir, options.dot_config)
+        if options.dot_config:
+            write_dot(root, options.outdir, options.dot_config)
+            timer.end_phase("dot_config")
 
     # Initialize the global statistics
     stats.initSimStats()
@@ -133,30 +157,37 @@ def instantiate(ckpt_dir=None):
     # Create the C++ sim objects and connect ports
     for obj in root.descendants():
         obj.createCCObject()
+    timer.end_phase("createCCObject")
     for obj in root.descendants():
         obj.connectPorts()
+    timer.end_phase("connectPorts")
 
     # Do a second pass to finish initializing the sim objects
     for obj in root.descendants():
         obj.init()
+    timer.end_phase("init")
 
     # Do a third pass to initialize statistics
     stats._bindStatHierarchy(root)
     root.regStats()
+    timer.end_phase("regStats")
 
     # Do a fourth pass to initialize probe points
     for obj in root.descendants():
         obj.regProbePoints()
+    timer.end_phase("regProbePoints")
 
     # Do a fifth pass to connect probe listeners
     for obj in root.descendants():
         obj.regProbeListeners()
+    timer.end_phase("regProbeListeners")
 
     # We want to generate the DVFS diagram for the system. This can only be
     # done once all of the CPP objects have been created and initialised so
     # that we are able to figure out which object belongs to which domain.
     if options.dot_dvfs_config:
         do_dvfs_dot(root, options.outdir, options.dot_dvfs_config)
+        timer.end_phase("dot_dvfs_config")
 
     # We're done registering statistics.  Enable the stats package now.
     stats.enable()
@@ -167,15 +198,56 @@ def instantiate(ckpt_dir=None):
         ckpt = _m5.core.getCheckpoint(ckpt_dir)
         for obj in root.descendants():
             obj.loadState(ckpt)
+        timer.end_phase("loadState")
     else:
         for obj in root.descendants():
             obj.initState()
+        timer.end_phase("initState")
 
     # Check to see if any of the stat events are in the past after resuming from
     # a checkpoint, If so, this call will shift them to be at a valid time.
     updateStatEvents()
 
     gather_citations(root)
+    timer.end_phase("gather_citations")
+
+    if config_writer:
+        config_writer.join()
+        timer.end_phase("join_config_writer")
+
+    instantiate_timing = getattr(options, "instantiate_timing", None)
+    if instantiate_timing:
+        timer.write(
+            os.path.join(options.outdir, instantiate_timing),
+            sum(1 for _ in root.descendants()),
+        )
+
+
+class _PhaseTimer:
+    """
+    Records the wallclock time taken by each phase of `instantiate`.
+    """
+
+    def __init__(self):
+        self._phases = []
+        self._last = time.perf_counter()
+
+    def end_phase(self, name: str) -> None:
+        """Records the end of a phase, which started at the end of the
+        previous phase.
+        """
+        now = time.perf_counter()
+        self._phases.append((name, now - self._last))
+        self._last = now
+
+    def write(self, path: str, num_objects: int) -> None:
+        """Writes a report of the time taken by each phase to a file."""
+        total = sum(seconds for _, seconds in self._phases)
+        with open(path, "w") as f:
+            print(f"# m5.instantiate of {num_objects} SimObjects", file=f)
+            for name, seconds in self._phases:
+                print(f"{name:<24}{seconds:12.6f} s", file=f)
+            print(f"{'total':<24}{total:12.6f} s", file=f)
 
 
 need_startup = True
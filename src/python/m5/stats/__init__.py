@@ -51,7 +51,10 @@ import _m5.stats
 from _m5.stats import periodicStatDump
 from _m5.stats import schedStatEvent as schedEvent
 
-from .gem5stats import JsonOutputVistor
+from .gem5stats import (
+    JsonDeltaOutputVisitor,
+    JsonOutputVistor,
+)
 
 outputList = []
 
@@ -191,14 +194,30 @@ def _hdf5Factory(fn, chunking=10, desc=True, formulas=True):
 
 
 @_url_factory(["json"])
-def _jsonFactory(fn):
+def _jsonFactory(fn, delta=False, keyframe_interval=0):
     """Output stats in JSON format.
 
+    By default each dump replaces the file with the full JSON of the stats.
+    With delta=True each dump is instead appended to the file as only the
+    stats which changed since the previous dump, as a stream of JSON lines.
+    The stream can be read, and any dump reconstructed, with
+    m5.ext.pystats.deltastream.DeltaStreamReader. This greatly reduces the
+    cost of frequent periodic dumps.
+
+    Parameters:
+      * delta (bool): Write a delta stream (default: False)
+      * keyframe_interval (unsigned): In a delta stream, write every nth
+        dump in full, bounding the work needed to read any dump. 0 writes
+        only the first dump in full (default: 0)
+
     Example:
       json://stats.json
+      json://stats.jsonl?delta=True;keyframe_interval=100
 
     """
 
+    if delta:
+        return JsonDeltaOutputVisitor(fn, keyframe_interval=keyframe_interval)
     return JsonOutputVistor(fn)
 
 
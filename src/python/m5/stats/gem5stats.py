@@ -29,19 +29,26 @@ This serves as the bridge between the gem5 statistics exposed via PyBind11 and
 the Python Stats model.
 """
 
+import re
 from datetime import datetime
 from typing import (
     IO,
+    Any,
+    Dict,
     List,
+    Optional,
+    Tuple,
     Union,
 )
 
+from m5.ext.pystats.deltastream import DeltaStreamWriter
 from m5.ext.pystats.group import *
 from m5.ext.pystats.simstat import *
 from m5.ext.pystats.statistic import *
 from m5.ext.pystats.storagetype import *
-from m5.objects import *
+from m5.objects import Root
 from m5.params import SimObjectVector
+from m5.SimObject import SimObject
 
 import _m5.stats
 
@@ -84,6 +91,49 @@ class JsonOutputVistor:
             simstat.dump(fp=fp, **self.json_args)
 
 
+class JsonDeltaOutputVisitor(JsonOutputVistor):
+    """
+    A JSON output which writes each dump as only the stats which have changed
+    since the previous dump. The output is a delta stream, which can be read
+    with ``m5.ext.pystats.deltastream.DeltaStreamReader``.
+
+    This is intended for frequent, periodic, stats dumps, where most stats
+    are unchanged between dumps.
+    """
+
+    def __init__(self, file: str, keyframe_interval: int = 0):
+        """
+        :param file: The output file location in which the stream will be
+                     written.
+
+        :param keyframe_interval: If set, every ``keyframe_interval``-th dump
+                                  is written in full. By default only the
+                                  first dump is written in full.
+        """
+
+        super().__init__(file)
+        self._writer = DeltaStreamWriter(
+            file, keyframe_interval=keyframe_interval
+        )
+
+    def dump(self, roots: Union[List[SimObject], Root]) -> None:
+        """
+        Appends the stats of a simulation root (or list of roots) to the
+        output stream.
+
+        .. warning::
+
+            This dump assumes the statistics have already been prepared
+            for the target root.
+
+
+        :param roots: The Root, or List of roots, whose stats are are to be
+                      dumped.
+        """
+
+        self._writer.write(get_simstat(root=roots, prepare_stats=False))
+
+
 def __get_statistic(statistic: _m5.stats.Info) -> Optional[Statistic]:
     """
     Translates a _m5.stats.Info object into a Statistic object, to process
@@ -98,168 +148,232 @@ def __get_statistic(statistic: _m5.stats.Info) -> Optional[Statistic]:
     assert isinstance(statistic, _m5.stats.Info)
     statistic.prepare()
 
-    if isinstance(statistic, _m5.stats.ScalarInfo):
-        if statistic.is_nozero and statistic.value == 0.0:
-            # In the case where the "nozero" flag is set, and the value is
-            # zero, we don't want to include this statistic so return None.
-            return None
-        return __get_scaler(statistic)
-    elif isinstance(statistic, _m5.stats.DistInfo):
-        return __get_distribution(statistic)
-    elif isinstance(statistic, _m5.stats.FormulaInfo):
-        # We don't do anything with Formula's right now.
-        # We may never do so, see https://gem5.atlassian.net/browse/GEM5-868.
-        pass
-    elif isinstance(statistic, _m5.stats.VectorInfo):
-        return __get_vector(statistic)
-    elif isinstance(statistic, _m5.stats.Vector2dInfo):
-        return __get_vector2d(statistic)
-    elif isinstance(statistic, _m5.stats.SparseHistInfo):
-        return __get_sparse_hist(statistic)
+    reader = _get_reader(statistic)
+    return reader.read(statistic) if reader else None
 
-    return None
 
+class _StatReader:
+    """
+    Reads the Statistic of an Info object. The layout of the statistic (e.g.,
+    the names and descriptions of the elements of a Vector), which does not
+    change between reads, is found once, when the reader is created.
+    """
 
-def __get_scaler(statistic: _m5.stats.ScalarInfo) -> Scalar:
-    value = statistic.value
-    unit = statistic.unit
-    description = statistic.desc
-    # ScalarInfo uses the C++ `double`.
-    datatype = StorageType["f64"]
+    def __init__(self, statistic: _m5.stats.Info):
+        self.layout = self._get_layout(statistic)
 
-    return Scalar(
-        value=value, unit=unit, description=description, datatype=datatype
-    )
+    def _get_layout(self, statistic: _m5.stats.Info) -> Any:
+        return None
 
+    def read(self, statistic: _m5.stats.Info) -> Optional[Statistic]:
+        """
+        Returns the Statistic of the Info object, with its current values.
+        Returns ``None`` if the statistic should not be included.
+        """
+        raise NotImplementedError
 
-def __get_distribution(statistic: _m5.stats.DistInfo) -> Distribution:
-    description = statistic.desc
-    value = statistic.values
-    bin_size = statistic.bucket_size
-    min = statistic.min_val
-    max = statistic.max_val
-    num_bins = len(value)
-    sum_val = statistic.sum
-    sum_squared = statistic.squares
-    underflow = statistic.underflow
-    overflow = statistic.overflow
-    logs = statistic.logs
-
-    parsed_values = {}
-    for index in range(len(value)):
-        parsed_values[index] = Scalar(
-            value=value[index],
-            unit=statistic.unit,
-            datatype=StorageType["f64"],
-        )
 
-    return Distribution(
-        value=parsed_values,
-        min=min,
-        max=max,
-        num_bins=num_bins,
-        bin_size=bin_size,
-        sum=sum_val,
-        sum_squared=sum_squared,
-        underflow=underflow,
-        overflow=overflow,
-        logs=logs,
-        description=description,
-    )
+class _ScalarReader(_StatReader):
+    def _get_layout(self, statistic: _m5.stats.ScalarInfo) -> Tuple[str, str]:
+        return statistic.unit, statistic.desc
 
+    def read(self, statistic: _m5.stats.ScalarInfo) -> Optional[Scalar]:
+        value = statistic.value
+        if statistic.is_nozero and value == 0.0:
+            # In the case where the "nozero" flag is set, and the value is
+            # zero, we don't want to include this statistic so return None.
+            return None
 
-def __get_vector(statistic: _m5.stats.VectorInfo) -> Vector:
-    vec: Dict[Union[str, int, float], Scalar] = {}
+        unit, description = self.layout
+        # ScalarInfo uses the C++ `double`.
+        return Scalar(
+            value=value,
+            unit=unit,
+            description=description,
+            datatype=StorageType["f64"],
+        )
 
-    for index in range(statistic.size):
-        # All the values in a Vector are Scalar values
-        value = statistic.value[index]
-        assert isinstance(value, float) or isinstance(value, int)
 
-        # Sometimes elements within a vector are defined by their name. Other
-        # times they have no name. When a name is not available, we name the
-        # stat the index value.
-        if len(statistic.subnames) > index and statistic.subnames[index]:
-            index_subname = str(statistic.subnames[index])
-            if index_subname.isdigit():
-                index_subname = int(index_subname)
-            elif index_subname.isnumeric():
-                index_subname = float(index_subname)
-        else:
-            index_subname = index
+class _DistributionReader(_StatReader):
+    def read(self, statistic: _m5.stats.DistInfo) -> Distribution:
+        unit = statistic.unit
+        value = statistic.values
 
-        index_subdesc = None
-        if len(statistic.subdescs) > index and statistic.subdescs[index]:
-            index_subdesc = str(statistic.subdescs[index])
-        else:
-            index_subdesc = statistic.desc
+        parsed_values = {}
+        for index in range(len(value)):
+            parsed_values[index] = Scalar(
+                value=value[index],
+                unit=unit,
+                datatype=StorageType["f64"],
+            )
 
-        vec[index_subname] = Scalar(
-            value=value,
-            unit=statistic.unit,
-            description=index_subdesc,
-            datatype=StorageType["f64"],
+        return Distribution(
+            value=parsed_values,
+            min=statistic.min_val,
+            max=statistic.max_val,
+            num_bins=len(value),
+            bin_size=statistic.bucket_size,
+            sum=statistic.sum,
+            sum_squared=statistic.squares,
+            underflow=statistic.underflow,
+            overflow=statistic.overflow,
+            logs=statistic.logs,
+            description=statistic.desc,
         )
 
-    return Vector(
-        vec,
-        type="Vector",
-        description=statistic.desc,
-    )
 
+class _SparseHistReader(_StatReader):
+    def read(self, statistic: _m5.stats.SparseHistInfo) -> SparseHist:
+        unit = statistic.unit
+        value = statistic.values
 
-def __get_vector2d(statistic: _m5.stats.Vector2dInfo) -> Vector2d:
-    # All the values in a 2D Vector are Scalar values
-    description = statistic.desc
-    x_size = statistic.x_size
-    y_size = statistic.y_size
+        parsed_values = {}
+        for val in value:
+            parsed_values[val] = Scalar(
+                value=value[val],
+                unit=unit,
+                datatype=StorageType["f64"],
+            )
 
-    vector_rep: Dict[Union[str, int, float], Vector] = {}
-    for x_index in range(x_size):
-        x_index_string = x_index
-        if x_index in statistic.subnames:
-            x_index_string = str(statistic.subnames[x_index])
+        return SparseHist(
+            value=parsed_values,
+            description=statistic.desc,
+        )
 
-        x_desc = description
-        if x_index in statistic.subdescs:
-            x_desc = str(statistic.subdescs[x_index])
-        x_vec: Dict[str, Scalar] = {}
-        for y_index in range(y_size):
-            y_index_val = y_index
-            if y_index in statistic.ysubnames:
-                y_index_val = str(statistic.subnames[y_index])
 
-            x_vec[y_index_val] = Scalar(
-                value=statistic.value[x_index * y_size + y_index],
-                unit=statistic.unit,
+class _VectorReader(_StatReader):
+    def _get_layout(
+        self, statistic: _m5.stats.VectorInfo
+    ) -> List[Tuple[Union[str, int, float], str]]:
+        subnames = statistic.subnames
+        subdescs = statistic.subdescs
+        layout = []
+        for index in range(statistic.size):
+            # Sometimes elements within a vector are defined by their name.
+            # Other times they have no name. When a name is not available, we
+            # name the stat the index value.
+            if len(subnames) > index and subnames[index]:
+                index_subname = str(subnames[index])
+                if index_subname.isdigit():
+                    index_subname = int(index_subname)
+                elif index_subname.isnumeric():
+                    index_subname = float(index_subname)
+            else:
+                index_subname = index
+
+            if len(subdescs) > index and subdescs[index]:
+                index_subdesc = str(subdescs[index])
+            else:
+                index_subdesc = statistic.desc
+
+            layout.append((index_subname, index_subdesc))
+        return layout
+
+    def read(self, statistic: _m5.stats.VectorInfo) -> Vector:
+        if statistic.size != len(self.layout):
+            self.layout = self._get_layout(statistic)
+
+        # `value` is copied from C++ each time it is accessed, so it is only
+        # accessed once.
+        values = statistic.value
+        unit = statistic.unit
+        vec: Dict[Union[str, int, float], Scalar] = {}
+        for (index_subname, index_subdesc), value in zip(self.layout, values):
+            # All the values in a Vector are Scalar values
+            assert isinstance(value, float) or isinstance(value, int)
+            vec[index_subname] = Scalar(
+                value=value,
+                unit=unit,
+                description=index_subdesc,
                 datatype=StorageType["f64"],
             )
 
-        vector_rep[x_index_string] = Vector(
-            x_vec,
+        return Vector(
+            vec,
             type="Vector",
-            description=x_desc,
+            description=statistic.desc,
         )
 
-    return Vector2d(value=vector_rep, type="Vector2d", description=description)
 
+class _Vector2dReader(_StatReader):
+    def _get_layout(
+        self, statistic: _m5.stats.Vector2dInfo
+    ) -> Tuple[List[Tuple[Union[str, int], str]], List[Union[str, int]]]:
+        description = statistic.desc
+        x_layout = []
+        for x_index in range(statistic.x_size):
+            x_index_string = x_index
+            if x_index in statistic.subnames:
+                x_index_string = str(statistic.subnames[x_index])
+
+            x_desc = description
+            if x_index in statistic.subdescs:
+                x_desc = str(statistic.subdescs[x_index])
+            x_layout.append((x_index_string, x_desc))
+
+        y_layout = []
+        for y_index in range(statistic.y_size):
+            y_index_val = y_index
+            if y_index in statistic.ysubnames:
+                y_index_val = str(statistic.subnames[y_index])
+            y_layout.append(y_index_val)
 
-def __get_sparse_hist(statistic: _m5.stats.SparseHistInfo) -> SparseHist:
-    description = statistic.desc
-    value = statistic.values
+        return x_layout, y_layout
 
-    parsed_values = {}
-    for val in value:
-        parsed_values[val] = Scalar(
-            value=value[val],
-            unit=statistic.unit,
-            datatype=StorageType["f64"],
+    def read(self, statistic: _m5.stats.Vector2dInfo) -> Vector2d:
+        x_layout, y_layout = self.layout
+        if statistic.x_size != len(x_layout) or statistic.y_size != len(
+            y_layout
+        ):
+            self.layout = self._get_layout(statistic)
+            x_layout, y_layout = self.layout
+
+        # All the values in a 2D Vector are Scalar values
+        values = statistic.value
+        unit = statistic.unit
+        y_size = len(y_layout)
+        vector_rep: Dict[Union[str, int, float], Vector] = {}
+        for x_index, (x_index_string, x_desc) in enumerate(x_layout):
+            x_vec: Dict[str, Scalar] = {}
+            for y_index, y_index_val in enumerate(y_layout):
+                x_vec[y_index_val] = Scalar(
+                    value=values[x_index * y_size + y_index],
+                    unit=unit,
+                    datatype=StorageType["f64"],
+                )
+
+            vector_rep[x_index_string] = Vector(
+                x_vec,
+                type="Vector",
+                description=x_desc,
+            )
+
+        return Vector2d(
+            value=vector_rep, type="Vector2d", description=statistic.desc
         )
 
-    return SparseHist(
-        value=parsed_values,
-        description=description,
-    )
+
+def _get_reader(statistic: _m5.stats.Info) -> Optional[_StatReader]:
+    """
+    Returns the reader of an Info object, or ``None`` if the Info object is
+    never translated to a Statistic.
+    """
+    if isinstance(statistic, _m5.stats.ScalarInfo):
+        return _ScalarReader(statistic)
+    elif isinstance(statistic, _m5.stats.DistInfo):
+        return _DistributionReader(statistic)
+    elif isinstance(statistic, _m5.stats.FormulaInfo):
+        # We don't do anything with Formula's right now.
+        # We may never do so, see https://gem5.atlassian.net/browse/GEM5-868.
+        pass
+    elif isinstance(statistic, _m5.stats.VectorInfo):
+        return _VectorReader(statistic)
+    elif isinstance(statistic, _m5.stats.Vector2dInfo):
+        return _Vector2dReader(statistic)
+    elif isinstance(statistic, _m5.stats.SparseHistInfo):
+        return _SparseHistReader(statistic)
+
+    return None
 
 
 def _prepare_stats(group: _m5.stats.Group):
@@ -276,50 +390,129 @@ def _prepare_stats(group: _m5.stats.Group):
         _prepare_stats(child)
 
 
-def _process_simobject_object(simobject: SimObject) -> SimObjectGroup:
+class _SimObjectSkeleton:
     """
-    Processes the stats of a SimObject, and returns a dictionary of the stats
-    for the SimObject with PyStats objects when appropriate.
-
-    :param simobject: The SimObject to process the stats for.
-
-    :returns: A dictionary of the PyStats stats for the SimObject.
+    The structure of the stats of a SimObject: the statistics, children, and
+    stat groups of the SimObject, in the order they are added to its
+    SimObjectGroup. Finding the structure walks the SimObject, which is only
+    done once. Filling the skeleton only reads the values of the statistics.
     """
 
-    assert isinstance(
-        simobject, SimObject
-    ), "simobject param must be a SimObject."
+    def __init__(self, simobject: SimObject):
+        assert isinstance(
+            simobject, SimObject
+        ), "simobject param must be a SimObject."
 
-    stats = (
-        {
-            "name": simobject.get_name(),
-        }
-        if simobject.get_name()
-        else {}
-    )
+        self.name = simobject.get_name()
+        keys = ["name"] if self.name else []
 
-    for stat in simobject.getStats():
-        val = __get_statistic(stat)
-        if val:
-            stats[stat.name] = val
+        self.stats: List[Tuple[str, _m5.stats.Info, _StatReader]] = []
+        for stat in simobject.getStats():
+            reader = _get_reader(stat)
+            if reader:
+                self.stats.append((stat.name, stat, reader))
+                keys.append(stat.name)
 
-    for name, child in simobject._children.items():
-        to_add = _process_simobject_stats(child)
-        if to_add:
-            stats[name] = to_add
+        self.children: List[Tuple[str, _Skeleton]] = []
+        for name, child in simobject._children.items():
+            skeleton = _get_skeleton(child)
+            if skeleton:
+                self.children.append((name, skeleton))
+                keys.append(name)
 
-    for name, child in sorted(simobject.getStatGroups().items()):
         # Note: We are using the name of the group to determine if we have
         # already processed the group as a child simobject or a statistic.
         # This is to avoid SimObjectVector's being processed twice. It is far
         # from an ideal solution, but it works for now.
-        if not any(
-            re.compile(f"{to_match}" + r"\d*").search(name)
-            for to_match in stats.keys()
-        ):
-            stats[name] = Group(**_process_simobject_stats(child))
+        #
+        # Whether a statistic, or child, is included depends on its values
+        # (e.g., "nozero" scalars), so the keys which would exclude each group
+        # are found here, and checked against the included keys when filled.
+        patterns = {key: re.compile(f"{key}" + r"\d*") for key in keys}
+        self.groups: List[Tuple[str, _m5.stats.Group, List[str]]] = []
+        for name, child in sorted(simobject.getStatGroups().items()):
+            excluded_by = [
+                key
+                for key, pattern in patterns.items()
+                if pattern.search(name)
+            ]
+            self.groups.append((name, child, excluded_by))
+            patterns[name] = re.compile(f"{name}" + r"\d*")
+
+    def fill(self) -> SimObjectGroup:
+        stats = {"name": self.name} if self.name else {}
+
+        for name, stat, reader in self.stats:
+            stat.prepare()
+            val = reader.read(stat)
+            if val:
+                stats[name] = val
+
+        for name, skeleton in self.children:
+            to_add = skeleton.fill()
+            if to_add:
+                stats[name] = to_add
+
+        for name, child, excluded_by in self.groups:
+            if not any(key in stats for key in excluded_by):
+                stats[name] = Group(**_process_simobject_stats(child))
+
+        return SimObjectGroup(**stats)
+
+
+class _SimObjectVectorSkeleton:
+    """
+    The structure of the stats of a SimObjectVector, or a list of SimObjects.
+    """
+
+    def __init__(
+        self,
+        simobjects: Union[
+            SimObjectVector, List[Union[SimObject, SimObjectVector]]
+        ],
+    ):
+        self.elements = [_get_skeleton(obj) for obj in simobjects]
+
+    def fill(self) -> SimObjectVectorGroup:
+        return SimObjectVectorGroup(
+            value=[
+                element.fill() if element else {} for element in self.elements
+            ]
+        )
 
-    return SimObjectGroup(**stats)
+
+_Skeleton = Union[_SimObjectSkeleton, _SimObjectVectorSkeleton]
+
+
+def _get_skeleton(
+    simobject: Union[
+        SimObject, SimObjectVector, List[Union[SimObject, SimObjectVector]]
+    ]
+) -> Optional[_Skeleton]:
+    """
+    Finds the structure of the stats of a SimObject, SimObjectVector, or List
+    of either. Returns ``None`` if the object has no stats.
+    """
+    if isinstance(simobject, SimObject):
+        return _SimObjectSkeleton(simobject)
+
+    if isinstance(simobject, Union[List, SimObjectVector]):
+        return _SimObjectVectorSkeleton(simobject)
+
+    return None
+
+
+def _process_simobject_object(simobject: SimObject) -> SimObjectGroup:
+    """
+    Processes the stats of a SimObject, and returns a dictionary of the stats
+    for the SimObject with PyStats objects when appropriate.
+
+    :param simobject: The SimObject to process the stats for.
+
+    :returns: A dictionary of the PyStats stats for the SimObject.
+    """
+
+    return _SimObjectSkeleton(simobject).fill()
 
 
 def _process_simobject_stats(
@@ -336,16 +529,36 @@ def _process_simobject_stats(
     :returns: A dictionary of the stats for the SimObject.
     """
 
-    if isinstance(simobject, SimObject):
-        return _process_simobject_object(simobject)
+    skeleton = _get_skeleton(simobject)
+    return skeleton.fill() if skeleton else {}
 
-    if isinstance(simobject, Union[List, SimObjectVector]):
-        stats_list = []
-        for obj in simobject:
-            stats_list.append(_process_simobject_stats(obj))
-        return SimObjectVectorGroup(value=stats_list)
 
-    return {}
+# The skeletons of the roots passed to `get_simstat`, keyed by the `id` of
+# the root objects. The root objects are kept with their skeleton so their
+# `id`s are not reused while cached.
+_simstat_skeletons: Dict[Tuple[int, ...], Tuple[Tuple, _Skeleton]] = {}
+
+
+def _get_cached_skeleton(
+    root: Union[
+        SimObject, SimObjectVector, List[Union[SimObject, SimObjectVector]]
+    ]
+) -> Optional[_Skeleton]:
+    objs = tuple(root) if isinstance(root, list) else (root,)
+    key = tuple(id(obj) for obj in objs)
+    if key not in _simstat_skeletons:
+        _simstat_skeletons[key] = (objs, _get_skeleton(root))
+    return _simstat_skeletons[key][1]
+
+
+def clear_simstat_cache() -> None:
+    """
+    Clears the cached structure of the stats used by ``get_simstat``. The
+    structure of a simulation's stats does not change once it is
+    instantiated, so this is only needed if the SimObjects passed to
+    ``get_simstat`` are later changed.
+    """
+    _simstat_skeletons.clear()
 
 
 def get_simstat(
@@ -354,6 +567,7 @@ def get_simstat(
         List[Union[SimObject, SimObjectVector]],
     ],
     prepare_stats: bool = True,
+    cache: bool = True,
 ) -> SimStat:
     """
     This function will return the SimStat object for a simulation given a
@@ -370,6 +584,13 @@ def get_simstat(
                           to creating the SimStat object. By default this is
                           ``True``.
 
+    :param cache: Dictates whether the structure of the stats (the groups,
+                  and the names, descriptions, and layouts of the statistics)
+                  is cached, and reused by later calls for the same root. Only
+                  the values of the statistics are read on later calls. Each
+                  call returns new PyStats objects. By default this is
+                  ``True``.
+
     :Returns: The SimStat Object of the current simulation.
 
     """
@@ -386,7 +607,10 @@ def get_simstat(
             else:
                 _prepare_stats(r)
 
-        stats = _process_simobject_stats(r).__dict__
+        if cache:
+            stats = _get_cached_skeleton(r).fill().__dict__
+        else:
+            stats = _process_simobject_stats(r).__dict__
         stats["name"] = r.get_name() if r.get_name() else "root"
         stats_map[stats["name"]] = stats
 
@@ -0,0 +1,170 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Writers of the config.ini, config.json, and DOT outputs of the
+configuration.
+
+Each file is written in one walk of the SimObject hierarchy, with the paths
+of the SimObjects found once when the hierarchy is frozen, and through a
+large write buffer. The JSON is written as it is walked, rather than built
+as nested dictionaries first, and matches ``json.dump`` of
+``SimObject.get_config_as_dict`` with ``indent=4``.
+
+As the hierarchy doesn't change once it is frozen, the files can also be
+written by a ``ConfigWriter`` thread while the C++ objects are created.
+"""
+
+import json
+import os
+import threading
+
+from m5.params import SimObjectVector
+from m5.SimObject import SimObject
+from m5.util.dot_writer import do_dot
+from m5.util.dot_writer_ruby import do_ruby_dot
+
+_BUFFER_SIZE = 1 << 20
+_INDENT = "    "
+
+# Values which aren't lists or dictionaries are encoded the same with and
+# without indentation, and without it by the (faster) C encoder.
+_encode = json.JSONEncoder().encode
+_encode_indented = json.JSONEncoder(indent=4).encode
+_encode_key = json.encoder.encode_basestring_ascii
+
+
+def write_ini(root, path):
+    """
+    Writes the config.ini of a SimObject hierarchy, with the sections of the
+    SimObjects in order of their paths.
+
+    :param root: The SimObject at the top of the hierarchy.
+    :param path: The file to write.
+    """
+    objs = sorted(root.descendants(), key=lambda obj: obj.path())
+    with open(path, "w", buffering=_BUFFER_SIZE) as f:
+        f.writelines(obj.ini_section() for obj in objs)
+
+
+def _write_json_value(f, value, indent):
+    if isinstance(value, SimObject):
+        items = value.config_items().items()
+        opening, closing = "{", "}"
+    elif isinstance(value, SimObjectVector):
+        items = ((None, obj) for obj in value)
+        opening, closing = "[", "]"
+    else:
+        if isinstance(value, (dict, list, tuple)):
+            f.write(_encode_indented(value).replace("\n", "\n" + indent))
+        else:
+            f.write(_encode(value))
+        return
+
+    inner = indent + _INDENT
+    f.write(opening)
+    empty = True
+    for key, item in items:
+        f.write("\n" + inner if empty else ",\n" + inner)
+        if key is not None:
+            f.write(_encode_key(key) + ": ")
+        _write_json_value(f, item, inner)
+        empty = False
+    if not empty:
+        f.write("\n" + indent)
+    f.write(closing)
+
+
+def write_json(root, path):
+    """
+    Writes the config.json of a SimObject hierarchy.
+
+    :param root: The SimObject at the top of the hierarchy.
+    :param path: The file to write.
+    """
+    with open(path, "w", buffering=_BUFFER_SIZE) as f:
+        _write_json_value(f, root, "")
+
+
+def write_dot(root, outdir, dot_file):
+    """
+    Writes the DOT (and pdf and svg) outputs of the configuration, and of
+    the Ruby network if there is one.
+
+    :param root: The SimObject at the top of the hierarchy.
+    :param outdir: The output directory.
+    :param dot_file: The name of the DOT file.
+    """
+    do_dot(root, outdir, dot_file)
+    do_ruby_dot(root, outdir, dot_file)
+
+
+class ConfigWriter(threading.Thread):
+    """
+    Writes the outputs of the configuration in a background thread. The
+    SimObject hierarchy must be frozen (see
+    ``SimObject.freeze_descendants``) before the thread is started. Any
+    exception raised writing the outputs is raised by ``join``.
+    """
+
+    def __init__(
+        self, root, outdir, ini_file=None, json_file=None, dot_file=None
+    ):
+        """
+        :param root: The SimObject at the top of the hierarchy.
+        :param outdir: The output directory.
+        :param ini_file: The name of the config.ini to write, if any.
+        :param json_file: The name of the config.json to write, if any.
+        :param dot_file: The name of the DOT file to write, if any.
+        """
+        super().__init__(name="config writer", daemon=True)
+        self._root = root
+        self._outdir = outdir
+        self._ini_file = ini_file
+        self._json_file = json_file
+        self._dot_file = dot_file
+        self._error = None
+
+    def run(self):
+        try:
+            if self._ini_file:
+                write_ini(
+                    self._root, os.path.join(self._outdir, self._ini_file)
+                )
+            if self._json_file:
+                write_json(
+                    self._root, os.path.join(self._outdir, self._json_file)
+                )
+            if self._dot_file:
+                write_dot(self._root, self._outdir, self._dot_file)
+        except BaseException as e:
+            self._error = e
+
+    def join(self, timeout=None):
+        super().join(timeout)
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
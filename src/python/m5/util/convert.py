@@ -37,6 +37,8 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import functools
+
 # metric prefixes
 atto = 1.0e-18
 femto = 1.0e-15
@@ -97,11 +99,53 @@ binary_prefixes = {
 }
 
 
+# The number of distinct strings remembered by each converter. Configs
+# repeat a small number of values (e.g., "1ns" or "64KiB") many times.
+_PARSE_CACHE_SIZE = 1024
+
+_parse_caches = []
+
+
+def _parse_cache(func):
+    """Caches the results of a converter which is called with only a string.
+
+    Only successful conversions are cached, so a string which can't be
+    converted raises the same error every time. Calls with other arguments
+    (e.g., a unit) aren't cached.
+    """
+    cached = functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)(func)
+    _parse_caches.append(cached)
+
+    @functools.wraps(func)
+    def wrapper(value, *args, **kwargs):
+        if args or kwargs or type(value) is not str:
+            return func(value, *args, **kwargs)
+        return cached(value)
+
+    wrapper.cache_info = cached.cache_info
+    return wrapper
+
+
+def clear_parse_caches():
+    """Clears the cached results of all of the converters."""
+    for cached in _parse_caches:
+        cached.cache_clear()
+
+
 def assertStr(value):
     if not isinstance(value, str):
         raise TypeError(f"wrong type '{type(value)}' should be str")
 
 
+@functools.lru_cache(maxsize=None)
+def _suffix_matcher(suffixes):
+    """Returns the lengths of a tuple of suffixes, and a set of the suffixes,
+    so that a string's suffix can be looked up for each length instead of
+    testing every suffix.
+    """
+    return sorted({len(sfx) for sfx in suffixes}), frozenset(suffixes)
+
+
 def _split_suffix(value, suffixes):
     """Split a string based on a suffix from a list of suffixes.
 
@@ -112,7 +156,12 @@ def _split_suffix(value, suffixes):
               if there is no match.
 
     """
-    matches = [sfx for sfx in suffixes if value.endswith(sfx)]
+    lengths, suffix_set = _suffix_matcher(tuple(suffixes))
+    matches = [
+        value[-length:]
+        for length in lengths
+        if value[-length:] in suffix_set and len(value) >= length
+    ]
     assert len(matches) <= 1
 
     return (value[: -len(matches[0])], matches[0]) if matches else (value, "")
@@ -164,30 +213,37 @@ def toNum(value, target_type, units, prefixes, converter):
     return convert(magnitude) * scale, unit
 
 
+@_parse_cache
 def toFloat(value, target_type="float", units=None, prefixes=[]):
     return toNum(value, target_type, units, prefixes, float)[0]
 
 
+@_parse_cache
 def toMetricFloat(value, target_type="float", units=None):
     return toFloat(value, target_type, units, metric_prefixes)
 
 
+@_parse_cache
 def toBinaryFloat(value, target_type="float", units=None):
     return toFloat(value, target_type, units, binary_prefixes)
 
 
+@_parse_cache
 def toInteger(value, target_type="integer", units=None, prefixes=[]):
     return toNum(value, target_type, units, prefixes, lambda x: int(x, 0))[0]
 
 
+@_parse_cache
 def toMetricInteger(value, target_type="integer", units=None):
     return toInteger(value, target_type, units, metric_prefixes)
 
 
+@_parse_cache
 def toBinaryInteger(value, target_type="integer", units=None):
     return toInteger(value, target_type, units, binary_prefixes)
 
 
+@_parse_cache
 def toBool(value):
     assertStr(value)
 
@@ -199,14 +255,17 @@ def toBool(value):
     raise ValueError(f"cannot convert '{value}' to bool")
 
 
+@_parse_cache
 def toFrequency(value):
     return toMetricFloat(value, "frequency", "Hz")
 
 
+@_parse_cache
 def toLatency(value):
     return toMetricFloat(value, "latency", "s")
 
 
+@_parse_cache
 def anyToLatency(value):
     """Convert a magnitude and unit to a clock period."""
 
@@ -228,6 +287,7 @@ def anyToLatency(value):
         raise ValueError(f"'{value}' needs a valid unit to be unambiguous.")
 
 
+@_parse_cache
 def anyToFrequency(value):
     """Convert a magnitude and unit to a clock frequency."""
 
@@ -249,18 +309,22 @@ def anyToFrequency(value):
         raise ValueError(f"'{value}' needs a valid unit to be unambiguous.")
 
 
+@_parse_cache
 def toNetworkBandwidth(value):
     return toMetricFloat(value, "network bandwidth", "bps")
 
 
+@_parse_cache
 def toMemoryBandwidth(value):
     return toBinaryFloat(value, "memory bandwidth", "B/s")
 
 
+@_parse_cache
 def toMemorySize(value):
     return toBinaryInteger(value, "memory size", "B")
 
 
+@_parse_cache
 def toIpAddress(value):
     if not isinstance(value, str):
         raise TypeError(f"wrong type '{type(value)}' should be str")
@@ -281,6 +345,7 @@ def toIpAddress(value):
     )
 
 
+@_parse_cache
 def toIpNetmask(value):
     if not isinstance(value, str):
         raise TypeError(f"wrong type '{type(value)}' should be str")
@@ -306,6 +371,7 @@ def toIpNetmask(value):
         raise ValueError(f"invalid netmask {netmask}")
 
 
+@_parse_cache
 def toIpWithPort(value):
     if not isinstance(value, str):
         raise TypeError(f"wrong type '{type(value)}' should be str")
@@ -317,18 +383,22 @@ def toIpWithPort(value):
     return (ip, int(port))
 
 
+@_parse_cache
 def toVoltage(value):
     return toMetricFloat(value, "voltage", "V")
 
 
+@_parse_cache
 def toCurrent(value):
     return toMetricFloat(value, "current", "A")
 
 
+@_parse_cache
 def toEnergy(value):
     return toMetricFloat(value, "energy", "J")
 
 
+@_parse_cache
 def toTemperature(value):
     """Convert a string value specified to a temperature in Kelvin"""
 
@@ -0,0 +1,213 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import tempfile
+import unittest
+from typing import List
+
+from m5.ext.pystats import (
+    Distribution,
+    Scalar,
+    SimObjectGroup,
+    SimObjectVectorGroup,
+    SimStat,
+    Vector,
+)
+from m5.ext.pystats.deltastream import (
+    DeltaStreamReader,
+    DeltaStreamWriter,
+)
+
+
+def _get_mock_simstat(tick: int, cpus: int = 2) -> SimStat:
+    """Creates the SimStat of a dump at ``tick``. Only the ``numCycles`` of
+    the first CPU, and the simulated end time, change between dumps.
+    """
+    return SimStat(
+        simulated_begin_time=0,
+        simulated_end_time=tick,
+        system=SimObjectGroup(
+            cpu=SimObjectVectorGroup(
+                value=[
+                    SimObjectGroup(
+                        name=f"cpu{index}",
+                        numCycles=Scalar(value=tick if index == 0 else 7),
+                        committed=Vector(
+                            value={"int": Scalar(1), "float": Scalar(2)},
+                            type="Vector",
+                        ),
+                        latency=Distribution(
+                            value={0: Scalar(3), 1: Scalar(4)},
+                            min=0,
+                            max=1,
+                            num_bins=2,
+                            bin_size=1,
+                        ),
+                    )
+                    for index in range(cpus)
+                ]
+            )
+        ),
+    )
+
+
+class DeltaStreamTestSuite(unittest.TestCase):
+    """Tests writing, and reading, delta streams of SimStat dumps."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "stats.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _write(
+        self, simstats: List[SimStat], keyframe_interval: int = 0
+    ) -> None:
+        writer = DeltaStreamWriter(
+            self.path, keyframe_interval=keyframe_interval
+        )
+        for simstat in simstats:
+            writer.write(simstat)
+
+    def _records(self) -> List[dict]:
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_reconstruct_each_dump(self) -> None:
+        simstats = [_get_mock_simstat(tick) for tick in (100, 200, 300)]
+        self._write(simstats)
+        with DeltaStreamReader(self.path) as stream:
+            self.assertEqual(3, len(stream))
+            for index, simstat in enumerate(simstats):
+                self.assertEqual(simstat.to_json(), stream[index].to_json())
+            self.assertEqual(simstats[-1].to_json(), stream.get(-1).to_json())
+            self.assertEqual(
+                [simstat.to_json() for simstat in simstats],
+                [simstat.to_json() for simstat in stream],
+            )
+
+    def test_only_changes_are_written(self) -> None:
+        self._write([_get_mock_simstat(tick) for tick in (100, 200)])
+        full, delta = self._records()
+        self.assertTrue(full["full"])
+        self.assertFalse(delta["full"])
+        self.assertEqual(
+            [
+                ["simulated_end_time"],
+                ["system", "cpu", "value", 0, "numCycles"],
+            ],
+            [path for path, _ in delta["changed"]],
+        )
+        self.assertEqual([], delta["removed"])
+
+    def test_removed_stats(self) -> None:
+        simstats = [
+            _get_mock_simstat(100, cpus=3),
+            _get_mock_simstat(200, cpus=1),
+            _get_mock_simstat(300, cpus=2),
+        ]
+        self._write(simstats)
+        self.assertNotEqual([], self._records()[1]["removed"])
+        with DeltaStreamReader(self.path) as stream:
+            for index, simstat in enumerate(simstats):
+                self.assertEqual(simstat.to_json(), stream[index].to_json())
+
+    def test_emptied_list_element(self) -> None:
+        # The statistics of an element of a list are all removed, but the
+        # (now empty) element, and those after it, are still in the dump.
+        def tree(first, meta):
+            return {
+                "simulated_end_time": 100,
+                "system": {
+                    "type": "SimObject",
+                    "cpu": {
+                        "type": "SimObjectVector",
+                        "value": [
+                            first,
+                            {"numCycles": Scalar(value=7).to_json()},
+                        ],
+                    },
+                    "meta": meta,
+                },
+            }
+
+        trees = [
+            tree({"numCycles": Scalar(value=1).to_json()}, {"a": 1}),
+            tree({}, {}),
+            tree({"numCycles": Scalar(value=2).to_json()}, {"a": 1}),
+            tree({}, {}),
+        ]
+        self._write(trees)
+        self.assertEqual(
+            [
+                ["system", "cpu", "value", 0, "numCycles"],
+                ["system", "meta", "a"],
+            ],
+            self._records()[1]["removed"],
+        )
+        with DeltaStreamReader(self.path) as stream:
+            self.assertEqual(trees, [stream.get_json(i) for i in range(4)])
+
+    def test_removed_group(self) -> None:
+        # Only the path of a removed group is recorded, not those of all of
+        # its statistics.
+        self._write(
+            [_get_mock_simstat(100, cpus=2), _get_mock_simstat(100, 1)]
+        )
+        self.assertEqual(
+            [["system", "cpu", "value", 1]], self._records()[1]["removed"]
+        )
+
+    def test_keyframe_interval(self) -> None:
+        simstats = [_get_mock_simstat(tick) for tick in range(5)]
+        self._write(simstats, keyframe_interval=2)
+        self.assertEqual(
+            [True, False, True, False, True],
+            [record["full"] for record in self._records()],
+        )
+        with DeltaStreamReader(self.path) as stream:
+            self.assertEqual(simstats[3].to_json(), stream[3].to_json())
+
+    def test_refresh_ignores_partial_record(self) -> None:
+        self._write([_get_mock_simstat(100)])
+        with DeltaStreamReader(self.path) as stream:
+            self.assertEqual(1, len(stream))
+            with open(self.path, "a") as f:
+                f.write('{"full":false,"index":1,"chan')
+            self.assertEqual(1, stream.refresh())
+            with open(self.path, "a") as f:
+                f.write('ged":[],"removed":[]}\n')
+            self.assertEqual(2, stream.refresh())
+            self.assertEqual(stream[0].to_json(), stream[1].to_json())
+
+    def test_index_out_of_range(self) -> None:
+        self._write([_get_mock_simstat(100)])
+        with DeltaStreamReader(self.path) as stream:
+            with self.assertRaises(IndexError):
+                stream.get(1)
@@ -0,0 +1,256 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Tests for m5.stats.gem5stats, with the `_m5.stats` Info objects mocked."""
+
+import unittest
+from types import SimpleNamespace
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+from unittest.mock import patch
+
+from m5.stats import gem5stats
+
+
+class _Info:
+    def __init__(self, name: str, **kwargs):
+        self.name = name
+        self.unit = "Count"
+        self.desc = f"The {name}"
+        self.__dict__.update(kwargs)
+
+    def prepare(self) -> None:
+        pass
+
+
+class _ScalarInfo(_Info):
+    pass
+
+
+class _VectorInfo(_Info):
+    pass
+
+
+class _Vector2dInfo(_Info):
+    pass
+
+
+class _DistInfo(_Info):
+    pass
+
+
+class _SparseHistInfo(_Info):
+    pass
+
+
+class _FormulaInfo(_Info):
+    pass
+
+
+_mock_stats = SimpleNamespace(
+    Info=_Info,
+    ScalarInfo=_ScalarInfo,
+    VectorInfo=_VectorInfo,
+    Vector2dInfo=_Vector2dInfo,
+    DistInfo=_DistInfo,
+    SparseHistInfo=_SparseHistInfo,
+    FormulaInfo=_FormulaInfo,
+    processDumpQueue=lambda: None,
+)
+
+
+class _StatGroup:
+    """Stands in for a stat group of a SimObject. These are not SimObjects,
+    so are included as empty Groups."""
+
+    def preDumpStats(self) -> None:
+        pass
+
+    def getStats(self) -> List[_Info]:
+        return []
+
+    def getStatGroups(self) -> Dict[str, "_StatGroup"]:
+        return {}
+
+
+class _SimObject:
+    """Stands in for a SimObject."""
+
+    def __init__(
+        self,
+        name: str,
+        stats: List[_Info] = (),
+        children: Dict[str, Any] = {},
+        groups: Dict[str, _StatGroup] = {},
+    ):
+        self._name = name
+        self.stats = list(stats)
+        self._children = dict(children)
+        self.groups = dict(groups)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def getStats(self) -> List[_Info]:
+        return self.stats
+
+    def getStatGroups(self) -> Dict[str, _StatGroup]:
+        return self.groups
+
+    def preDumpStats(self) -> None:
+        pass
+
+
+class _SimObjectVector(list):
+    pass
+
+
+class _Root:
+    tick = 0
+
+    @classmethod
+    def getInstance(cls) -> "_Root":
+        return cls()
+
+    def resolveStat(self, name: str) -> SimpleNamespace:
+        return SimpleNamespace(value=_Root.tick)
+
+
+class GetSimStatTestSuite(unittest.TestCase):
+    """Tests that the cached structure of the stats gives the same SimStats
+    as walking the SimObjects on every call."""
+
+    def setUp(self) -> None:
+        for patcher in (
+            patch.object(gem5stats, "_m5", SimpleNamespace(stats=_mock_stats)),
+            patch.object(gem5stats, "SimObject", _SimObject),
+            patch.object(gem5stats, "SimObjectVector", _SimObjectVector),
+            patch.object(gem5stats, "Root", _Root),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        gem5stats.clear_simstat_cache()
+        self.addCleanup(gem5stats.clear_simstat_cache)
+
+        self.cycles = _ScalarInfo("numCycles", value=0.0, is_nozero=False)
+        self.insts = _ScalarInfo("numInsts", value=0.0, is_nozero=True)
+        self.committed = _VectorInfo(
+            "committed",
+            size=2,
+            subnames=["int", "float"],
+            subdescs=[],
+            value=[0.0, 0.0],
+        )
+        self.hist = _SparseHistInfo("hist", values={})
+        self.cpus = _SimObjectVector(
+            [
+                _SimObject(
+                    f"cpu{index}",
+                    stats=[
+                        self.cycles if index == 0 else self.insts,
+                        self.committed,
+                        self.hist,
+                    ],
+                    # The "numInsts" group has the name of a nozero
+                    # statistic, so is only included when the statistic is
+                    # not. "numInsts1" matches either of them.
+                    groups={
+                        "numInsts": _StatGroup(),
+                        "numInsts1": _StatGroup(),
+                        "rob": _StatGroup(),
+                    },
+                )
+                for index in range(2)
+            ]
+        )
+        self.root = _SimObject(
+            "",
+            children={"cpu": self.cpus},
+            groups={"cpu": _StatGroup()},
+        )
+
+    def _simstat(self, cache: bool) -> Dict[str, Any]:
+        simstat = gem5stats.get_simstat([self.root], cache=cache).to_json()
+        del simstat["creation_time"]
+        return simstat
+
+    def _cpu(self, simstat: Dict[str, Any], index: int) -> Dict[str, Any]:
+        return simstat["cpu"]["value"][index]
+
+    def _dump(self, tick: int) -> Dict[str, Any]:
+        _Root.tick = tick
+        cached = self._simstat(cache=True)
+        self.assertEqual(self._simstat(cache=False), cached)
+        return cached
+
+    def test_cached_equals_uncached(self) -> None:
+        first = self._dump(100)
+        self.cycles.value = 50.0
+        self.committed.value = [3.0, 4.0]
+        self.hist.values = {-1: 2.0, 5: 1.0}
+        second = self._dump(200)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(200, second["simulated_end_time"])
+        self.assertEqual(50.0, self._cpu(second, 0)["numCycles"]["value"])
+        self.assertEqual(
+            4.0, self._cpu(second, 1)["committed"]["value"]["float"]["value"]
+        )
+        # The "cpu" stat group is the "cpu" SimObjectVector, so only the
+        # latter is included.
+        self.assertEqual("SimObjectVector", second["cpu"]["type"])
+
+    def test_value_dependent_stats(self) -> None:
+        # Zero nozero scalars and empty sparse histograms are dropped, and a
+        # stat group is included in place of a dropped statistic of the same
+        # name, on each call.
+        for insts, hist in ((0.0, {}), (5.0, {1: 1.0}), (0.0, {})):
+            self.insts.value = insts
+            self.hist.values = hist
+            cpu = self._cpu(self._dump(100), 1)
+            self.assertEqual(bool(hist), "hist" in cpu)
+            # Groups, unlike statistics, have no type.
+            self.assertEqual(
+                "Scalar" if insts else None, cpu["numInsts"].get("type")
+            )
+            self.assertNotIn("numInsts1", cpu)
+            self.assertIn("rob", cpu)
+
+    def test_clear_simstat_cache(self) -> None:
+        self._dump(100)
+        self.cpus[0].stats.append(
+            _ScalarInfo("numBranches", value=2.0, is_nozero=False)
+        )
+        self.assertNotIn(
+            "numBranches", self._cpu(self._simstat(cache=True), 0)
+        )
+        gem5stats.clear_simstat_cache()
+        self.assertEqual(
+            2.0, self._cpu(self._dump(100), 0)["numBranches"]["value"]
+        )
@@ -0,0 +1,228 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from m5.ext.pystats import (
+    Distribution,
+    Scalar,
+    SimObjectGroup,
+    SimObjectVectorGroup,
+    SimStat,
+    SparseHist,
+    StorageType,
+    Vector,
+    Vector2d,
+)
+from m5.ext.pystats.jsonloader import load
+from m5.ext.pystats.lazyloader import (
+    INDEX_SUFFIX,
+    LazySimStat,
+    stack_columns,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _get_mock_simstat(scale: int = 1) -> SimStat:
+    """Creates a SimStat with a SimObject vector of two CPUs. The values of
+    the statistics are multiplied by ``scale``.
+    """
+    cpus = []
+    for index in range(2):
+        cpus.append(
+            SimObjectGroup(
+                name=f"cpu{index}",
+                numCycles=Scalar(
+                    value=(100 + index) * scale,
+                    unit="Cycle",
+                    description='Number of {cpu} "cycles"',
+                    datatype=StorageType["f64"],
+                ),
+                committed=Vector(
+                    value={
+                        "int": Scalar(value=1 * scale),
+                        "float": Scalar(value=2 * scale),
+                    },
+                    type="Vector",
+                    description="Committed [by type]",
+                ),
+                latency=Distribution(
+                    value={i: Scalar(value=i * scale) for i in range(4)},
+                    min=0,
+                    max=3,
+                    num_bins=4,
+                    bin_size=1,
+                ),
+                occupancy=Vector2d(
+                    value={
+                        0: Vector(value={0: Scalar(1), 1: Scalar(2)}),
+                        1: Vector(value={0: Scalar(3), 1: Scalar(4)}),
+                    },
+                    type="Vector2d",
+                ),
+            )
+        )
+
+    return SimStat(
+        creation_time=datetime.fromisoformat("2021-01-01T00:00:00"),
+        simulated_begin_time=0,
+        simulated_end_time=1000,
+        system=SimObjectGroup(cpu=SimObjectVectorGroup(value=cpus)),
+    )
+
+
+class LazySimStatTestSuite(unittest.TestCase):
+    """Tests the lazy loading of SimStat JSON dumps."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.simstat = _get_mock_simstat()
+        self.path = self._dump(self.simstat, "stats.json")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _dump(self, simstat: SimStat, name: str) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            simstat.dump(fp=f)
+        return path
+
+    def test_get_statistic(self) -> None:
+        with LazySimStat(self.path) as stats:
+            scalar = stats.get("system.cpu.1.numCycles")
+            self.assertIsInstance(scalar, Scalar)
+            self.assertEqual(101, scalar.value)
+            self.assertEqual(StorageType["f64"], scalar.datatype)
+            self.assertEqual('Number of {cpu} "cycles"', scalar.description)
+
+    def test_get_simobject_vector_element_by_name(self) -> None:
+        with LazySimStat(self.path) as stats:
+            cpu = stats["system.cpu0"]
+            self.assertIsInstance(cpu, SimObjectGroup)
+            self.assertEqual(
+                self.simstat.system.cpu[0].to_json(), cpu.to_json()
+            )
+
+    def test_get_vector_element(self) -> None:
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(2, stats.get("system.cpu0.committed.float").value)
+            self.assertEqual(3, stats.get("system.cpu0.latency.3").value)
+            self.assertIsInstance(stats.get("system.cpu0.occupancy"), Vector2d)
+
+    def test_get_non_object_value(self) -> None:
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(1000, stats.get("simulated_end_time"))
+            self.assertEqual("cpu1", stats.get(["system", "cpu", 1, "name"]))
+
+    def test_get_root_matches_full_load(self) -> None:
+        with open(self.path) as f:
+            full = load(f)
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(self.simstat.to_json(), full.to_json())
+            self.assertEqual(full.to_json(), stats.get("").to_json())
+
+    def test_load_negative_keys(self) -> None:
+        self.simstat.system.delta = SparseHist(
+            value={-2: Scalar(1), -0.5: Scalar(2), 3: Scalar(3)}
+        )
+        path = self._dump(self.simstat, "negative.json")
+        with open(path) as f:
+            delta = load(f).system.delta
+        self.assertEqual({-2, -0.5, 3}, set(delta.value))
+        self.assertIsInstance(next(iter(delta.value)), int)
+
+    def test_missing_statistic(self) -> None:
+        with LazySimStat(self.path) as stats:
+            self.assertNotIn("system.cpu2", stats)
+            self.assertNotIn("system.cpu0.numInsts", stats)
+            self.assertIn("system.cpu0.numCycles", stats)
+            with self.assertRaises(KeyError):
+                stats.get("system.l2cache")
+
+    def test_keys(self) -> None:
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(["system"], stats.keys())
+            self.assertEqual(
+                ["numCycles", "committed", "latency", "occupancy"],
+                stats.keys("system.cpu1"),
+            )
+
+    def test_index_is_cached(self) -> None:
+        with LazySimStat(self.path) as stats:
+            stats.keys()
+        self.assertTrue(os.path.exists(f"{self.path}{INDEX_SUFFIX}"))
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(101, stats.get("system.cpu1.numCycles").value)
+
+    def test_index_is_rebuilt_when_dump_changes(self) -> None:
+        with LazySimStat(self.path) as stats:
+            stats.keys()
+        self._dump(_get_mock_simstat(scale=10), "stats.json")
+        with LazySimStat(self.path) as stats:
+            self.assertEqual(1010, stats.get("system.cpu1.numCycles").value)
+
+    def test_no_index_cache(self) -> None:
+        with LazySimStat(self.path, cache_index=False) as stats:
+            stats.keys()
+        self.assertFalse(os.path.exists(f"{self.path}{INDEX_SUFFIX}"))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_columns(self) -> None:
+        with LazySimStat(self.path) as stats:
+            columns = stats.columns()
+        self.assertEqual(
+            [
+                f"system.cpu.{index}.{name}"
+                for index in range(2)
+                for name in ("committed", "latency", "occupancy")
+            ],
+            list(columns),
+        )
+        np.testing.assert_array_equal(
+            [1, 2], columns["system.cpu.0.committed"]
+        )
+        np.testing.assert_array_equal(
+            [[1, 2], [3, 4]], columns["system.cpu.1.occupancy"]
+        )
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_stack_columns(self) -> None:
+        other = self._dump(_get_mock_simstat(scale=2), "other.json")
+        columns = stack_columns([self.path, other], regex="latency")
+        self.assertEqual(
+            ["system.cpu.0.latency", "system.cpu.1.latency"], list(columns)
+        )
+        np.testing.assert_array_equal(
+            [[0, 1, 2, 3], [0, 2, 4, 6]], columns["system.cpu.0.latency"]
+        )
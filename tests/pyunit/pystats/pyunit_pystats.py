@@ -24,6 +24,7 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import re
 import unittest
 from datetime import datetime
 
@@ -206,3 +207,48 @@ class NavigatingPyStatsTestCase(unittest.TestCase):
             self.simstat.find("sparse_hist"),
             [self.simstat.simobject_vector[1]["sparse_hist"]],
         )
+
+    def test_pystat_find_matches_children(self):
+        # `find` searches an index of the stats, which must give the same
+        # results, in the same order, as searching `children`.
+        for regex in ("vector", "[a-c]", "sparse_hist|distribution", "x"):
+            self.assertEqual(
+                self.simstat.children(
+                    lambda _name: re.match(regex, _name), recursive=True
+                ),
+                self.simstat.find(regex),
+            )
+
+    def test_pystat_find_after_change(self):
+        self.assertEqual([], self.simstat.find("new_stat"))
+        new_stat = Scalar(value=1)
+        self.simstat.simobject_vector[1].new_stat = new_stat
+        self.assertEqual([new_stat], self.simstat.find("new_stat"))
+        del self.simstat.simobject_vector[1].new_stat
+        self.assertEqual([], self.simstat.find("new_stat"))
+
+    def test_pystat_find_paths_regex(self):
+        self.assertEqual(
+            {
+                "simobject_vector.0.vector2d": self.simstat.simobject_vector[
+                    0
+                ].vector2d
+            },
+            self.simstat.find_paths(r"simobject_vector\.[0-9]\.vector2d$"),
+        )
+
+    def test_pystat_find_paths_glob(self):
+        sparse_hist = self.simstat.simobject_vector[1].sparse_hist
+        self.assertEqual(
+            [
+                "simobject_vector.1.sparse_hist.0.5",
+                "simobject_vector.1.sparse_hist.5",
+            ],
+            list(self.simstat.find_paths("*.sparse_hist.*5", glob=True)),
+        )
+        self.assertEqual(
+            {"simobject_vector.1.sparse_hist": sparse_hist},
+            self.simstat.find_paths(
+                "simobject_vector.?.sparse_hist", glob=True
+            ),
+        )
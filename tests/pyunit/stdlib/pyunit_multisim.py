@@ -0,0 +1,132 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gem5.utils.multisim import multisim
+from gem5.utils.multisim.multisim import schedule
+
+
+class MultiSimScheduleTestSuite(unittest.TestCase):
+    """Tests the ordering of the simulators run by MultiSim."""
+
+    def test_longest_first(self) -> None:
+        self.assertEqual(
+            ["b", "c", "a"],
+            schedule(["a", "b", "c"], {"a": 1, "b": 10, "c": 5}, {}),
+        )
+
+    def test_cost_hint_before_wallclock(self) -> None:
+        self.assertEqual(
+            ["a", "b"],
+            schedule(["a", "b"], {"a": 100}, {"a": 1, "b": 50}),
+        )
+
+    def test_unknown_cost_first(self) -> None:
+        self.assertEqual(
+            ["b", "d", "c", "a"],
+            schedule(["a", "b", "c", "d"], {"a": 1}, {"c": 2}),
+        )
+
+
+class _MockSimulator:
+    def __init__(self, id=None):
+        self._id = id
+
+    def get_id(self):
+        return self._id
+
+    def set_id(self, id):
+        self._id = id
+
+
+class MultiSimAddSimulatorTestSuite(unittest.TestCase):
+    """Tests adding simulators to MultiSim."""
+
+    def setUp(self) -> None:
+        for patcher in (
+            patch.object(multisim, "_multi_sim", {}),
+            patch.object(multisim, "_costs", {}),
+            patch.object(multisim, "module_run", True),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_insertion_order(self) -> None:
+        ids = ["z", "a", "m", "sim_3", "b"]
+        for id in ids:
+            multisim.add_simulator(
+                _MockSimulator(None if id == "sim_3" else id)
+            )
+        self.assertEqual(ids, list(multisim._multi_sim))
+
+    def test_duplicate_id(self) -> None:
+        simulator = _MockSimulator("a")
+        multisim.add_simulator(simulator)
+        multisim.add_simulator(simulator)
+        self.assertEqual(1, multisim.num_simulators())
+        with self.assertRaises(ValueError):
+            multisim.add_simulator(_MockSimulator("a"))
+
+
+class MultiSimCompletionRecordTestSuite(unittest.TestCase):
+    """Tests reading the records of completed MultiSim simulations."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.object(
+            multisim,
+            "_get_outdir",
+            lambda id: Path(self.tmpdir.name) / id,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_not_completed(self) -> None:
+        os.mkdir(os.path.join(self.tmpdir.name, "sim_0"))
+        self.assertIsNone(multisim._read_completion_record("sim_0"))
+        self.assertIsNone(multisim._read_completion_record("sim_1"))
+
+    def test_completed(self) -> None:
+        os.mkdir(os.path.join(self.tmpdir.name, "sim_0"))
+        with open(
+            os.path.join(
+                self.tmpdir.name, "sim_0", multisim._completion_record_file
+            ),
+            "w",
+        ) as f:
+            json.dump({"id": "sim_0", "wallclock": 12.5}, f)
+        self.assertEqual(
+            12.5, multisim._read_completion_record("sim_0")["wallclock"]
+        )
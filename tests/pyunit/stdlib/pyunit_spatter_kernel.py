@@ -0,0 +1,98 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from gem5.components.processors.spatter_gen.spatter_kernel import (
+    partition_trace,
+    prepare_kernels,
+    unroll_trace,
+)
+
+
+class SpatterKernelTestSuite(unittest.TestCase):
+    """Tests the preparation of spatter traces."""
+
+    def test_unroll_trace(self) -> None:
+        trace = [0, 1, 2]
+        count, unrolled = unroll_trace(trace, 10, 4, 7)
+        self.assertEqual(2, count)
+        self.assertEqual([0, 1, 2, 10, 11, 12, 20, 21, 22], list(unrolled))
+        # The trace passed in is not changed.
+        self.assertEqual([0, 1, 2], trace)
+
+    def test_unroll_trace_fill(self) -> None:
+        count, unrolled = unroll_trace([0, 1], 10, 2, 6, fill_pattern=True)
+        self.assertEqual(1, count)
+        self.assertEqual([0, 1, 10, 11, 20, 21], list(unrolled))
+
+        count, unrolled = unroll_trace([0, 1], 10, 2, 6, fill_zero=True)
+        self.assertEqual(1, count)
+        self.assertEqual([0, 1, 10, 11, 0, 0], list(unrolled))
+
+        with self.assertRaises(ValueError):
+            unroll_trace([0, 1], 10, 2, 6)
+
+    def test_partition_trace(self) -> None:
+        partitions = partition_trace(list(range(11)), 2, 2)
+        self.assertEqual(
+            [[0, 1, 4, 5, 8, 9], [2, 3, 6, 7, 10]],
+            [list(partition) for partition in partitions],
+        )
+        with self.assertRaises(ValueError):
+            partition_trace(list(range(3)), 2, 2)
+
+    def test_prepare_kernels(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trace_path = Path(tmpdir) / "trace.json"
+            with open(trace_path, "w") as f:
+                json.dump(
+                    [{"kernel": "Gather", "delta": 4, "pattern": [0, 1, 2]}],
+                    f,
+                )
+            with mock.patch.dict(
+                os.environ,
+                {"GEM5_SPATTER_CACHE_DIR": os.path.join(tmpdir, "cache")},
+            ):
+                prepared = [
+                    prepare_kernels(trace_path, 2, 2, 0, 0x1000)
+                    for _ in range(2)
+                ]
+
+        for kernels in prepared:
+            self.assertEqual(1, len(kernels))
+            self.assertEqual(
+                [[0, 1, 5, 6], [2, 4]],
+                [kernel.cxx_call_args()[-1] for kernel in kernels[0]],
+            )
+            self.assertEqual(
+                [0, 2], [kernel.cxx_call_args()[4] for kernel in kernels[0]]
+            )
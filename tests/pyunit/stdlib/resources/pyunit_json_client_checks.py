@@ -28,9 +28,13 @@ import json
 import os
 import tempfile
 import unittest
+from pathlib import Path
 from typing import Dict
+from unittest.mock import patch
 
+from gem5.resources.client_api.client_query import ClientQuery
 from gem5.resources.client_api.jsonclient import JSONClient
+from gem5.resources.client_api.resource_catalogue import ResourceCatalogue
 
 
 class JSONClientTestSuite(unittest.TestCase):
@@ -179,3 +183,78 @@ class JSONClientTestSuite(unittest.TestCase):
             f"Resources location '{path}' is not a valid path or URL."
             in str(context.exception)
         )
+
+    def test_get_resources_latest_compatible(self) -> None:
+        # Tests JSONClient.get_resources() returns the latest version of each
+        # resource which matches the queries.
+
+        client = JSONClient(path=self.file_path)
+        resources = client.get_resources(
+            [
+                ClientQuery("this-is-a-test-resource", gem5_version="23.0"),
+                ClientQuery("test-version", gem5_version="DEVELOP"),
+                ClientQuery("not-a-resource", gem5_version="DEVELOP"),
+            ]
+        )
+        self.assertEqual(
+            {"this-is-a-test-resource", "test-version"}, set(resources)
+        )
+        self.assertEqual(
+            "1.0.0", resources["this-is-a-test-resource"]["resource_version"]
+        )
+        self.assertEqual(
+            "1.0.0", resources["test-version"]["resource_version"]
+        )
+
+        resources = client.get_resources(
+            [ClientQuery("test-version", "0.2.0", gem5_version="23.0")]
+        )
+        self.assertEqual("file", resources["test-version"]["category"])
+
+    def test_catalogue_cache_reused(self) -> None:
+        # Tests that a second JSONClient for an unchanged file loads the
+        # cached catalogue rather than parsing the JSON again.
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch.dict(
+            os.environ, {"GEM5_RESOURCE_CATALOGUE_DIR": cache_dir}
+        ):
+            JSONClient(path=self.file_path)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            with patch(
+                "gem5.resources.client_api.jsonclient.json.load"
+            ) as mock_load:
+                client = JSONClient(path=self.file_path)
+                mock_load.assert_not_called()
+            self.verify_json(json=client.get_resources_json())
+
+    def test_catalogue_cache_invalidated(self) -> None:
+        # Tests that the cached catalogue is rebuilt if the file changes.
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch.dict(
+            os.environ, {"GEM5_RESOURCE_CATALOGUE_DIR": cache_dir}
+        ):
+            path = Path(cache_dir) / "resources.json"
+            path.write_text(json.dumps([]))
+            self.assertEqual([], JSONClient(path=str(path)).resources)
+
+            with open(self.file_path) as f:
+                path.write_text(f.read())
+            os.utime(path, ns=(0, 0))
+            client = JSONClient(path=str(path))
+            self.verify_json(json=client.get_resources_json())
+
+    def test_get_resources_by_id_cached(self) -> None:
+        # Tests that repeating a query does not search the client's
+        # resources again.
+
+        client = JSONClient(path=self.file_path)
+        query = [ClientQuery("test-version", gem5_version="23.0")]
+        resources = client.get_resources_by_id(query)
+        with patch.object(
+            JSONClient, "get_resources", side_effect=AssertionError
+        ):
+            self.assertEqual(resources, client.get_resources_by_id(query))
+        self.assertEqual(
+            "1.0.0", resources["test-version"]["resource_version"]
+        )
@@ -24,13 +24,16 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import hashlib
 import os
 import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from gem5.resources.md5_utils import (
+    md5_cached,
     md5_dir,
     md5_file,
 )
@@ -116,3 +119,53 @@ class MD5DirTestSuite(unittest.TestCase):
         shutil.rmtree(dir2)
 
         self.assertEqual(first_md5, second_md5)
+
+    def test_manyFilesMatchSequentialMd5(self) -> None:
+        # This test ensures that reading files ahead in parallel does not
+        # change the order in which the directory is hashed.
+
+        def sequential_md5(directory: Path, hash) -> None:
+            for path in sorted(
+                directory.iterdir(), key=lambda p: str(p).lower()
+            ):
+                hash.update(path.name.encode())
+                if path.is_file():
+                    hash.update(path.read_bytes())
+                elif path.is_dir():
+                    sequential_md5(path, hash)
+
+        dir = Path(tempfile.mkdtemp())
+        for i in range(50):
+            sub = dir / f"Dir{i % 7}"
+            sub.mkdir(exist_ok=True)
+            (sub / f"file{i}").write_bytes(os.urandom(i * 100))
+        (dir / "empty").touch()
+
+        expected = hashlib.md5()
+        sequential_md5(dir, expected)
+        md5 = md5_dir(dir)
+        shutil.rmtree(dir)
+
+        self.assertEqual(expected.hexdigest(), md5)
+
+
+class MD5CachedTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.md5_utils.md5_cached()"""
+
+    def test_cachedMd5ReusedUntilChanged(self) -> None:
+        dir = Path(tempfile.mkdtemp())
+        file = dir / "file"
+        file.write_text("This is a test string, to be put in a temp file")
+
+        self.assertEqual("b113b29fce251f2023066c3fda2ec9dd", md5_cached(file))
+        self.assertTrue((dir / "file.md5cache").exists())
+
+        with patch("gem5.resources.md5_utils.md5") as mock_md5:
+            self.assertEqual(
+                "b113b29fce251f2023066c3fda2ec9dd", md5_cached(file)
+            )
+            mock_md5.assert_not_called()
+
+        file.write_text("This is a different string")
+        self.assertEqual(md5_file(file), md5_cached(file))
+        shutil.rmtree(dir)
@@ -0,0 +1,155 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gem5.resources import prefetch
+from gem5.resources.client import _create_clients
+from gem5.resources.client_api.jsonclient import JSONClient
+
+
+def _binary(id: str, path: Path) -> dict:
+    return {
+        "category": "binary",
+        "id": id,
+        "description": "A test binary",
+        "architecture": "X86",
+        "is_zipped": False,
+        "md5sum": hashlib.md5(path.read_bytes()).hexdigest(),
+        "url": f"file://{path}",
+        "source": "src/test",
+        "resource_version": "1.0.0",
+        "gem5_versions": ["develop"],
+    }
+
+
+def _workload(id: str, resources: dict) -> dict:
+    return {
+        "category": "workload",
+        "id": id,
+        "description": "A test workload",
+        "function": "set_se_binary_workload",
+        "resources": {
+            name: {"id": resource_id, "resource_version": "1.0.0"}
+            for name, resource_id in resources.items()
+        },
+        "additional_params": {},
+        "resource_version": "1.0.0",
+        "gem5_versions": ["develop"],
+    }
+
+
+class PrefetchResourcesTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.prefetch.prefetch_resources()"""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp = Path(self._tmp.name)
+        (tmp / "binary-a").write_text("binary a")
+        (tmp / "binary-b").write_text("binary b")
+        resources = [
+            _binary("binary-a", tmp / "binary-a"),
+            _binary("binary-b", tmp / "binary-b"),
+            _workload("workload-1", {"binary": "binary-a"}),
+            _workload(
+                "workload-2", {"binary": "binary-a", "input": "binary-b"}
+            ),
+        ]
+        self._json_path = tmp / "resources.json"
+        self._json_path.write_text(json.dumps(resources))
+        self._resource_dir = tmp / "resources"
+
+        config = {
+            "sources": {
+                "test": {"url": str(self._json_path), "isMongo": False}
+            }
+        }
+        self._patches = [
+            patch("gem5.resources.client.clientwrapper", new=None),
+            patch(
+                "gem5.resources.client._create_clients",
+                side_effect=lambda x: _create_clients(config),
+            ),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self._patches:
+            p.stop()
+        self._tmp.cleanup()
+
+    def test_dependencies_resolved_once(self) -> None:
+        with patch(
+            "gem5.resources.prefetch.get_multiple_resource_json_obj",
+            wraps=prefetch.get_multiple_resource_json_obj,
+        ) as mock_resolve:
+            lock = prefetch.prefetch_resources(
+                ["workload-1", "workload-2"],
+                resource_directory=str(self._resource_dir),
+                gem5_version="develop",
+                quiet=True,
+            )
+            # One query for the workloads, one for the binaries they share.
+            self.assertEqual(2, mock_resolve.call_count)
+
+        self.assertEqual(
+            {
+                "binary-a@1.0.0",
+                "binary-b@1.0.0",
+                "workload-1@1.0.0",
+                "workload-2@1.0.0",
+            },
+            set(lock["resources"]),
+        )
+        entry = lock["resources"]["binary-a@1.0.0"]
+        self.assertEqual(
+            str(self._resource_dir / "binary-a"), entry["local_path"]
+        )
+        self.assertEqual("binary a", Path(entry["local_path"]).read_text())
+        self.assertIsNone(lock["resources"]["workload-1@1.0.0"]["local_path"])
+
+    def test_lockfile_is_resources_source(self) -> None:
+        lockfile = Path(self._tmp.name) / "resources.lock"
+        prefetch.prefetch_resources(
+            ["workload-2"],
+            resource_directory=str(self._resource_dir),
+            gem5_version="develop",
+            lockfile=str(lockfile),
+            quiet=True,
+        )
+
+        client = JSONClient(path=str(lockfile))
+        self.assertEqual(
+            {"binary-a", "binary-b", "workload-2"},
+            {resource["id"] for resource in client.get_resources_json()},
+        )
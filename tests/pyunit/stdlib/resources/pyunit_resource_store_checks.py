@@ -0,0 +1,271 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gzip
+import hashlib
+import http.server
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gem5.resources.downloader import (
+    _download_ranged,
+    _stream_download,
+    get_resource,
+)
+from gem5.resources.md5_utils import md5_file
+from gem5.resources.resource_store import (
+    ResourceStore,
+    VerifiedHashManifest,
+)
+
+
+class _RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """A request handler which serves single byte ranges. The standard
+    library handler ignores the "Range" header.
+    """
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        data = Path(path).read_bytes()
+        range_header = self.headers.get("Range")
+        if range_header:
+            start, end = range_header.split("=")[1].split("-")
+            data = data[int(start) : int(end) + 1]
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self._range_data = data
+        return None
+
+    def do_GET(self):
+        self.send_head()
+        self.wfile.write(self._range_data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VerifiedHashManifestTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.resource_store.VerifiedHashManifest"""
+
+    def test_lookup_recorded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "file"
+            file.write_text("some content")
+            manifest = VerifiedHashManifest(Path(tmp) / "manifest.json")
+
+            self.assertIsNone(manifest.lookup(file))
+            manifest.record(file, "abc")
+            self.assertEqual("abc", manifest.lookup(file))
+
+    def test_lookup_invalidated_by_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "file"
+            file.write_text("some content")
+            manifest = VerifiedHashManifest(Path(tmp) / "manifest.json")
+            manifest.record(file, "abc")
+
+            file.write_text("some different content")
+            self.assertIsNone(manifest.lookup(file))
+
+    def test_verified_md5_computes_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "file"
+            file.write_text("some content")
+            manifest = VerifiedHashManifest(Path(tmp) / "manifest.json")
+
+            self.assertEqual(md5_file(file), manifest.verified_md5(file))
+            with patch("gem5.resources.resource_store.md5") as mock_md5:
+                manifest.verified_md5(file)
+                mock_md5.assert_not_called()
+
+
+class ResourceStoreTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.resource_store.ResourceStore"""
+
+    def test_ingest_file_is_linked(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResourceStore(Path(tmp) / "store")
+            file = Path(tmp) / "file"
+            file.write_text("some content")
+            md5sum = md5_file(file)
+
+            store.ingest(file, md5sum)
+            self.assertTrue(store.contains(md5sum))
+            self.assertTrue(os.path.samefile(file, store.object_path(md5sum)))
+
+            other = Path(tmp) / "other" / "file"
+            store.link_into(md5sum, other)
+            self.assertEqual("some content", other.read_text())
+
+    def test_ingest_directory_is_linked(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResourceStore(Path(tmp) / "store")
+            directory = Path(tmp) / "dir"
+            directory.mkdir()
+            (directory / "file").write_text("some content")
+
+            store.ingest(directory, "0123456789")
+            self.assertTrue(directory.is_symlink())
+            self.assertEqual("some content", (directory / "file").read_text())
+
+    def test_corrupt_object_removed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ResourceStore(Path(tmp) / "store")
+            file = Path(tmp) / "file"
+            file.write_text("some content")
+            md5sum = md5_file(file)
+            store.ingest(file, md5sum)
+
+            os.remove(file)
+            store.object_path(md5sum).write_text("corrupt")
+            self.assertFalse(store.contains(md5sum))
+            self.assertFalse(store.object_path(md5sum).exists())
+
+
+class RangedDownloadTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.downloader._download_ranged"""
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._serve_dir = Path(self._tmp.name) / "serve"
+        self._serve_dir.mkdir()
+        self._data = os.urandom(100 * 1024)
+        (self._serve_dir / "blob").write_bytes(self._data)
+
+        handler = lambda *args, **kwargs: _RangeRequestHandler(
+            *args, directory=str(self._serve_dir), **kwargs
+        )
+        self._server = http.server.ThreadingHTTPServer(
+            ("localhost", 0), handler
+        )
+        threading.Thread(target=self._server.serve_forever).start()
+        self._url = f"http://localhost:{self._server.server_port}/blob"
+
+    def tearDown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._tmp.cleanup()
+
+    def test_ranged_download(self) -> None:
+        download_to = os.path.join(self._tmp.name, "blob")
+        _download_ranged(
+            url=self._url,
+            download_to=download_to,
+            total_size=len(self._data),
+            num_connections=4,
+            chunk_size=8 * 1024,
+        )
+        self.assertEqual(self._data, Path(download_to).read_bytes())
+        self.assertFalse(os.path.exists(f"{download_to}.part"))
+        self.assertFalse(os.path.exists(f"{download_to}.part.json"))
+
+    def test_ranged_download_resumes(self) -> None:
+        download_to = os.path.join(self._tmp.name, "blob")
+
+        # Mimic an interrupted download in which only the first range was
+        # fetched. The bytes of that range are deliberately wrong so that
+        # refetching it would be detected.
+        chunk_size = 8 * 1024
+        with open(f"{download_to}.part", "wb") as f:
+            f.write(bytes(chunk_size))
+            f.write(self._data[chunk_size:])
+        with open(f"{download_to}.part.json", "w") as f:
+            json.dump(
+                {"url": self._url, "size": len(self._data), "done": [0]}, f
+            )
+
+        _download_ranged(
+            url=self._url,
+            download_to=download_to,
+            total_size=len(self._data),
+            num_connections=4,
+            chunk_size=chunk_size,
+        )
+        self.assertEqual(
+            bytes(chunk_size) + self._data[chunk_size:],
+            Path(download_to).read_bytes(),
+        )
+
+    def test_stream_download_ranged(self) -> None:
+        (self._serve_dir / "blob.gz").write_bytes(gzip.compress(self._data))
+        to_path = os.path.join(self._tmp.name, "blob")
+        with patch(
+            "gem5.resources.downloader._RANGED_DOWNLOAD_MIN_SIZE", 0
+        ), patch(
+            "gem5.resources.downloader._download_ranged",
+            wraps=_download_ranged,
+        ) as mock_ranged:
+            md5sum = _stream_download(
+                url=f"{self._url}.gz", to_path=to_path, unzip=True, untar=False
+            )
+        mock_ranged.assert_called_once()
+        self.assertEqual(self._data, Path(to_path).read_bytes())
+        self.assertEqual(md5_file(Path(to_path)), md5sum)
+        self.assertEqual(["blob", "serve"], sorted(os.listdir(self._tmp.name)))
+
+
+class GetResourceWithStoreTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.downloader.get_resource when the
+    resource store is enabled.
+    """
+
+    def test_second_get_resource_uses_store(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = Path(tmp) / "source"
+            source.write_text("resource content")
+            resource_json = {
+                "id": "test-resource",
+                "md5sum": hashlib.md5(b"resource content").hexdigest(),
+                "url": f"file://{source}",
+                "is_zipped": False,
+            }
+
+            with patch.dict(
+                os.environ, {"GEM5_RESOURCE_STORE": f"{tmp}/store"}
+            ), patch(
+                "gem5.resources.downloader.get_resource_json_obj",
+                return_value=resource_json,
+            ):
+                first = Path(tmp) / "a" / "test-resource"
+                first.parent.mkdir()
+                get_resource("test-resource", str(first), quiet=True)
+
+                second = Path(tmp) / "b" / "test-resource"
+                second.parent.mkdir()
+                with patch("shutil.copy") as mock_copy:
+                    get_resource("test-resource", str(second), quiet=True)
+                    mock_copy.assert_not_called()
+
+            self.assertTrue(os.path.samefile(first, second))
@@ -0,0 +1,147 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import gzip
+import hashlib
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from gem5.resources.downloader import (
+    _stream_extract,
+    get_resource,
+)
+from gem5.resources.md5_utils import md5_dir
+
+
+class StreamExtractTestSuite(unittest.TestCase):
+    """Test cases for gem5.resources.downloader._stream_extract"""
+
+    def _make_tar(self, files) -> bytes:
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            for name, data in files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def test_gunzip_file(self) -> None:
+        data = os.urandom(300 * 1024)
+        with tempfile.TemporaryDirectory() as tmp:
+            to_path = os.path.join(tmp, "resource")
+            md5sum = _stream_extract(
+                io.BytesIO(gzip.compress(data)),
+                to_path,
+                unzip=True,
+                untar=False,
+            )
+            self.assertEqual(data, Path(to_path).read_bytes())
+            self.assertEqual(hashlib.md5(data).hexdigest(), md5sum)
+            self.assertEqual(["resource"], os.listdir(tmp))
+
+    def test_gunzip_untar_directory(self) -> None:
+        files = {"a": b"first file", "dir/b": b"second file"}
+        with tempfile.TemporaryDirectory() as tmp:
+            to_path = os.path.join(tmp, "resource")
+            md5sum = _stream_extract(
+                io.BytesIO(gzip.compress(self._make_tar(files))),
+                to_path,
+                unzip=True,
+                untar=True,
+            )
+            self.assertIsNone(md5sum)
+            for name, data in files.items():
+                self.assertEqual(data, (Path(to_path) / name).read_bytes())
+            self.assertEqual(["resource"], os.listdir(tmp))
+
+    def test_path_traversal_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            to_path = os.path.join(tmp, "resource")
+            with self.assertRaises(Exception) as context:
+                _stream_extract(
+                    io.BytesIO(self._make_tar({"../evil": b"evil"})),
+                    to_path,
+                    unzip=False,
+                    untar=True,
+                )
+            self.assertIn("Path Traversal", str(context.exception))
+            self.assertEqual([], os.listdir(tmp))
+
+    def test_truncated_stream_leaves_nothing(self) -> None:
+        compressed = gzip.compress(os.urandom(300 * 1024))
+        with tempfile.TemporaryDirectory() as tmp:
+            to_path = os.path.join(tmp, "resource")
+            with self.assertRaises(EOFError):
+                _stream_extract(
+                    io.BytesIO(compressed[: len(compressed) // 2]),
+                    to_path,
+                    unzip=True,
+                    untar=False,
+                )
+            self.assertEqual([], os.listdir(tmp))
+
+
+class GetResourceStreamingTestSuite(unittest.TestCase):
+    """Test cases for obtaining compressed archives with
+    gem5.resources.downloader.get_resource
+    """
+
+    def test_tar_gz_resource(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source_dir = Path(tmp) / "source"
+            (source_dir / "sub").mkdir(parents=True)
+            (source_dir / "file").write_text("some data")
+            (source_dir / "sub" / "file").write_text("some more data")
+            archive = Path(tmp) / "resource.tar.gz"
+            with tarfile.open(archive, "w:gz") as tar:
+                for path in ("file", "sub/file"):
+                    tar.add(source_dir / path, arcname=path)
+
+            resource_json = {
+                "id": "test-resource",
+                "md5sum": md5_dir(source_dir),
+                "url": f"file://{archive}",
+                "is_zipped": True,
+                "is_tar_archive": True,
+            }
+            to_path = Path(tmp) / "out" / "test-resource"
+            to_path.parent.mkdir()
+            with patch(
+                "gem5.resources.downloader.get_resource_json_obj",
+                return_value=resource_json,
+            ):
+                get_resource("test-resource", str(to_path), quiet=True)
+
+            self.assertEqual(resource_json["md5sum"], md5_dir(to_path))
+            self.assertNotIn(
+                "test-resource.tar.gz", os.listdir(to_path.parent)
+            )
+            self.assertNotIn("test-resource.tar", os.listdir(to_path.parent))
@@ -0,0 +1,124 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from m5.params import *
+from m5.SimObject import SimObject
+from m5.util.config_writer import (
+    ConfigWriter,
+    write_ini,
+    write_json,
+)
+
+
+class ConfigWriterNode(SimObject):
+    type = "ConfigWriterNode"
+    cxx_header = "config_writer_node.hh"
+    cxx_class = "gem5::ConfigWriterNode"
+
+    size = Param.Int(3, "A number")
+    label = Param.String('né "quoted"', "A string")
+    enabled = Param.Bool(True, "A bool")
+    sizes = VectorParam.Int([1, 2], "A vector")
+    peer = Param.ConfigWriterNode(NULL, "Another node")
+    nodes = VectorParam.ConfigWriterNode([], "Other nodes")
+
+
+def _build_hierarchy(depth: int = 2) -> ConfigWriterNode:
+    node = ConfigWriterNode(eventq_index=0)
+    if depth:
+        node.left = _build_hierarchy(depth - 1)
+        node.right = _build_hierarchy(depth - 1)
+        node.vec = [ConfigWriterNode(eventq_index=0) for _ in range(2)]
+        node.peer = node.left
+        node.nodes = [node.left, node.right]
+    return node
+
+
+class ConfigWriterTestSuite(unittest.TestCase):
+    """Tests the config.ini and config.json writers."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.root = _build_hierarchy()
+        cls.root.freeze_descendants()
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.tmpdir.name, name)) as f:
+            return f.read()
+
+    def _expected_ini(self) -> str:
+        ini = io.StringIO()
+        for obj in sorted(self.root.descendants(), key=lambda o: o.path()):
+            obj.print_ini(ini)
+        return ini.getvalue()
+
+    def test_ini_matches_print_ini(self) -> None:
+        write_ini(self.root, os.path.join(self.tmpdir.name, "config.ini"))
+        self.assertEqual(self._expected_ini(), self._read("config.ini"))
+
+    def test_json_matches_json_dump(self) -> None:
+        write_json(self.root, os.path.join(self.tmpdir.name, "config.json"))
+        self.assertEqual(
+            json.dumps(self.root.get_config_as_dict(), indent=4),
+            self._read("config.json"),
+        )
+
+    def test_background_writer(self) -> None:
+        writer = ConfigWriter(
+            self.root,
+            self.tmpdir.name,
+            ini_file="config.ini",
+            json_file="config.json",
+        )
+        writer.start()
+        writer.join()
+        self.assertEqual(self._expected_ini(), self._read("config.ini"))
+        self.assertEqual(
+            self.root.get_config_as_dict(),
+            json.loads(self._read("config.json")),
+        )
+
+    def test_background_writer_raises_on_join(self) -> None:
+        writer = ConfigWriter(
+            self.root,
+            os.path.join(self.tmpdir.name, "missing"),
+            ini_file="config.ini",
+        )
+        writer.start()
+        with self.assertRaises(OSError):
+            writer.join()
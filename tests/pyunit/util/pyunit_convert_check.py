@@ -277,3 +277,26 @@ class ConvertTestSuite(unittest.TestCase):
         self.assertRaises(ValueError, conv, "-1K")
 
         self.assertEqual(conv("32F"), 273.15)
+
+    def test_parse_cache(self):
+        convert.clear_parse_caches()
+        conv = convert.toMemorySize
+
+        self.assertEqual(conv("64KiB"), 64 * 2**10)
+        self.assertEqual(conv("64KiB"), 64 * 2**10)
+        self.assertEqual(1, conv.cache_info().hits)
+        self.assertEqual(1, conv.cache_info().currsize)
+
+        # Failed conversions aren't cached, and raise the same error again
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, "memory size"):
+                conv("64KiX")
+        self.assertEqual(1, conv.cache_info().currsize)
+
+        # Each converter has its own cache
+        self.assertEqual(convert.toLatency("1ns"), 1e-9)
+        self.assertEqual(convert.toFrequency("1GHz"), 1e9)
+        self.assertEqual(1, convert.toLatency.cache_info().currsize)
+
+        convert.clear_parse_caches()
+        self.assertEqual(0, conv.cache_info().currsize)
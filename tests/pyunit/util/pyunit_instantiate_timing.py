@@ -0,0 +1,55 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import os
+import tempfile
+import unittest
+
+from m5.simulate import _PhaseTimer
+
+
+class PhaseTimerTestSuite(unittest.TestCase):
+    """Tests the report written by ``--instantiate-timing``."""
+
+    def test_one_line_per_phase(self) -> None:
+        phases = ["adoptOrphanParams", "unproxyParams", "createCCObject"]
+        timer = _PhaseTimer()
+        for phase in phases:
+            timer.end_phase(phase)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "instantiate.txt")
+            timer.write(path, 42)
+            with open(path) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual("# m5.instantiate of 42 SimObjects", lines[0])
+        self.assertEqual(
+            phases + ["total"], [line.split()[0] for line in lines[1:]]
+        )
+        seconds = [float(line.split()[1]) for line in lines[1:]]
+        self.assertTrue(all(s >= 0 for s in seconds))
+        self.assertAlmostEqual(sum(seconds[:-1]), seconds[-1], places=5)
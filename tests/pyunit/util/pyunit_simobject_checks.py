@@ -0,0 +1,167 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from m5.params import *
+from m5.SimObject import (
+    SimObject,
+    memoize_find_all,
+)
+
+
+class SimObjectChecksLeaf(SimObject):
+    type = "SimObjectChecksLeaf"
+    cxx_header = "simobject_checks.hh"
+    cxx_class = "gem5::SimObjectChecksLeaf"
+
+
+class SimObjectChecksNode(SimObject):
+    type = "SimObjectChecksNode"
+    cxx_header = "simobject_checks.hh"
+    cxx_class = "gem5::SimObjectChecksNode"
+
+    leaf = Param.SimObjectChecksLeaf(NULL, "A leaf")
+
+
+def _build_hierarchy(depth: int = 2) -> SimObjectChecksNode:
+    node = SimObjectChecksNode(eventq_index=0)
+    node.own = SimObjectChecksLeaf(eventq_index=0)
+    if depth:
+        node.left = _build_hierarchy(depth - 1)
+        node.right = _build_hierarchy(depth - 1)
+        node.vec = [
+            SimObjectChecksLeaf(eventq_index=0),
+            _build_hierarchy(depth - 1),
+        ]
+    return node
+
+
+class FindAllTestSuite(unittest.TestCase):
+    """Tests that the memoized results of SimObject.find_all are dropped when
+    the hierarchy below the object changes."""
+
+    def setUp(self) -> None:
+        self.root = _build_hierarchy()
+        self.descendant = self.root.vec[1].left
+        # A leaf outside of the hierarchy.
+        self.other = SimObjectChecksNode(eventq_index=0)
+        self.other.own = SimObjectChecksLeaf(eventq_index=0)
+
+    def _assert_unmemoized(self) -> None:
+        for obj in (self.root, self.root.vec[1], self.descendant):
+            found, done = obj.find_all(SimObjectChecksLeaf)
+            self.assertTrue(done)
+            self.assertEqual(obj._find_all(SimObjectChecksLeaf), found)
+
+    def test_memoized(self) -> None:
+        with memoize_find_all():
+            self._assert_unmemoized()
+            found, _ = self.root.find_all(SimObjectChecksLeaf)
+            # The caller may change the list returned.
+            found.clear()
+            self._assert_unmemoized()
+            self.assertEqual(
+                17, len(self.root.find_all(SimObjectChecksLeaf)[0])
+            )
+
+    def test_changes_below_memoized_object(self) -> None:
+        with memoize_find_all():
+            self._assert_unmemoized()
+
+            # A param set to an object outside of the hierarchy.
+            self.descendant.leaf = self.other.own
+            self._assert_unmemoized()
+            self.assertIn(
+                self.other.own, self.root.find_all(SimObjectChecksLeaf)[0]
+            )
+
+            # A new child.
+            self.descendant.added = SimObjectChecksLeaf(eventq_index=0)
+            self._assert_unmemoized()
+            self.assertIn(
+                self.descendant.added,
+                self.root.find_all(SimObjectChecksLeaf)[0],
+            )
+
+            # A removed child.
+            removed = self.descendant.own
+            self.descendant.clear_child("own")
+            self._assert_unmemoized()
+            self.assertNotIn(
+                removed, self.root.find_all(SimObjectChecksLeaf)[0]
+            )
+
+    def test_params_of_type_new_param(self) -> None:
+        class SimObjectChecksBase(SimObject):
+            type = "SimObjectChecksBase"
+            cxx_header = "simobject_checks.hh"
+            cxx_class = "gem5::SimObjectChecksBase"
+
+        class SimObjectChecksDerived(SimObjectChecksBase):
+            type = "SimObjectChecksDerived"
+            cxx_header = "simobject_checks.hh"
+            cxx_class = "gem5::SimObjectChecksDerived"
+
+        obj = SimObjectChecksDerived(eventq_index=0)
+        self.assertEqual([], obj._get_params_of_type(SimObjectChecksLeaf))
+        SimObjectChecksBase._new_param(
+            "extra", Param.SimObjectChecksLeaf(NULL, "A leaf")
+        )
+        self.assertEqual(
+            ["extra"], obj._get_params_of_type(SimObjectChecksLeaf)
+        )
+
+
+class FreezeDescendantsTestSuite(unittest.TestCase):
+    """Tests that the frozen order, and paths, of the descendants of a
+    SimObject are those computed by walking the hierarchy."""
+
+    def setUp(self) -> None:
+        self.root = _build_hierarchy(depth=3)
+        self.walked = list(self.root._walk_descendants())
+        self.paths = [obj.path() for obj in self.walked]
+
+    def test_frozen_order_and_paths(self) -> None:
+        self.root.freeze_descendants()
+        self.assertEqual(self.walked, self.root._frozen_descendants)
+        self.assertEqual(self.walked, list(self.root.descendants()))
+        self.assertEqual(self.paths, [obj._frozen_path for obj in self.walked])
+        self.assertEqual(self.paths, [obj.path() for obj in self.walked])
+        # The elements of SimObjectVectors are included, with their index in
+        # their path.
+        self.assertIn(self.root.vec[1].vec[0], self.walked)
+        self.assertTrue(self.root.vec[1].vec[0].path().endswith("vec1.vec0"))
+
+    def test_frozen_subtree(self) -> None:
+        subtree = self.root.vec[1]
+        subtree.freeze_descendants()
+        self.assertEqual(
+            list(subtree._walk_descendants()), list(subtree.descendants())
+        )
+        # Objects outside of the subtree are not frozen.
+        self.assertIsNone(self.root._frozen_path)
+        self.assertIsNone(self.root._frozen_descendants)
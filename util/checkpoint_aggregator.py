@@ -27,11 +27,19 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import gzip
+import mmap
+import multiprocessing
 import os
 import re
+import shutil
 import sys
 from configparser import ConfigParser
 
+PAGE_SHIFT = 12
+
+# Memory images are copied in blocks of this many bytes
+BLOCK_SIZE = 1 << 24
+
 
 class myCP(ConfigParser):
     def __init__(self):
@@ -41,19 +49,138 @@ class myCP(ConfigParser):
         return optionstr
 
 
-def aggregate(output_dir, cpts, no_compress, memory_size):
+def _read_image(path, size):
+    """
+    Yield the first size bytes of a gzipped memory image in large
+    blocks, padding it with zeros if it is shorter.
+    """
+    with gzip.open(path, "rb") as gf:
+        while size:
+            block = gf.read(min(size, BLOCK_SIZE))
+            if not block:
+                break
+            size -= len(block)
+            yield block
+    while size:
+        block = bytes(min(size, BLOCK_SIZE))
+        size -= len(block)
+        yield block
+
+
+def _compress_image(args):
+    """
+    Recompress the first size bytes of a memory image into a gzip file
+    of its own, which can be appended to the merged image.
+    """
+    path, size, out_path = args
+    with open(out_path, "wb") as out:
+        with gzip.GzipFile(fileobj=out, mode="wb") as gz:
+            for block in _read_image(path, size):
+                gz.write(block)
+    return out_path
+
+
+def _map_image(args):
+    """
+    Decompress the first size bytes of a memory image straight into the
+    merged, uncompressed image at the given offset.
+    """
+    path, size, out_path, offset = args
+    if not size:
+        return
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with open(out_path, "r+b") as out, mmap.mmap(
+        out.fileno(), offset + size - start, offset=start
+    ) as mm, gzip.open(path, "rb") as gf:
+        view = memoryview(mm)
+        pos = offset - start
+        end = pos + size
+        while pos < end:
+            read = gf.readinto(view[pos : min(end, pos + BLOCK_SIZE)])
+            if not read:
+                break
+            pos += read
+        view.release()
+
+
+def _ordered_map(func, args, jobs):
+    """
+    Map func over args in jobs processes, yielding results in order.
+    """
+    if jobs == 1:
+        yield from map(func, args)
+        return
+    with multiprocessing.Pool(jobs) as pool:
+        yield from pool.imap(func, args)
+
+
+def _write_zeros(out, size):
+    """
+    Append size zero bytes to a gzip stream. The zeros are written as
+    repeated copies of one compressed block, as gzip allows a stream to
+    be a series of members.
+    """
+    if size >= BLOCK_SIZE:
+        member = gzip.compress(bytes(BLOCK_SIZE), mtime=0)
+        for _ in range(size // BLOCK_SIZE):
+            out.write(member)
+    if size % BLOCK_SIZE:
+        out.write(gzip.compress(bytes(size % BLOCK_SIZE), mtime=0))
+
+
+def merge_memory(images, out_path, pad_size, no_compress, jobs=None):
+    """
+    Concatenate the memory images of the checkpoints, followed by
+    pad_size bytes of zeros.
+
+    The images are decompressed in parallel. A compressed result is
+    assembled in checkpoint order from a gzip member per image. An
+    uncompressed result is created as a sparse file of the final size,
+    into which each image is decompressed through an mmap, so the
+    padding takes no space or time.
+
+    :param images: (path, offset, size) of each gzipped image, where
+        size bytes of the image go to offset in the result.
+    :param out_path: Path of the merged image.
+    :param pad_size: The number of zero bytes to append.
+    :param no_compress: Write an uncompressed image.
+    :param jobs: The number of processes, all cores if None.
+    """
+    if no_compress:
+        total_size = pad_size
+        if images:
+            total_size += images[-1][1] + images[-1][2]
+        with open(out_path, "wb") as out:
+            out.truncate(total_size)
+        args = [
+            (path, size, out_path, offset) for path, offset, size in images
+        ]
+        for _ in _ordered_map(_map_image, args, jobs):
+            pass
+        return
+
+    args = [
+        (path, size, f"{out_path}.{i}.tmp")
+        for i, (path, _, size) in enumerate(images)
+    ]
+    with open(out_path, "wb") as out:
+        for part in _ordered_map(_compress_image, args, jobs):
+            with open(part, "rb") as f:
+                shutil.copyfileobj(f, out, BLOCK_SIZE)
+            os.remove(part)
+        _write_zeros(out, pad_size)
+
+
+def aggregate(output_dir, cpts, no_compress, memory_size, jobs=None):
     merged_config = None
     page_ptr = 0
+    images = []
 
     output_path = output_dir
     if not os.path.isdir(output_path):
         os.system("mkdir -p " + output_path)
 
-    agg_mem_file = open(output_path + "/system.physmem.store0.pmem", "wb+")
-    agg_config_file = open(output_path + "/m5.cpt", "wb+")
-
-    if not no_compress:
-        merged_mem = gzip.GzipFile(fileobj=agg_mem_file, mode="wb")
+    agg_config_file = open(output_path + "/m5.cpt", "w+")
 
     max_curtick = 0
     num_digits = len(str(len(cpts) - 1))
@@ -62,7 +189,7 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
         print(arg)
         merged_config = myCP()
         config = myCP()
-        config.readfp(open(cpts[i] + "/m5.cpt"))
+        config.read_file(open(cpts[i] + "/m5.cpt"))
 
         for sec in config.sections():
             if re.compile("cpu").search(sec):
@@ -73,13 +200,15 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
                 for item in items:
                     if item[0] == "paddr":
                         merged_config.set(
-                            newsec, item[0], int(item[1]) + (page_ptr << 12)
+                            newsec,
+                            item[0],
+                            str(int(item[1]) + (page_ptr << 12)),
                         )
                         continue
                     merged_config.set(newsec, item[0], item[1])
 
                 if re.compile("workload.FdMap256$").search(sec):
-                    merged_config.set(newsec, "M5_pid", i)
+                    merged_config.set(newsec, "M5_pid", str(i))
 
             elif sec == "system":
                 pass
@@ -98,37 +227,33 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
 
         ### memory stuff
         pages = int(config.get("system", "pagePtr"))
+        images.append(
+            (
+                cpts[i] + "/system.physmem.store0.pmem",
+                page_ptr << PAGE_SHIFT,
+                pages << PAGE_SHIFT,
+            )
+        )
         page_ptr = page_ptr + pages
         print("pages to be read: ", pages)
 
-        f = open(cpts[i] + "/system.physmem.store0.pmem", "rb")
-        gf = gzip.GzipFile(fileobj=f, mode="rb")
-
-        x = 0
-        while x < pages:
-            bytesRead = gf.read(1 << 12)
-            if not no_compress:
-                merged_mem.write(bytesRead)
-            else:
-                agg_mem_file.write(bytesRead)
-            x += 1
-
-        gf.close()
-        f.close()
-
     merged_config.add_section("system")
-    merged_config.set("system", "pagePtr", page_ptr)
-    merged_config.set("system", "nextPID", len(cpts))
-
-    file_size = page_ptr * 4 * 1024
-    dummy_data = "".zfill(4096)
-    while file_size < memory_size:
-        if not no_compress:
-            merged_mem.write(dummy_data)
-        else:
-            agg_mem_file.write(dummy_data)
-        file_size += 4 * 1024
-        page_ptr += 1
+    merged_config.set("system", "pagePtr", str(page_ptr))
+    merged_config.set("system", "nextPID", str(len(cpts)))
+
+    # Pad the memory with zero pages up to memory_size
+    pad_pages = 0
+    if memory_size:
+        pad_size = memory_size - (page_ptr << PAGE_SHIFT)
+        pad_pages = max(0, -(-pad_size >> PAGE_SHIFT))
+    merge_memory(
+        images,
+        output_path + "/system.physmem.store0.pmem",
+        pad_pages << PAGE_SHIFT,
+        no_compress,
+        jobs,
+    )
+    page_ptr += pad_pages
 
     print("WARNING: ")
     print(
@@ -136,19 +261,14 @@ def aggregate(output_dir, cpts, no_compress, memory_size):
     )
     print(page_ptr, "x 4K of memory")
     merged_config.set(
-        "system.physmem.store0", "range_size", page_ptr * 4 * 1024
+        "system.physmem.store0", "range_size", str(page_ptr * 4 * 1024)
     )
 
     merged_config.add_section("Globals")
-    merged_config.set("Globals", "curTick", max_curtick)
+    merged_config.set("Globals", "curTick", str(max_curtick))
 
     merged_config.write(agg_config_file)
-
-    if not no_compress:
-        merged_mem.close()
-        agg_mem_file.close()
-    else:
-        agg_mem_file.close()
+    agg_config_file.close()
 
 
 if __name__ == "__main__":
@@ -161,9 +281,21 @@ if __name__ == "__main__":
     parser.add_argument(
         "-o", "--output-dir", action="store", help="Output directory"
     )
-    parser.add_argument("-c", "--no-compress", action="store_true")
+    parser.add_argument(
+        "-c",
+        "--no-compress",
+        action="store_true",
+        help="Write an uncompressed, sparse memory image",
+    )
     parser.add_argument("--cpts", nargs="+")
     parser.add_argument("--memory-size", action="store", type=int)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of processes used to merge the memory images "
+        "(default: all cores)",
+    )
 
     # Assume x86 ISA.  Any other ISAs would need extra stuff in this script
     # to appropriately parse their page tables and understand page sizes.
@@ -180,4 +312,5 @@ if __name__ == "__main__":
         options.cpts,
         options.no_compress,
         options.memory_size,
+        options.jobs,
     )
@@ -86,6 +86,7 @@
 # 8,35670,1,STORE,1748748,4,74,0:,6,3:,7
 # 9,35670,1,COMP,500::,7
 
+import itertools
 import sys
 
 import protolib
@@ -158,10 +159,11 @@ def main():
     num_packets = 0
     num_regdeps = 0
     num_robdeps = 0
-    packet = inst_dep_record_pb2.InstDepRecord()
 
     # Decode the packet messages until we hit the end of the file
-    while protolib.decodeMessage(proto_in, packet):
+    for packet in itertools.chain.from_iterable(
+        protolib.decodeMessages(proto_in, inst_dep_record_pb2.InstDepRecord)
+    ):
         num_packets += 1
 
         # Write to file the seq num
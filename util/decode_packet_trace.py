@@ -38,9 +38,9 @@
 # This script is used to dump protobuf packet traces to ASCII
 # format.
 
+import argparse
 import os
 import subprocess
-import sys
 
 import protolib
 
@@ -50,25 +50,59 @@ subprocess.check_call(["make", "--quiet", "-C", util_dir, "packet_pb2.py"])
 import packet_pb2
 
 
+def format_packets(messages):
+    """
+    Return the number of packets in a list of raw packet messages and
+    their ASCII representation.
+    """
+    parse = packet_pb2.Packet.FromString
+    lines = []
+    for raw in messages:
+        packet = parse(raw)
+        # ReadReq is 1 and WriteReq is 4 in src/mem/packet.hh Command enum
+        cmd = "r" if packet.cmd == 1 else ("w" if packet.cmd == 4 else "u")
+        line = f"{packet.pkt_id}," if packet.HasField("pkt_id") else ""
+        line += f"{cmd},{packet.addr},{packet.size},"
+        if packet.HasField("flags"):
+            line += f"{packet.flags},"
+        line += f"{packet.tick}"
+        if packet.HasField("pc"):
+            line += f",{packet.pc}"
+        lines.append(line + "\n")
+    return len(lines), "".join(lines)
+
+
 def main():
-    if len(sys.argv) != 3:
-        print("Usage: ", sys.argv[0], " <protobuf input> <ASCII output>")
-        exit(-1)
+    parser = argparse.ArgumentParser(
+        description="Dump a protobuf packet trace to ASCII."
+    )
+    parser.add_argument("input", help="protobuf input")
+    parser.add_argument("output", help="ASCII output")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Decode uncompressed or block-compressed traces (see "
+        "protolib.py) with this many processes, 0 for all cores "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args()
 
     # Open the file in read mode
-    proto_in = protolib.openFileRd(sys.argv[1])
+    proto_in = protolib.openFileRd(args.input)
 
     try:
-        ascii_out = open(sys.argv[2], "w")
+        ascii_out = open(args.output, "w")
     except OSError:
-        print("Failed to open ", sys.argv[2], " for writing")
+        print("Failed to open ", args.output, " for writing")
         exit(-1)
 
     # Read the magic number in 4-byte Little Endian
     magic_number = proto_in.read(4).decode()
 
     if magic_number != "gem5":
-        print("Unrecognized file", sys.argv[1])
+        print("Unrecognized file", args.input)
         exit(-1)
 
     print("Parsing packet header")
@@ -76,6 +110,7 @@ def main():
     # Add the packet header
     header = packet_pb2.PacketHeader()
     protolib.decodeMessage(proto_in, header)
+    proto_in.close()
 
     print("Object id:", header.obj_id)
     print("Tick frequency:", header.tick_freq)
@@ -86,31 +121,18 @@ def main():
     print("Parsing packets")
 
     num_packets = 0
-    packet = packet_pb2.Packet()
 
     # Decode the packet messages until we hit the end of the file
-    while protolib.decodeMessage(proto_in, packet):
-        num_packets += 1
-        # ReadReq is 1 and WriteReq is 4 in src/mem/packet.hh Command enum
-        cmd = "r" if packet.cmd == 1 else ("w" if packet.cmd == 4 else "u")
-        if packet.HasField("pkt_id"):
-            ascii_out.write(f"{packet.pkt_id},")
-        if packet.HasField("flags"):
-            ascii_out.write(
-                f"{cmd},{packet.addr},{packet.size},{packet.flags},{packet.tick}"
-            )
-        else:
-            ascii_out.write(f"{cmd},{packet.addr},{packet.size},{packet.tick}")
-        if packet.HasField("pc"):
-            ascii_out.write(f",{packet.pc}\n")
-        else:
-            ascii_out.write("\n")
+    for count, text in protolib.mapMessageChunks(
+        args.input, format_packets, args.jobs or None
+    ):
+        num_packets += count
+        ascii_out.write(text)
 
     print("Parsed packets:", num_packets)
 
     # We're done
     ascii_out.close()
-    proto_in.close()
 
 
 if __name__ == "__main__":
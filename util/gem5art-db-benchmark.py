@@ -0,0 +1,158 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+A benchmark of the file-backed gem5art artifact databases.
+
+Artifacts are registered one at a time, as a gem5art run script registers
+them, into an ``ArtifactJournalDB`` and an ``ArtifactFileDB``. The time
+taken to insert them, to open the database again, and to look artifacts up
+by hash and name is reported for each. As ``ArtifactFileDB`` rewrites its
+whole JSON file on every insert, it is only given ``--file-db-count``
+artifacts.
+
+Usage
+-----
+
+```sh
+PYTHONPATH=util/gem5art/artifact python3 util/gem5art-db-benchmark.py \
+    [--count 100000] [--file-db-count 2000]
+```
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Type,
+)
+from uuid import uuid4
+
+from gem5art.artifact._artifactdb import (
+    ArtifactFileDB,
+    ArtifactJournalDB,
+)
+
+# The number of artifacts that are looked up by hash and by name
+_LOOKUPS = 1000
+
+
+def make_artifacts(count: int) -> List[Dict[str, Any]]:
+    """Returns ``count`` artifacts, spread over a few types and, like the
+    runs of an experiment, over fewer names than artifacts.
+    """
+    artifacts = []
+    for i in range(count):
+        the_uuid = uuid4()
+        artifacts.append(
+            {
+                "_id": the_uuid,
+                "name": f"run-{i // 10}",
+                "type": ("gem5 run", "disk image", "kernel")[i % 3],
+                "hash": the_uuid.hex,
+                "command": f"gem5.opt run.py --run {i}",
+                "cwd": "/",
+                "path": f"results/run-{i}",
+                "inputs": [],
+                "documentation": "Artifact made for benchmarking.",
+            }
+        )
+    return artifacts
+
+
+def run_db(
+    db_type: Type[ArtifactFileDB],
+    uri: str,
+    artifacts: List[Dict[str, Any]],
+) -> None:
+    start = time.perf_counter()
+    db = db_type(uri)
+    for artifact in artifacts:
+        db.put(artifact["_id"], artifact)
+    inserted = time.perf_counter()
+
+    db = db_type(uri)
+    opened = time.perf_counter()
+
+    step = max(1, len(artifacts) // _LOOKUPS)
+    samples = artifacts[::step]
+    for artifact in samples:
+        db.get(artifact["hash"])
+        list(db.find_exact({"name": artifact["name"]}, 0))
+    looked_up = time.perf_counter()
+
+    print(
+        f"{db_type.__name__:<18} {len(artifacts):>8} "
+        f"{(inserted - start) * 1e6 / len(artifacts):>12.1f} "
+        f"{(opened - inserted) * 1000:>10.1f} "
+        f"{(looked_up - opened) * 1e6 / len(samples):>12.1f}"
+    )
+
+
+def run(count: int, file_db_count: int) -> None:
+    artifacts = make_artifacts(max(count, file_db_count))
+    print(
+        f"{'database':<18} {'count':>8} {'insert (us)':>12} "
+        f"{'open (ms)':>10} {'lookup (us)':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir)
+        run_db(
+            ArtifactJournalDB,
+            f"journal://{path / 'db.jsonl'}",
+            artifacts[:count],
+        )
+        if file_db_count:
+            run_db(
+                ArtifactFileDB,
+                f"file://{path / 'db.json'}",
+                artifacts[:file_db_count],
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the file-backed gem5art artifact databases."
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=100000,
+        help="The number of artifacts inserted into the journal database.",
+    )
+    parser.add_argument(
+        "--file-db-count",
+        type=int,
+        default=2000,
+        help="The number of artifacts inserted into the JSON file database, "
+        "0 to skip it.",
+    )
+    args = parser.parse_args()
+    run(args.count, args.file_db_count)
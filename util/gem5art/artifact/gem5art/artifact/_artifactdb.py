@@ -35,8 +35,12 @@ Some common queries can be found in common_queries.py
 """
 
 import copy
+import fcntl
+import gc
+import itertools
 import json
 import os
+import re
 import shutil
 from abc import (
     ABC,
@@ -47,7 +51,9 @@ from typing import (
     Any,
     Dict,
     Iterable,
+    Iterator,
     List,
+    Optional,
     Tuple,
     Type,
     Union,
@@ -131,17 +137,31 @@ class ArtifactDB(ABC):
         implement this function"""
         raise NotImplementedError()
 
+    def putStatus(self, key: UUID, status: Dict[str, Any]) -> None:
+        """Set the status of the run with _id key, e.g., its heartbeats
+        while it is running, replacing any earlier status. Statuses are
+        kept apart from the artifacts. Note: Not all DB implementations will
+        implement this function"""
+        raise NotImplementedError()
+
+    def getStatus(self, key: UUID) -> Optional[Dict[str, Any]]:
+        """Returns the last status set for the run with _id key, or None.
+        Note: Not all DB implementations will implement this function"""
+        raise NotImplementedError()
+
 
 class ArtifactMongoDB(ArtifactDB):
     """
     This is a mongodb database connector for storing Artifacts (as defined in
     artifact.py).
 
-    This database stores the data in three collections:
+    This database stores the data in four collections:
     - artifacts: This stores the json serialized Artifact class
     - files and chunks: These two collections store the large files required
       for some artifacts. Within the files collection, the _id is the
       UUID of the artifact.
+    - status: This stores the latest status of each run, as set by
+      putStatus.
     """
 
     def __init__(self, uri: str) -> None:
@@ -222,6 +242,17 @@ class ArtifactMongoDB(ArtifactDB):
         )
         yield from data
 
+    def putStatus(self, key: UUID, status: Dict[str, Any]) -> None:
+        """Set the status of the run with _id key in the status collection,
+        replacing any earlier status."""
+        self.db.status.replace_one(
+            {"_id": key}, dict(status, _id=key), upsert=True
+        )
+
+    def getStatus(self, key: UUID) -> Optional[Dict[str, Any]]:
+        """Returns the last status set for the run with _id key, or None."""
+        return self.db.status.find_one({"_id": key})
+
 
 class ArtifactFileDB(ArtifactDB):
     """
@@ -401,6 +432,441 @@ class ArtifactFileDB(ArtifactDB):
                 yield artifact
 
 
+class ArtifactJournalDB(ArtifactFileDB):
+    """
+    This is a file-based database where Artifacts (as defined in artifact.py)
+    are stored in an append-only journal, one JSON serialized artifact per
+    line.
+
+    Inserting an artifact appends a single line to the journal instead of
+    rewriting the whole database, and artifacts are indexed by hash, name
+    and type. The database can be shared by several processes: writers take
+    an exclusive lock on a lock file next to the journal, and before every
+    operation each process reads the lines that others have appended since.
+
+    Lines that cannot be used, i.e., those left partially written by a
+    process that died while appending or repeating an artifact that is
+    already in the journal, are skipped. The journal is compacted, i.e.,
+    rewritten without them, once they make up a quarter of it.
+
+    The statuses of runs set by putStatus are kept in a second journal,
+    next to the first one, in which later statuses replace earlier ones.
+
+    An ArtifactFileDB JSON file can be converted with migrateFileDB. Like
+    ArtifactFileDB, this database copies artifacts to the directory in the
+    environment variable GEM5ART_STORAGE if it is set.
+    """
+
+    # Compact the journal when there are more than this many unused lines
+    # and they are at least a quarter of the lines
+    _COMPACT_MIN_LINES = 64
+
+    _lock_file: Path
+    _inode: Optional[int]
+    _offset: int
+    _unused_lines: int
+    _name_uuid_map: Dict[str, List[str]]
+    _type_uuid_map: Dict[str, List[str]]
+    _indexes: Tuple[Tuple[str, Dict[str, List[str]]], ...]
+    _status_file: Path
+    _status_inode: Optional[int]
+    _status_offset: int
+    _status_lines: int
+    _status_map: Dict[str, Dict[str, Any]]
+
+    def _lock(self, operation: int) -> "_JournalLock":
+        return _JournalLock(self._lock_file, operation)
+
+    def _load_from_file(
+        self, json_file: Path
+    ) -> Tuple[Dict[str, Dict[str, str]], Dict[str, List[str]]]:
+        self._lock_file = json_file.with_name(json_file.name + ".lock")
+        self._status_file = json_file.with_name(json_file.name + ".status")
+        self._reset_statuses()
+        self._reset()
+        if json_file.exists():
+            with self._lock(fcntl.LOCK_SH):
+                self._read_journal()
+        return self._uuid_artifact_map, self._hash_uuid_map
+
+    def _reset(self) -> None:
+        self._uuid_artifact_map = {}
+        self._hash_uuid_map = {}
+        self._name_uuid_map = {}
+        self._type_uuid_map = {}
+        self._indexes = (
+            ("hash", self._hash_uuid_map),
+            ("name", self._name_uuid_map),
+            ("type", self._type_uuid_map),
+        )
+        self._inode = None
+        self._offset = 0
+        self._unused_lines = 0
+
+    def _index(self, artifact: Dict[str, Any]) -> None:
+        uuid_str = artifact["_id"]
+        self._uuid_artifact_map[uuid_str] = artifact
+        for attr, mapping in self._indexes:
+            value = artifact.get(attr)
+            if isinstance(value, str):
+                mapping.setdefault(value, []).append(uuid_str)
+
+    def _read_journal(self) -> None:
+        """Read the lines appended to the journal since it was last read.
+        Must be called with the lock held. Bytes after the last newline are
+        left for later, as they can only be a partially written line.
+        """
+        appended = _read_appended(self._json_file, self._inode, self._offset)
+        if appended is None:
+            self._reset()
+            return
+        inode, replaced, data = appended
+        if replaced:
+            self._reset()
+            self._inode = inode
+        lines = data.splitlines()
+        # The cyclic garbage collector would repeatedly scan the many dicts
+        # created while loading a large journal, and they are not garbage
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            try:
+                # Parsing the lines as one array is much faster than one by one
+                artifacts = json.loads(b"[" + b",".join(lines) + b"]")
+            except ValueError:
+                artifacts = [self._decode(line) for line in lines]
+            for artifact in artifacts:
+                if (
+                    not isinstance(artifact, dict)
+                    or not isinstance(artifact.get("_id"), str)
+                    or artifact["_id"] in self._uuid_artifact_map
+                ):
+                    self._unused_lines += 1
+                    continue
+                self._index(artifact)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._offset += len(data)
+
+    @staticmethod
+    def _decode(line: bytes) -> Any:
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def _refresh(self) -> None:
+        """Pick up the artifacts appended by other processes."""
+        try:
+            st = os.stat(self._json_file)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+            return
+        if st.st_ino == self._inode and st.st_size == self._offset:
+            return
+        with self._lock(fcntl.LOCK_SH):
+            self._read_journal()
+
+    def _encode(self, artifact: Dict[str, Any]) -> bytes:
+        line = json.dumps(
+            artifact,
+            cls=ArtifactFileDB.ArtifactEncoder,
+            separators=(",", ":"),
+        )
+        return line.encode() + b"\n"
+
+    def _save_to_file(self, json_file: Path) -> None:
+        """Rewrite the journal with only the indexed artifacts. Must be
+        called with the exclusive lock held.
+        """
+        tmp_file = json_file.with_name(f"{json_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            for artifact in self._uuid_artifact_map.values():
+                f.write(self._encode(artifact))
+        os.replace(tmp_file, json_file)
+        st = os.stat(json_file)
+        self._inode = st.st_ino
+        self._offset = st.st_size
+        self._unused_lines = 0
+
+    def compact(self) -> None:
+        """Rewrite the journal without the lines that are not used."""
+        with self._lock(fcntl.LOCK_EX):
+            self._read_journal()
+            self._save_to_file(self._json_file)
+
+    def _maybe_compact(self) -> None:
+        if (
+            self._unused_lines > self._COMPACT_MIN_LINES
+            and self._unused_lines * 3 > len(self._uuid_artifact_map)
+        ):
+            self._save_to_file(self._json_file)
+
+    def has_uuid(self, the_uuid: UUID) -> bool:
+        self._refresh()
+        return super().has_uuid(the_uuid)
+
+    def has_hash(self, the_hash: str) -> bool:
+        self._refresh()
+        return super().has_hash(the_hash)
+
+    def get_artifact_by_uuid(self, the_uuid: UUID) -> Iterable[Dict[str, str]]:
+        self._refresh()
+        return super().get_artifact_by_uuid(the_uuid)
+
+    def get_artifact_by_hash(self, the_hash: str) -> Iterable[Dict[str, str]]:
+        self._refresh()
+        return super().get_artifact_by_hash(the_hash)
+
+    def insert_artifact(
+        self,
+        the_uuid: UUID,
+        the_hash: str,
+        the_artifact: Dict[str, Union[str, UUID]],
+    ) -> bool:
+        """
+        Put the artifact to the database.
+
+        Return True if the artifact uuid does not exist in the database prior
+        to calling this function; return False otherwise.
+        """
+        return self.insert_artifacts([the_artifact]) == 1
+
+    def insert_artifacts(
+        self, artifacts: Iterable[Dict[str, Union[str, UUID]]]
+    ) -> int:
+        """
+        Append the artifacts that are not already in the database to the
+        journal with a single write. Returns the number of artifacts added.
+        """
+        with self._lock(fcntl.LOCK_EX):
+            self._read_journal()
+            lines = []
+            added = set()
+            for the_artifact in artifacts:
+                uuid_str = str(the_artifact["_id"])
+                if uuid_str in self._uuid_artifact_map or uuid_str in added:
+                    continue
+                added.add(uuid_str)
+                lines.append(self._encode(the_artifact))
+            if not lines:
+                return 0
+            with open(self._json_file, "ab") as f:
+                if f.tell() > self._offset:
+                    # Terminate a partially written line
+                    f.write(b"\n")
+                f.write(b"".join(lines))
+            # Index the artifacts as read back from the journal, as other
+            # processes will see them
+            self._read_journal()
+            self._maybe_compact()
+        return len(lines)
+
+    def _candidates(self, **attrs: str) -> Iterable[Dict[str, Any]]:
+        """The artifacts that may match attrs, using the smallest of the
+        indexes for the attributes in attrs.
+        """
+        self._refresh()
+        indexes: Dict[str, Optional[Dict[str, List[str]]]] = {
+            "_id": None,
+            "hash": self._hash_uuid_map,
+            "name": self._name_uuid_map,
+            "type": self._type_uuid_map,
+        }
+        best: Optional[List[str]] = None
+        for attr, value in attrs.items():
+            if attr not in indexes or not isinstance(value, (str, UUID)):
+                continue
+            mapping = indexes[attr]
+            if mapping is None:
+                uuids = (
+                    [str(value)]
+                    if str(value) in self._uuid_artifact_map
+                    else []
+                )
+            else:
+                uuids = mapping.get(str(value), [])
+            if best is None or len(uuids) < len(best):
+                best = uuids
+        if best is None:
+            return list(self._uuid_artifact_map.values())
+        return [self._uuid_artifact_map[uuid_str] for uuid_str in best]
+
+    @staticmethod
+    def _limit(
+        artifacts: Iterable[Dict[str, Any]], limit: int
+    ) -> Iterator[Dict[str, Any]]:
+        # As with MongoDB, a limit of 0 means no limit
+        if limit:
+            return itertools.islice(artifacts, limit)
+        return iter(artifacts)
+
+    def find_exact(
+        self, attr: Dict[str, str], limit: int
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Return all artifacts such that, for every yielded artifact,
+        and for every (k,v) in attr, the attribute `k` of the artifact has
+        the value of `v`.
+        """
+        yield from self._limit(
+            (
+                artifact
+                for artifact in self._candidates(**attr)
+                if attr.items() <= artifact.items()
+            ),
+            limit,
+        )
+
+    def searchByName(self, name: str, limit: int) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some name."""
+        yield from self._limit(self._candidates(name=name), limit)
+
+    def searchByType(self, typ: str, limit: int) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some type."""
+        yield from self._limit(self._candidates(type=typ), limit)
+
+    def searchByNameType(
+        self, name: str, typ: str, limit: int
+    ) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some name and type."""
+        yield from self.find_exact({"name": name, "type": typ}, limit)
+
+    def searchByLikeNameType(
+        self, name: str, typ: str, limit: int
+    ) -> Iterable[Dict[str, Any]]:
+        """Returns an iterable of all artifacts in the database that match
+        some type and a regex name."""
+        pattern = re.compile(name)
+        yield from self._limit(
+            (
+                artifact
+                for artifact in self._candidates(type=typ)
+                if pattern.search(artifact["name"])
+            ),
+            limit,
+        )
+
+    def _reset_statuses(self) -> None:
+        self._status_map = {}
+        self._status_inode = None
+        self._status_offset = 0
+        self._status_lines = 0
+
+    def _read_statuses(self) -> None:
+        """Read the statuses appended since they were last read. Must be
+        called with the lock held.
+        """
+        appended = _read_appended(
+            self._status_file, self._status_inode, self._status_offset
+        )
+        if appended is None:
+            self._reset_statuses()
+            return
+        inode, replaced, data = appended
+        if replaced:
+            self._reset_statuses()
+            self._status_inode = inode
+        for line in data.splitlines():
+            status = self._decode(line)
+            self._status_lines += 1
+            if isinstance(status, dict) and isinstance(status.get("_id"), str):
+                self._status_map[status["_id"]] = status
+        self._status_offset += len(data)
+
+    def putStatus(self, key: UUID, status: Dict[str, Any]) -> None:
+        """Set the status of the run with _id key, replacing any earlier
+        status. Statuses are appended to a second journal next to the
+        artifacts, which is compacted when most of its lines are replaced
+        statuses.
+        """
+        line = self._encode(dict(status, _id=key))
+        with self._lock(fcntl.LOCK_EX):
+            self._read_statuses()
+            with open(self._status_file, "ab") as f:
+                if f.tell() > self._status_offset:
+                    # Terminate a partially written line
+                    f.write(b"\n")
+                f.write(line)
+            self._read_statuses()
+            if (
+                self._status_lines
+                > 2 * len(self._status_map) + self._COMPACT_MIN_LINES
+            ):
+                tmp_file = self._status_file.with_name(
+                    f"{self._status_file.name}.{os.getpid()}.tmp"
+                )
+                with open(tmp_file, "wb") as f:
+                    for status in self._status_map.values():
+                        f.write(self._encode(status))
+                os.replace(tmp_file, self._status_file)
+                self._reset_statuses()
+                self._read_statuses()
+
+    def getStatus(self, key: UUID) -> Optional[Dict[str, Any]]:
+        """Returns the last status set for the run with _id key, or None."""
+        with self._lock(fcntl.LOCK_SH):
+            self._read_statuses()
+        return self._status_map.get(str(key))
+
+
+def _read_appended(
+    path: Path, inode: Optional[int], offset: int
+) -> Optional[Tuple[int, bool, bytes]]:
+    """Read the complete lines appended to the file at path since offset.
+
+    Returns None if the file does not exist. Otherwise, returns the inode
+    of the file, whether it was replaced since it was read at inode, in
+    which case the lines are read from its start, and the lines. Bytes
+    after the last newline are left for later, as they can only be a line
+    that is still being written, or was left partially written.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        st = os.fstat(f.fileno())
+        replaced = st.st_ino != inode or st.st_size < offset
+        if replaced:
+            offset = 0
+        f.seek(offset)
+        data = f.read()
+    return st.st_ino, replaced, data[: data.rfind(b"\n") + 1]
+
+
+class _JournalLock:
+    """An advisory lock on the lock file of an ArtifactJournalDB."""
+
+    def __init__(self, path: Path, operation: int) -> None:
+        self._path = path
+        self._operation = operation
+
+    def __enter__(self) -> None:
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(self._fd, self._operation)
+
+    def __exit__(self, *args: Any) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+def migrateFileDB(json_uri: str, journal_uri: str) -> int:
+    """Copy the artifacts of an ArtifactFileDB, e.g. "file://db.json", into
+    an ArtifactJournalDB, e.g. "journal://db.jsonl". Artifacts that are
+    already in the journal are skipped. Returns the number of artifacts
+    copied.
+    """
+    source = ArtifactFileDB(json_uri)
+    journal = ArtifactJournalDB(journal_uri)
+    return journal.insert_artifacts(source._uuid_artifact_map.values())
+
+
 _db = None
 
 if MONGO_SUPPORT:
@@ -408,7 +874,10 @@ if MONGO_SUPPORT:
 else:
     _default_uri = "file://db.json"
 
-_db_schemes: Dict[str, Type[ArtifactDB]] = {"file": ArtifactFileDB}
+_db_schemes: Dict[str, Type[ArtifactDB]] = {
+    "file": ArtifactFileDB,
+    "journal": ArtifactJournalDB,
+}
 if MONGO_SUPPORT:
     _db_schemes["mongodb"] = ArtifactMongoDB
 
@@ -425,6 +894,9 @@ def _getDBType(uri: str) -> Type[ArtifactDB]:
             A simple flat file database with optional storage for the binary
             artifacts. The filepath is where the json file is stored and the
             data storage can be specified with GEM5ART_STORAGE
+        **ArtifactJournalDB**: journal://...
+            Like ArtifactFileDB, but the filepath is an append-only journal
+            with one artifact per line, which can be shared by processes.
     """
     result = urlparse(uri)
     if result.scheme in _db_schemes:
@@ -0,0 +1,213 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All Rights Reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests for ArtifactJournalDB"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from uuid import (
+    UUID,
+    uuid4,
+)
+
+from gem5art.artifact._artifactdb import (
+    ArtifactFileDB,
+    ArtifactJournalDB,
+    getDBConnection,
+    migrateFileDB,
+)
+
+
+def _make_artifact(name, typ="text", the_hash=None):
+    the_uuid = uuid4()
+    return {
+        "_id": the_uuid,
+        "name": name,
+        "type": typ,
+        "hash": the_hash or the_uuid.hex,
+        "inputs": [],
+    }
+
+
+def _insert_many(uri, prefix, count):
+    db = ArtifactJournalDB(uri)
+    for i in range(count):
+        artifact = _make_artifact(f"{prefix}-{i}")
+        db.put(artifact["_id"], artifact)
+
+
+class TestArtifactJournalDB(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "db.jsonl"
+        self.uri = f"journal://{self.path}"
+        self.db = ArtifactJournalDB(self.uri)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_connection(self):
+        self.assertIsInstance(getDBConnection(self.uri), ArtifactJournalDB)
+
+    def test_put_get(self):
+        artifact = _make_artifact("test-artifact")
+        self.db.put(artifact["_id"], artifact)
+        self.assertIn(artifact["_id"], self.db)
+        self.assertIn(artifact["hash"], self.db)
+        self.assertEqual(self.db.get(artifact["_id"])["name"], "test-artifact")
+
+        # Each artifact is a line of the journal
+        with open(self.path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(UUID(json.loads(lines[0])["_id"]), artifact["_id"])
+
+        reopened = ArtifactJournalDB(self.uri)
+        self.assertEqual(
+            reopened.get(artifact["hash"])["name"], "test-artifact"
+        )
+
+    def test_duplicate(self):
+        artifact = _make_artifact("test-artifact")
+        self.assertTrue(
+            self.db.insert_artifact(
+                artifact["_id"], artifact["hash"], artifact
+            )
+        )
+        self.assertFalse(
+            self.db.insert_artifact(
+                artifact["_id"], artifact["hash"], artifact
+            )
+        )
+        self.assertEqual(len(self.path.read_text().splitlines()), 1)
+
+    def test_search(self):
+        artifacts = [
+            _make_artifact("gem5", "gem5 binary"),
+            _make_artifact("gem5", "git repo"),
+            _make_artifact("linux-5.4", "kernel"),
+            _make_artifact("linux-4.19", "kernel"),
+        ]
+        self.assertEqual(self.db.insert_artifacts(artifacts), 4)
+        self.assertEqual(len(list(self.db.searchByName("gem5", 0))), 2)
+        self.assertEqual(len(list(self.db.searchByName("gem5", 1))), 1)
+        self.assertEqual(len(list(self.db.searchByType("kernel", 0))), 2)
+        self.assertEqual(
+            [
+                a["type"]
+                for a in self.db.searchByNameType("gem5", "git repo", 0)
+            ],
+            ["git repo"],
+        )
+        self.assertEqual(
+            [
+                a["name"]
+                for a in self.db.searchByLikeNameType("linux-5", "kernel", 0)
+            ],
+            ["linux-5.4"],
+        )
+        self.assertEqual(
+            len(list(self.db.find_exact({"name": "gem5", "inputs": []}, 0))),
+            2,
+        )
+        self.assertEqual(
+            len(list(self.db.find_exact({"name": "nothing"}, 0))), 0
+        )
+
+    def test_shared(self):
+        other = ArtifactJournalDB(self.uri)
+        artifact = _make_artifact("test-artifact")
+        other.put(artifact["_id"], artifact)
+        self.assertIn(artifact["_id"], self.db)
+        self.assertEqual(
+            len(list(self.db.searchByName("test-artifact", 0))), 1
+        )
+
+    def test_processes(self):
+        processes = [
+            multiprocessing.Process(
+                target=_insert_many, args=(self.uri, f"p{i}", 50)
+            )
+            for i in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(len(list(self.db.find_exact({}, 0))), 200)
+        self.assertEqual(len(self.path.read_text().splitlines()), 200)
+
+    def test_partial_line(self):
+        first = _make_artifact("first")
+        self.db.put(first["_id"], first)
+        with open(self.path, "a") as f:
+            f.write('{"_id": "partial')
+        second = _make_artifact("second")
+        self.db.put(second["_id"], second)
+
+        reopened = ArtifactJournalDB(self.uri)
+        self.assertIn(first["_id"], reopened)
+        self.assertIn(second["_id"], reopened)
+        self.assertEqual(len(self.path.read_text().splitlines()), 3)
+
+        reopened.compact()
+        self.assertEqual(len(self.path.read_text().splitlines()), 2)
+        self.assertIn(second["_id"], self.db)
+        self.assertEqual(len(list(self.db.find_exact({}, 0))), 2)
+
+    def test_status(self):
+        the_uuid = uuid4()
+        self.assertIsNone(self.db.getStatus(the_uuid))
+        for i in range(200):
+            self.db.putStatus(the_uuid, {"status": "Running", "beat": i})
+        other = ArtifactJournalDB(self.uri)
+        self.assertEqual(other.getStatus(the_uuid)["beat"], 199)
+        self.db.putStatus(the_uuid, {"status": "Finished"})
+        self.assertEqual(other.getStatus(the_uuid)["status"], "Finished")
+        # Replaced statuses are compacted away
+        status_file = Path(f"{self.path}.status")
+        self.assertLess(len(status_file.read_text().splitlines()), 100)
+
+    def test_migrate(self):
+        json_file = Path(self.tmpdir.name) / "db.json"
+        file_db = ArtifactFileDB(f"file://{json_file}")
+        artifacts = [_make_artifact(f"artifact-{i}") for i in range(3)]
+        for artifact in artifacts:
+            file_db.put(artifact["_id"], artifact)
+
+        self.assertEqual(migrateFileDB(f"file://{json_file}", self.uri), 3)
+        self.assertEqual(migrateFileDB(f"file://{json_file}", self.uri), 0)
+        for artifact in artifacts:
+            self.assertEqual(
+                self.db.get(artifact["hash"])["name"], artifact["name"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
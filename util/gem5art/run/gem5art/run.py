@@ -32,22 +32,30 @@ This class works closely with the artifact module to ensure that the gem5
 experiment is reproducible and the output is saved to the database.
 """
 
+import asyncio
 import hashlib
 import json
 import os
 import signal
-import subprocess
+import threading
 import time
+import traceback
 import zipfile
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
 from pathlib import Path
 from typing import (
     Any,
     Callable,
+    Coroutine,
     Dict,
     Iterable,
     List,
     Optional,
     Tuple,
+    TypeVar,
     Union,
 )
 from uuid import (
@@ -59,6 +67,67 @@ from gem5art import artifact
 from gem5art.artifact import Artifact
 from gem5art.artifact._artifactdb import ArtifactDB
 
+# Seconds between the checks of a running gem5 instance, e.g., for a kernel
+# panic, and the heartbeats it sends to the database.
+HEARTBEAT_INTERVAL = 5.0
+
+T = TypeVar("T")
+
+
+async def _call(
+    executor: Optional[Executor], func: Callable[..., T], *args: Any
+) -> T:
+    """Call func in a thread of executor, or directly if it is None."""
+    if executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func, *args)
+
+
+def _runCoroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run coro to completion with asyncio.run and return its result.
+
+    asyncio.run cannot be called from a thread with a running event loop
+    (e.g., in a Jupyter notebook), so in that case coro is run in a new
+    thread, with its own event loop, and this blocks until it is done.
+    SIGTERM is not handled then, see _StopOnSigterm."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class _StopOnSigterm:
+    """Sets an asyncio event when this process gets SIGTERM. This needs to
+    be entered in the event loop. Signal handlers can only be set on the
+    main thread, so on any other thread this does nothing."""
+
+    def __init__(self, stop: asyncio.Event) -> None:
+        self._stop = stop
+        self._handling = False
+
+    def __enter__(self) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            return
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, self._stop.set)
+        self._handling = True
+
+    def __exit__(self, *args: Any) -> None:
+        if self._handling:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGTERM)
+            self._handling = False
+
+
+def _kill(proc: asyncio.subprocess.Process) -> None:
+    try:
+        proc.kill()
+    except ProcessLookupError:
+        # It has already exited
+        pass
+
 
 class gem5Run:
     """
@@ -77,6 +146,8 @@ class gem5Run:
     params: Tuple[str, ...]
     timeout: int
     check_failure: Callable[["gem5Run"], bool]
+    cpus: int
+    memory: int
 
     gem5_name: str
     script_name: str
@@ -120,6 +191,8 @@ class gem5Run:
         params: Tuple[str, ...],
         timeout: int,
         check_failure: Callable[["gem5Run"], bool],
+        cpus: int,
+        memory: int,
     ) -> "gem5Run":
         """
         Shared code between SE and FS when creating a run object.
@@ -133,6 +206,8 @@ class gem5Run:
         run.run_script_git_artifact = run_script_git_artifact
         run.params = params
         run.timeout = timeout
+        run.cpus = cpus
+        run.memory = memory
 
         # Note: Mypy doesn't support monkey patching like this
         run.check_failure = check_failure  # type: ignore
@@ -176,6 +251,8 @@ class gem5Run:
         *params: str,
         timeout: int = 60 * 15,
         check_failure: Callable[["gem5Run"], bool] = lambda run: False,
+        cpus: int = 1,
+        memory: int = 0,
     ) -> "gem5Run":
         """
         name is the name of the run. The name is not necessarily unique. The
@@ -190,6 +267,10 @@ class gem5Run:
         parameters will be passed in order to the gem5 run script.
         timeout is the time in seconds to run the subprocess before killing it.
 
+        cpus and memory (in bytes) are the number of host cores and amount of
+        host memory the run needs. RunSupervisor uses them to decide how many
+        runs fit on the host at once.
+
         Note: When instantiating this class for the first time, it will create
         a file `info.json` in the outdir which contains a serialized version
         of this class.
@@ -205,6 +286,8 @@ class gem5Run:
             params,
             timeout,
             check_failure,
+            cpus,
+            memory,
         )
 
         run.artifacts = [
@@ -247,6 +330,8 @@ class gem5Run:
         *params: str,
         timeout: int = 60 * 15,
         check_failure: Callable[["gem5Run"], bool] = lambda run: False,
+        cpus: int = 1,
+        memory: int = 0,
     ) -> "gem5Run":
         """
         name is the name of the run. The name is not necessarily unique. The
@@ -261,6 +346,10 @@ class gem5Run:
         periodically (e.g., every 10 seconds) to check the health of the
         simulation. When it returns True, the simulation will be killed
 
+        cpus and memory (in bytes) are the number of host cores and amount of
+        host memory the run needs. RunSupervisor uses them to decide how many
+        runs fit on the host at once.
+
         Note: When instantiating this class for the first time, it will create
         a file `info.json` in the outdir which contains a serialized version
         of this class.
@@ -275,6 +364,8 @@ class gem5Run:
             params,
             timeout,
             check_failure,
+            cpus,
+            memory,
         )
         run.linux_binary_path = Path(linux_binary_artifact.path)
         run.disk_image_path = Path(disk_image_artifact.path)
@@ -457,81 +548,157 @@ class gem5Run:
         d = self._convertForJson(self._getSerializable())
         return json.dumps(d)
 
+    def _getStatus(self) -> Dict[str, Any]:
+        """Returns the status of this run, as sent to the database while it
+        is running."""
+        return {
+            "name": self.name,
+            "hash": self.hash,
+            "status": self.status,
+            "running": self.running,
+            "pid": self.pid,
+            "task_id": self.task_id,
+            "start_time": self.start_time,
+            "heartbeat": time.time(),
+            "kill_reason": self.kill_reason,
+            "return_code": self.return_code,
+        }
+
+    async def _update(
+        self, db: ArtifactDB, db_executor: Optional[Executor], stream: bool
+    ) -> bool:
+        """Dump the json info and, if stream is True, send the status to the
+        database. Returns False if the database does not support statuses,
+        so that the following updates are not sent, and stream otherwise."""
+        self.dumpJson("info.json")
+        if not stream:
+            return False
+        try:
+            await _call(db_executor, db.putStatus, self._id, self._getStatus())
+        except NotImplementedError:
+            return False
+        return True
+
     def _run(self, task: Any = None, cwd: str = ".") -> None:
         """Actually run the test.
 
-        Calls Popen with the command to fork a new process.
-        Then, this function polls the process every 5 seconds to check if it
-        has finished or not. Each time it checks, it dumps the json info so
-        other applications can poll those files.
+        Starts the gem5 command in a new process and waits for it to finish,
+        killing it if it runs for longer than the timeout. Every
+        HEARTBEAT_INTERVAL seconds while it runs, this function checks for a
+        kernel panic or user-defined failure, dumps the json info so other
+        applications can poll those files, and sends the status of the run to
+        the database.
 
         task is the celery task that is running this gem5 instance.
 
         cwd is the directory to change to before running. This allows a server
         process to run in a different directory than the running process. Note
         that only the spawned process runs in the new directory.
+
+        This may be called from within a running event loop, in which case
+        the run is supervised from a new thread and SIGTERM is not handled.
+        """
+        _runCoroutine(self._runStandalone(task, cwd))
+
+    async def _runStandalone(self, task: Any, cwd: str) -> None:
+        # This makes it so if you term *this* process, it will actually kill
+        # the subprocess and then this process will die.
+        stop = asyncio.Event()
+        with _StopOnSigterm(stop):
+            await self._arun(task, cwd, stop)
+
+    async def _arun(
+        self,
+        task: Any = None,
+        cwd: str = ".",
+        stop: Optional[asyncio.Event] = None,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+        db_executor: Optional[Executor] = None,
+        io_executor: Optional[Executor] = None,
+    ) -> None:
+        """The coroutine that runs the test, see _run.
+
+        The gem5 instance is killed when stop is set. The database is only
+        used from db_executor, and the artifacts are checked and the results
+        zipped in io_executor, so that the event loop can supervise other
+        runs meanwhile. Both default to calling directly.
         """
         # Connect to the database
         db = artifact.getDBConnection()
+        stream = True
 
         self.status = "Begin run"
-        self.dumpJson("info.json")
+        stream = await self._update(db, db_executor, stream)
 
-        if not self.checkArtifacts(cwd):
-            self.dumpJson("info.json")
+        if not await _call(io_executor, self.checkArtifacts, cwd):
+            stream = await self._update(db, db_executor, stream)
             return
 
         self.status = "Spawning"
 
         self.start_time = time.time()
         self.task_id = task.request.id if task else None
-        self.dumpJson("info.json")
+        stream = await self._update(db, db_executor, stream)
 
         # Start running the gem5 command
-        proc = subprocess.Popen(self.command, cwd=cwd)
-
-        # Register handler in case this process is killed while the gem5
-        # instance is running. Note: there's a bit of a race condition here,
-        # but hopefully it's not a big deal
-        def handler(signum, frame):
-            proc.kill()
-            self.kill_reason = "sigterm"
-            self.dumpJson("info.json")
-            # Note: We'll fall out of the while loop after this.
-
-        # This makes it so if you term *this* process, it will actually kill
-        # the subprocess and then this process will die.
-        signal.signal(signal.SIGTERM, handler)
-
-        # Do this until the subprocess is done (successfully or not)
-        while proc.poll() is None:
-            self.status = "Running"
-            # Still running
-            self.current_time = time.time()
-            self.pid = proc.pid
-            self.running = True
-
-            if self.current_time - self.start_time > self.timeout:
-                proc.kill()
-                self.kill_reason = "timeout"
-
-            if self.checkKernelPanic():
-                proc.kill()
-                self.kill_reason = "kernel panic"
-
-            # Assigning a function/lambda to an object variable does not make
-            # the function/lambda become a bound one. Therefore, the
-            # user-defined function must pass `self` in.
-            # Here, mypy classifies self.check_failure() as a bound function,
-            # so we tell mypy to ignore it./
-            if self.check_failure(self):  # type: ignore
-                proc.kill()
-                self.kill_reason = "User defined kill"
-
-            self.dumpJson("info.json")
-
-            # Check again in five seconds
-            time.sleep(5)
+        proc = await asyncio.create_subprocess_exec(*self.command, cwd=cwd)
+        self.status = "Running"
+        self.pid = proc.pid
+        self.running = True
+
+        # Wait for the subprocess to exit, the stop event, the timeout, or the
+        # next heartbeat, whichever comes first
+        exited = asyncio.ensure_future(proc.wait())
+        stopped = asyncio.ensure_future((stop or asyncio.Event()).wait())
+        deadline = self.start_time + self.timeout
+        killed = False
+        try:
+            while True:
+                wait = heartbeat
+                if not killed:
+                    wait = max(0.0, min(wait, deadline - time.time()))
+                await asyncio.wait(
+                    {exited, stopped},
+                    timeout=wait,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if exited.done():
+                    break
+
+                # Still running
+                self.current_time = time.time()
+
+                if stopped.done() and not killed:
+                    _kill(proc)
+                    killed = True
+                    self.kill_reason = "sigterm"
+
+                if self.current_time >= deadline and not killed:
+                    _kill(proc)
+                    killed = True
+                    self.kill_reason = "timeout"
+
+                if self.checkKernelPanic():
+                    _kill(proc)
+                    killed = True
+                    self.kill_reason = "kernel panic"
+
+                # Assigning a function/lambda to an object variable does not
+                # make the function/lambda become a bound one. Therefore, the
+                # user-defined function must pass `self` in.
+                # Here, mypy classifies self.check_failure() as a bound
+                # function, so we tell mypy to ignore it.
+                if self.check_failure(self):  # type: ignore
+                    _kill(proc)
+                    killed = True
+                    self.kill_reason = "User defined kill"
+
+                stream = await self._update(db, db_executor, stream)
+        finally:
+            stopped.cancel()
+            if not exited.done():
+                _kill(proc)
+                await exited
 
         print(f"Done running {' '.join(self.command)}")
 
@@ -545,22 +712,26 @@ class gem5Run:
         else:
             self.status = "Failed"
 
-        self.dumpJson("info.json")
+        stream = await self._update(db, db_executor, stream)
 
-        self.saveResults()
+        await _call(io_executor, self._zipResults)
+        await _call(db_executor, self._registerResults)
 
         # Store current gem5 run in the database
-        db.put(self._id, self._getSerializable())
+        await _call(db_executor, db.put, self._id, self._getSerializable())
+        stream = await self._update(db, db_executor, stream)
 
         print(f"Done storing the results of {' '.join(self.command)}")
 
     def run(self, task: Any = None, cwd: str = ".") -> None:
         """Actually run the test.
 
-        Calls Popen with the command to fork a new process.
-        Then, this function polls the process every 5 seconds to check if it
-        has finished or not. Each time it checks, it dumps the json info so
-        other applications can poll those files.
+        Starts the gem5 command in a new process and waits for it to finish,
+        killing it if it runs for longer than the timeout. Every
+        HEARTBEAT_INTERVAL seconds while it runs, this function checks for a
+        kernel panic or user-defined failure, dumps the json info so other
+        applications can poll those files, and sends the status of the run to
+        the database.
 
         task is the celery task that is running this gem5 instance.
 
@@ -578,10 +749,12 @@ class gem5Run:
     def rerun(self, task: Any = None, cwd: str = ".") -> None:
         """Rerun the test.
 
-        Calls Popen with the command to fork a new process.
-        Then, this function polls the process every 5 seconds to check if it
-        has finished or not. Each time it checks, it dumps the json info so
-        other applications can poll those files.
+        Starts the gem5 command in a new process and waits for it to finish,
+        killing it if it runs for longer than the timeout. Every
+        HEARTBEAT_INTERVAL seconds while it runs, this function checks for a
+        kernel panic or user-defined failure, dumps the json info so other
+        applications can poll those files, and sends the status of the run to
+        the database.
 
         task is the celery task that is running this gem5 instance.
 
@@ -595,7 +768,10 @@ class gem5Run:
     def saveResults(self) -> None:
         """Zip up the output directory and store the results in the
         database."""
+        self._zipResults()
+        self._registerResults()
 
+    def _zipResults(self) -> None:
         with zipfile.ZipFile(
             self.outdir / "results.zip", "w", zipfile.ZIP_DEFLATED
         ) as zipf:
@@ -604,6 +780,7 @@ class gem5Run:
                     continue
                 zipf.write(path, path.relative_to(self.outdir.parent))
 
+    def _registerResults(self) -> None:
         self.results = Artifact.registerArtifact(
             command=f"zip results.zip -r {self.outdir}",
             name=self.name,
@@ -617,6 +794,131 @@ class gem5Run:
         return self.string + " -> " + self.status
 
 
+def _hostMemory() -> int:
+    """Returns the amount of memory of this host in bytes, or 0 if it is
+    not known."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return 0
+
+
+class RunSupervisor:
+    """
+    Runs many gem5Run objects at once on this host, supervising all of them
+    from one asyncio event loop.
+
+    Rather than running a fixed number of runs at a time, the runs are
+    started in order whenever enough of the host's cores and memory are free
+    for them, according to their cpus and memory. Runs that do not fit yet
+    wait, but later runs that do fit are started meanwhile. A run that needs
+    more than the whole host is run when nothing else is running.
+
+    The supervisor waits for the gem5 instances to exit or time out without
+    polling. While they run, each run sends heartbeats with its status to
+    the database every heartbeat seconds. The artifacts of the runs are
+    checked and their results zipped in a pool of io_threads threads, and
+    the database is used from a single thread of its own, so neither blocks
+    the supervision of the other runs.
+
+    If this process gets SIGTERM, all running gem5 instances are killed and
+    no more runs are started.
+    """
+
+    def __init__(
+        self,
+        max_cpus: Optional[int] = None,
+        max_memory: Optional[int] = None,
+        heartbeat: float = HEARTBEAT_INTERVAL,
+        cwd: str = ".",
+        io_threads: Optional[int] = None,
+    ) -> None:
+        """max_cpus and max_memory (in bytes) are the cores and memory of
+        the host that the runs can use, all of them by default.
+
+        cwd is the directory the gem5 instances run in, see gem5Run.run.
+        """
+        self.max_cpus = max_cpus or os.cpu_count() or 1
+        self.max_memory = max_memory or _hostMemory() or 1 << 62
+        self.heartbeat = heartbeat
+        self.cwd = cwd
+        self.io_threads = io_threads
+
+    def run(self, runs: Iterable[gem5Run], rerun: bool = False) -> None:
+        """Run all of the runs and return when they are done. Unless rerun
+        is True, runs that are already in the database are skipped, as with
+        gem5Run.run.
+
+        If called from within a running event loop, the runs are supervised
+        from a new thread and SIGTERM is not handled. Await arun instead to
+        supervise them from the running loop."""
+        _runCoroutine(self.arun(runs, rerun))
+
+    async def arun(self, runs: Iterable[gem5Run], rerun: bool = False) -> None:
+        """The coroutine that runs all of the runs, see run."""
+        db = artifact.getDBConnection()
+        pending = list(runs)
+        running: Dict["asyncio.Future[None]", Tuple[gem5Run, int, int]] = {}
+        free_cpus = self.max_cpus
+        free_memory = self.max_memory
+        errors: List[BaseException] = []
+        stop = asyncio.Event()
+
+        with ThreadPoolExecutor(1) as db_executor, ThreadPoolExecutor(
+            self.io_threads
+        ) as io_executor, _StopOnSigterm(stop):
+            while running or (pending and not stop.is_set()):
+                waiting = []
+                for run in pending:
+                    if stop.is_set():
+                        break
+                    # Runs that need more than the host get all of it
+                    cpus = min(getattr(run, "cpus", 1), self.max_cpus)
+                    memory = min(getattr(run, "memory", 0), self.max_memory)
+                    if cpus > free_cpus or memory > free_memory:
+                        waiting.append(run)
+                        continue
+                    if not rerun and await _call(
+                        db_executor, db.__contains__, run.hash
+                    ):
+                        print(f"Error: Have already run {run.command}.")
+                        continue
+                    free_cpus -= cpus
+                    free_memory -= memory
+                    future = asyncio.ensure_future(
+                        run._arun(
+                            None,
+                            self.cwd,
+                            stop,
+                            self.heartbeat,
+                            db_executor,
+                            io_executor,
+                        )
+                    )
+                    running[future] = (run, cpus, memory)
+                pending = waiting
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    run, cpus, memory = running.pop(future)
+                    free_cpus += cpus
+                    free_memory += memory
+                    error = future.exception()
+                    if error is not None:
+                        print(f"Error while running {run.command}:")
+                        traceback.print_exception(
+                            type(error), error, error.__traceback__
+                        )
+                        errors.append(error)
+
+        if errors:
+            raise errors[0]
+
+
 def getRuns(
     db: ArtifactDB, fs_only: bool = False, limit: int = 0
 ) -> Iterable[gem5Run]:
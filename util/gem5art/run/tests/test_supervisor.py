@@ -0,0 +1,152 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All Rights Reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Tests for RunSupervisor"""
+
+import asyncio
+import os
+import stat
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from uuid import uuid4
+
+from gem5art.artifact import artifact
+from gem5art.artifact._artifactdb import getDBConnection
+from gem5art.run import (
+    RunSupervisor,
+    gem5Run,
+)
+
+# Stands in for gem5: logs when it starts and ends, and sleeps for as long
+# as its last argument
+_FAKE_GEM5 = """#!/bin/sh
+echo start >> "$LOG"
+sleep "$(eval echo \\${$#})"
+echo end >> "$LOG"
+"""
+
+
+class TestRunSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name)
+        self.log = self.path / "log"
+        os.environ["LOG"] = str(self.log)
+        self.db = getDBConnection(f"journal://{self.path / 'db.jsonl'}")
+
+        gem5 = self.path / "gem5.opt"
+        gem5.write_text(_FAKE_GEM5)
+        gem5.chmod(gem5.stat().st_mode | stat.S_IXUSR)
+        self.artifact = artifact.Artifact(
+            {
+                "_id": uuid4(),
+                "name": "test-gem5",
+                "type": "test-binary",
+                "documentation": "This is a description of gem5 artifact",
+                "command": "scons build/X86/gem5.opt",
+                "path": str(gem5),
+                "hash": artifact.getHash(gem5),
+                "git": {},
+                "cwd": "/",
+                "inputs": [],
+            }
+        )
+
+    def tearDown(self):
+        del os.environ["LOG"]
+        self.tmpdir.cleanup()
+
+    def _createRun(self, i, seconds, **kwargs):
+        return gem5Run.createSERun(
+            f"test run {i}",
+            "run_test.py",
+            str(self.path / f"out{i}"),
+            self.artifact,
+            self.artifact,
+            self.artifact,
+            str(i),
+            str(seconds),
+            **kwargs,
+        )
+
+    def _maxRunning(self):
+        running = 0
+        max_running = 0
+        for line in self.log.read_text().split():
+            running += 1 if line == "start" else -1
+            max_running = max(max_running, running)
+        return max_running
+
+    def test_cpus(self):
+        runs = [self._createRun(i, 0.2, cpus=2) for i in range(6)]
+        RunSupervisor(max_cpus=4, heartbeat=0.1).run(runs)
+        self.assertEqual(self._maxRunning(), 2)
+        for run in runs:
+            self.assertEqual(run.status, "Finished")
+            self.assertIn(run.hash, self.db)
+            self.assertEqual(self.db.getStatus(run._id)["status"], "Finished")
+            self.assertTrue((run.outdir / "results.zip").exists())
+
+    def test_memory(self):
+        runs = [self._createRun(0, 0.2, memory=3 << 30)]
+        runs += [self._createRun(i, 0.2, memory=1 << 30) for i in (1, 2)]
+        RunSupervisor(max_cpus=8, max_memory=4 << 30, heartbeat=0.1).run(runs)
+        self.assertEqual(self._maxRunning(), 2)
+
+    def test_too_big(self):
+        runs = [self._createRun(i, 0.1, cpus=16) for i in range(2)]
+        RunSupervisor(max_cpus=4, heartbeat=0.1).run(runs)
+        self.assertEqual(self._maxRunning(), 1)
+        self.assertEqual([run.status for run in runs], ["Finished"] * 2)
+
+    def test_timeout(self):
+        run = self._createRun(0, 30, timeout=1)
+        start = time.time()
+        RunSupervisor(heartbeat=10).run([run])
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(run.kill_reason, "timeout")
+        self.assertEqual(run.status, "Failed")
+
+    def test_already_run(self):
+        run = self._createRun(0, 0)
+        RunSupervisor().run([run])
+        RunSupervisor().run([run])
+        self.assertEqual(self.log.read_text().split(), ["start", "end"])
+
+    def test_running_loop(self):
+        async def main():
+            RunSupervisor(heartbeat=0.1).run([self._createRun(0, 0)])
+            runs = [self._createRun(i, 0) for i in (1, 2)]
+            await RunSupervisor(heartbeat=0.1).arun(runs[:1])
+            runs[1].run()
+
+        asyncio.run(main())
+        self.assertEqual(self.log.read_text().split(), ["start", "end"] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,3 +64,19 @@ def run_job_pool(job_list, num_parallel_jobs=mp.cpu_count() // 2):
     pool.close()
     pool.join()
     print(f"All jobs done running!")
+
+
+def run_job_supervisor(job_list, max_cpus=None, max_memory=None):
+    """
+    Runs gem5 jobs in parallel from a single event loop when Celery is not
+    used. Jobs are packed by the cpus and memory they were created with so
+    that no more than max_cpus cores and max_memory bytes are in use at
+    once (defaults to the size of this host).
+    Receives a list of run objects created by the launch script
+    """
+    # gem5art-run is not a dependency of this package, only of the launch
+    # scripts that create the runs.
+    from gem5art.run import RunSupervisor
+
+    RunSupervisor(max_cpus, max_memory).run(job_list)
+    print(f"All jobs done running!")
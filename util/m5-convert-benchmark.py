@@ -0,0 +1,160 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+A micro-benchmark of the parse caches of ``m5.util.convert``.
+
+The unit strings of the params of a many-core system are converted, as the
+param assignments of such a config would convert them: for each core, the
+clocks, latencies, and sizes of its caches, and for each memory channel,
+its size, bandwidth, and timings. The time taken with the parse caches is
+compared to the time taken by the uncached converters.
+
+Usage
+-----
+
+```sh
+build/ALL/gem5.opt util/m5-convert-benchmark.py [--cores 256] \
+    [--channels 16] [--repeat 5]
+# Or, as m5.util.convert does not depend on the gem5 binary:
+PYTHONPATH=src/python python3 util/m5-convert-benchmark.py
+```
+"""
+
+import argparse
+import time
+from typing import (
+    Callable,
+    List,
+    Tuple,
+)
+
+from m5.util import convert
+
+# The (converter, value) of the params of one core, and its private caches.
+_CORE_PARAMS = [
+    ("toFrequency", "3GHz"),
+    ("toLatency", "1ns"),
+    ("anyToLatency", "3GHz"),
+    ("toMemorySize", "32KiB"),
+    ("toMemorySize", "48KiB"),
+    ("toMemorySize", "1MiB"),
+    ("toMemorySize", "64B"),
+    ("toInteger", "8"),
+    ("toInteger", "16"),
+    ("toInteger", "4"),
+    ("toVoltage", "1V"),
+    ("toBool", "True"),
+    ("toMemoryBandwidth", "64GiB/s"),
+]
+
+# The (converter, value) of the params of one memory channel.
+_CHANNEL_PARAMS = [
+    ("toMemorySize", "8GiB"),
+    ("toMemoryBandwidth", "32GiB/s"),
+    ("toMemorySize", "1KiB"),
+    ("toLatency", "13.75ns"),
+    ("toLatency", "7.5ns"),
+    ("toLatency", "3.75ns"),
+    ("toLatency", "64ms"),
+    ("toLatency", "350ns"),
+    ("toFrequency", "1600MHz"),
+    ("toNetworkBandwidth", "10Gbps"),
+]
+
+
+def get_conversions(cores: int, channels: int) -> List[Tuple[str, str]]:
+    """Returns the (converter, value) of each param of a system with
+    ``cores`` cores and ``channels`` memory channels.
+    """
+    return _CORE_PARAMS * cores + _CHANNEL_PARAMS * channels
+
+
+def timed(
+    conversions: List[Tuple[str, str]],
+    repeat: int,
+    get_converter: Callable[[str], Callable],
+) -> float:
+    """Returns the best time, in seconds, taken to make all of the
+    conversions. The parse caches are cleared before each repetition, so
+    that each config is converted as if by a new gem5 process.
+    """
+    times = []
+    for _ in range(repeat):
+        convert.clear_parse_caches()
+        converters = [
+            (get_converter(name), value) for name, value in conversions
+        ]
+        start = time.perf_counter()
+        for converter, value in converters:
+            converter(value)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def run(cores: int, channels: int, repeat: int) -> None:
+    conversions = get_conversions(cores, channels)
+    uncached = timed(
+        conversions,
+        repeat,
+        lambda name: getattr(convert, name).__wrapped__,
+    )
+    cached = timed(conversions, repeat, lambda name: getattr(convert, name))
+    print(
+        f"{len(conversions)} conversions of "
+        f"{len({value for _, value in conversions})} distinct values"
+    )
+    print(f"{'uncached':<10} {uncached * 1000:10.2f} ms")
+    print(
+        f"{'cached':<10} {cached * 1000:10.2f} ms "
+        f"({uncached / cached:.1f}x faster)"
+    )
+
+
+if __name__ in ("__main__", "__m5_main__"):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the parse caches of m5.util.convert."
+    )
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=256,
+        help="The number of cores in the synthetic system.",
+    )
+    parser.add_argument(
+        "--channels",
+        type=int,
+        default=16,
+        help="The number of memory channels in the synthetic system.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of times the conversions are timed.",
+    )
+    args = parser.parse_args()
+    run(args.cores, args.channels, args.repeat)
@@ -0,0 +1,121 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+A benchmark of the startup time of gem5 with, and without, lazy imports of
+``m5.objects`` (the ``M5_LAZY_OBJECTS`` environment variable).
+
+A gem5 binary is repeatedly run with a trivial config (``-c "pass"`` by
+default, or the given config script) in each mode, and the best, and median,
+wallclock times are reported.
+
+Usage
+-----
+
+```sh
+python3 util/m5-objects-import-benchmark.py build/ALL/gem5.opt [--repeat 10]
+python3 util/m5-objects-import-benchmark.py build/ALL/gem5.opt \
+    --config configs/example/gem5_library/arm-hello.py
+```
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import (
+    List,
+    Optional,
+)
+
+
+def time_gem5(
+    gem5: str, config: Optional[str], lazy: bool, repeat: int
+) -> List[float]:
+    """Returns the wallclock time of each of ``repeat`` runs of gem5."""
+    env = dict(os.environ, M5_LAZY_OBJECTS="true" if lazy else "false")
+
+    times = []
+    with tempfile.TemporaryDirectory() as outdir:
+        command = [gem5, "-q", "--outdir", outdir]
+        command += [config] if config else ["-c", "pass"]
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run(
+                command,
+                env=env,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def run(gem5: str, config: Optional[str], repeat: int) -> None:
+    results = {}
+    for lazy in (False, True):
+        mode = "lazy" if lazy else "eager"
+        times = time_gem5(gem5, config, lazy, repeat)
+        results[mode] = statistics.median(times)
+        print(
+            f"{mode:<6} best {min(times) * 1000:8.1f} ms  "
+            f"median {results[mode] * 1000:8.1f} ms"
+        )
+
+    saving = results["eager"] - results["lazy"]
+    print(
+        f"Lazy m5.objects saves {saving * 1000:.1f} ms "
+        f"({saving / results['eager'] * 100:.0f}%) of the median startup."
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the startup time of gem5 with, and without, "
+        "lazy imports of m5.objects."
+    )
+    parser.add_argument("gem5", help="The path to the gem5 binary.")
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="The config script to run. By default, gem5 is run with "
+        '`-c "pass"`.',
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=10,
+        help="The number of times gem5 is run in each mode.",
+    )
+    args = parser.parse_args()
+    if not os.path.isfile(args.gem5):
+        sys.exit(f"'{args.gem5}' is not a gem5 binary.")
+    run(args.gem5, args.config, args.repeat)
@@ -38,9 +38,18 @@
 # Pipeline activity viewer for the O3 CPU model.
 
 import argparse
-import copy
+import bisect
+import gzip
+import heapq
+import io
+import itertools
+import json
+import multiprocessing
 import os
 import sys
+import zlib
+from array import array
+from collections import namedtuple
 
 # Temporary storage for instructions. The queue is filled in out-of-order
 # until it reaches 'max_threshold' number of instructions. It is then
@@ -49,7 +58,7 @@ import sys
 # It is assumed that the instructions are not out of order for more then
 # 'min_threshold' places - otherwise they will appear out of order.
 insts = {
-    "queue": [],  # Instructions to print.
+    "queue": [],  # Instructions to print, as a heap ordered by seq. number.
     "max_threshold": 2000,  # Instructions are sorted out and printed when
     # their number reaches this threshold.
     "min_threshold": 1000,  # Printing stops when this number is reached.
@@ -65,6 +74,355 @@ insts = {
     "only_committed": 0,  # Set if only committed instructions are printed.
 }
 
+# The ticks of the pipeline stages of an instruction, in the order they are
+# printed, followed by the rest of the instruction's record.
+STAGES = (
+    "fetch",
+    "decode",
+    "rename",
+    "dispatch",
+    "issue",
+    "complete",
+    "retire",
+    "store",
+)
+Inst = namedtuple("Inst", STAGES + ("pc", "upc", "sn", "disasm"))
+
+# Breaks the ties of instructions with the same seq. number in the queue, so
+# that they are printed in the order they were queued.
+_queue_order = itertools.count()
+
+#####################################################################
+#
+# Trace files and their indexes
+#
+# To start printing at a tick or seq. number without reading the trace
+# from the beginning, an index of the trace is kept next to it (in
+# TRACE_FILE.o3idx). The trace is divided into blocks of lines, and for
+# each block the index records the byte offset of the block, and the
+# greatest tick, and greatest fetch seq. number, of all of the lines up to
+# the end of the block. The first line at or after a tick (or seq. number)
+# is then in the first block whose greatest tick (or seq. number) reaches
+# it, which is found by a binary search.
+#
+# Traces compressed with gzip are read as a sequence of gzip members. The
+# index also records where each member starts, so that a trace compressed
+# in blocks (e.g., with --block-compress) can be read from the member
+# containing an offset.
+#
+#####################################################################
+
+INDEX_SUFFIX = ".o3idx"
+INDEX_VERSION = 1
+INDEX_BLOCK_LINES = 4096
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def is_gzip(path):
+    with open(path, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
+
+
+class _GzipMembers(io.RawIOBase):
+    """Decompresses a gzip file, recording where each member starts in the
+    compressed and the decompressed file.
+    """
+
+    def __init__(self, path, compressed_offset=0):
+        self._file = open(path, "rb")
+        self._file.seek(compressed_offset)
+        self._compressed = compressed_offset
+        self._decompressed = 0
+        self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        self._pending = b""
+        # (compressed, decompressed) offsets of the start of each member.
+        self.members = [(compressed_offset, 0)]
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+    def readinto(self, buffer):
+        while not self._pending:
+            if self._decompressor.eof:
+                # The data read past the end of a member starts the next.
+                data = self._decompressor.unused_data
+                start = self._compressed - len(data)
+                if not data:
+                    data = self._read()
+                    if not data:
+                        return 0
+                self.members.append((start, self._decompressed))
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            else:
+                data = self._read()
+                if not data:
+                    return 0
+            self._pending = self._decompressor.decompress(data)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        self._decompressed += size
+        return size
+
+    def _read(self):
+        data = self._file.read(1 << 16)
+        self._compressed += len(data)
+        return data
+
+
+class TraceFile:
+    """A trace, which may be compressed with gzip, read line by line from a
+    byte offset of the (decompressed) trace.
+    """
+
+    def __init__(self, path, members=None):
+        """
+        :param path: The location of the trace.
+        :param members: The (compressed, decompressed) offsets of the gzip
+                        members of a compressed trace, if known.
+        """
+        self._path = path
+        self._gzip = is_gzip(path)
+        self._members = members or [(0, 0)]
+        self._open(0)
+
+    def _open(self, member):
+        compressed, self._offset = self._members[member]
+        if self._gzip:
+            self._file = io.BufferedReader(
+                _GzipMembers(self._path, compressed), 1 << 20
+            )
+        else:
+            self._file = open(self._path, "rb", buffering=1 << 20)
+            self._file.seek(compressed)
+
+    def seek(self, offset):
+        """Continues reading from a byte offset of the decompressed trace."""
+        self._file.close()
+        if not self._gzip:
+            self._open(0)
+            self._file.seek(offset)
+            return
+
+        # Decompress from the start of the member containing the offset.
+        starts = [decompressed for _, decompressed in self._members]
+        self._open(bisect.bisect_right(starts, offset) - 1)
+        while self._offset < offset:
+            skipped = self._file.read(min(offset - self._offset, 1 << 20))
+            if not skipped:
+                break
+            self._offset += len(skipped)
+
+    def readline(self):
+        line = self._file.readline()
+        return line.decode(errors="replace")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _scan_blocks(lines, offset, blocks):
+    """Appends the (offset, greatest tick, greatest fetch seq. number) of
+    each block of lines to blocks, with -1 if there are none. Returns the
+    offset of the end of the lines.
+    """
+    block_offset = None
+    for count, line in enumerate(lines):
+        if count % INDEX_BLOCK_LINES == 0:
+            if block_offset is not None:
+                blocks.append((block_offset, max_tick, max_sn))
+            block_offset = offset
+            max_tick = max_sn = -1
+        offset += len(line)
+        if not line.startswith(b"O3PipeView:"):
+            continue
+        fields = line.split(b":", 6)
+        max_tick = max(max_tick, int(fields[2]))
+        if fields[1] == b"fetch":
+            max_sn = max(max_sn, int(fields[5]))
+    if block_offset is not None:
+        blocks.append((block_offset, max_tick, max_sn))
+    return offset
+
+
+def _lines_between(path, start, end):
+    with open(path, "rb", buffering=1 << 20) as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if offset >= end:
+                return
+            offset += len(line)
+            yield line
+
+
+def _scan_chunk(path, start, end):
+    blocks = []
+    _scan_blocks(_lines_between(path, start, end), start, blocks)
+    return blocks
+
+
+def _chunk_starts(path, size, jobs):
+    """Divides a trace into jobs chunks which start at the start of a
+    line.
+    """
+    starts = [0]
+    with open(path, "rb") as f:
+        for job in range(1, jobs):
+            f.seek(max(job * size // jobs, starts[-1]))
+            if f.tell():
+                f.readline()
+            starts.append(min(f.tell(), size))
+    return starts
+
+
+class TraceIndex:
+    """The index of a trace, see above."""
+
+    def __init__(self, offsets, ticks, sns, members, size):
+        self._offsets = offsets
+        self._ticks = ticks
+        self._sns = sns
+        self.members = members
+        self._size = size
+
+    @classmethod
+    def build(cls, path, jobs=1):
+        """
+        Builds the index of a trace in one pass over it.
+
+        :param path: The location of the trace.
+        :param jobs: The number of processes which index chunks of an
+                     uncompressed trace in parallel.
+        """
+        if is_gzip(path):
+            raw = _GzipMembers(path)
+            with io.BufferedReader(raw, 1 << 20) as f:
+                blocks = []
+                size = _scan_blocks(f, 0, blocks)
+                members = raw.members
+        else:
+            size = os.path.getsize(path)
+            starts = _chunk_starts(path, size, max(jobs, 1))
+            chunks = list(zip(starts, starts[1:] + [size]))
+            chunks = [(path, start, end) for start, end in chunks]
+            if len(chunks) > 1:
+                with multiprocessing.Pool(len(chunks)) as pool:
+                    results = pool.starmap(_scan_chunk, chunks)
+            else:
+                results = [_scan_chunk(*chunks[0])]
+            blocks = [block for result in results for block in result]
+            members = [(0, 0)]
+
+        offsets, ticks, sns = array("q"), array("q"), array("q")
+        max_tick = max_sn = -1
+        for offset, tick, sn in blocks:
+            max_tick = max(max_tick, tick)
+            max_sn = max(max_sn, sn)
+            offsets.append(offset)
+            ticks.append(max_tick)
+            sns.append(max_sn)
+        return cls(offsets, ticks, sns, members, size)
+
+    def find_tick(self, tick):
+        """Returns the offset of a block before the first line at or after
+        a tick.
+        """
+        return self._find(self._ticks, tick)
+
+    def find_sn(self, sn):
+        """Returns the offset of a block before the first fetch of a seq.
+        number, or a later seq. number.
+        """
+        return self._find(self._sns, sn)
+
+    def _find(self, maxima, value):
+        block = bisect.bisect_left(maxima, value)
+        if block == len(maxima):
+            return self._size
+        return self._offsets[block]
+
+    @staticmethod
+    def _stat(path):
+        st = os.stat(path)
+        return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def save(self, path, trace_path):
+        """Writes the index to a file. Failure to write it is ignored as
+        the index can be rebuilt.
+        """
+        header = {
+            "version": INDEX_VERSION,
+            "trace": self._stat(trace_path),
+            "size": self._size,
+            "blocks": len(self._offsets),
+            "members": self.members,
+        }
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                for values in (self._offsets, self._ticks, self._sns):
+                    values.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    @classmethod
+    def load(cls, path, trace_path):
+        """Reads an index written by save, or returns None if there isn't
+        an up to date index of the trace.
+        """
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                if header["version"] != INDEX_VERSION or header[
+                    "trace"
+                ] != cls._stat(trace_path):
+                    return None
+                values = []
+                for _ in range(3):
+                    values.append(array("q"))
+                    values[-1].fromfile(f, header["blocks"])
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        members = [tuple(member) for member in header["members"]]
+        return cls(*values, members, header["size"])
+
+    @classmethod
+    def get(cls, trace_path, jobs=1):
+        """Returns the index of a trace, building (and saving) it if there
+        isn't an up to date index.
+        """
+        path = trace_path + INDEX_SUFFIX
+        index = cls.load(path, trace_path)
+        if index is None:
+            index = cls.build(trace_path, jobs)
+            index.save(path, trace_path)
+        return index
+
+
+def block_compress(in_path, out_path, block_size=1 << 24):
+    """Compresses a trace with gzip in independent blocks (gzip members) of
+    block_size bytes, so that it can be read from any block.
+    """
+    with open(in_path, "rb") as infile, open(out_path, "wb") as outfile:
+        while True:
+            block = infile.read(block_size)
+            if not block:
+                break
+            outfile.write(gzip.compress(block))
+
 
 def process_trace(
     trace,
@@ -79,6 +437,7 @@ def process_trace(
     stop_tick,
     start_sn,
     stop_sn,
+    index=None,
 ):
     global insts
 
@@ -93,6 +452,8 @@ def process_trace(
 
     # Skip lines up to the starting tick
     if start_tick != 0:
+        if index:
+            trace.seek(index.find_tick(start_tick))
         while True:
             line = trace.readline()
             if not line:
@@ -103,6 +464,8 @@ def process_trace(
             if int(fields[2]) >= start_tick:
                 break
     elif start_sn != 0:
+        if index:
+            trace.seek(index.find_sn(start_sn))
         while True:
             line = trace.readline()
             if not line:
@@ -213,8 +576,16 @@ def queue_inst(
     outfile, inst, cycle_time, width, color, timestamps, store_completions
 ):
     global insts
-    l_copy = copy.deepcopy(inst)
-    insts["queue"].append(l_copy)
+    # The instruction is queued as a tuple of its current values, as the
+    # dictionary is reused for the next instruction.
+    record = Inst(
+        *(inst.get(stage, 0) for stage in STAGES),
+        inst["pc"],
+        inst["upc"],
+        inst["sn"],
+        inst["disasm"],
+    )
+    heapq.heappush(insts["queue"], (record.sn, next(_queue_order), record))
     if len(insts["queue"]) > insts["max_threshold"]:
         print_insts(
             outfile,
@@ -227,7 +598,7 @@ def queue_inst(
         )
 
 
-# Sorts out and prints instructions in print queue
+# Prints instructions in print queue in order of their sequence numbers
 def print_insts(
     outfile,
     cycle_time,
@@ -238,32 +609,27 @@ def print_insts(
     lower_threshold,
 ):
     global insts
-    # sort the list of insts by sequence numbers
-    insts["queue"].sort(key=lambda inst: inst["sn"])
     while len(insts["queue"]) > lower_threshold:
-        print_item = insts["queue"].pop(0)
+        print_item = heapq.heappop(insts["queue"])[2]
         # As the instructions are processed out of order the main loop starts
         # earlier then specified by start_sn/tick and finishes later then what
         # is defined in stop_sn/tick.
         # Therefore, here we have to filter out instructions that reside out of
         # the specified boundaries.
-        if insts["sn_start"] > 0 and print_item["sn"] < insts["sn_start"]:
+        if insts["sn_start"] > 0 and print_item.sn < insts["sn_start"]:
             continue
             # earlier then the starting sequence number
-        if insts["sn_stop"] > 0 and print_item["sn"] > insts["sn_stop"]:
+        if insts["sn_stop"] > 0 and print_item.sn > insts["sn_stop"]:
             continue
             # later then the ending sequence number
-        if (
-            insts["tick_start"] > 0
-            and print_item["fetch"] < insts["tick_start"]
-        ):
+        if insts["tick_start"] > 0 and print_item.fetch < insts["tick_start"]:
             continue
             # earlier then the starting tick number
-        if insts["tick_stop"] > 0 and print_item["fetch"] > insts["tick_stop"]:
+        if insts["tick_stop"] > 0 and print_item.fetch > insts["tick_stop"]:
             continue
             # later then the ending tick number
 
-        if insts["only_committed"] != 0 and print_item["retire"] == 0:
+        if insts["only_committed"] != 0 and print_item.retire == 0:
             continue
             # retire is set to zero if it hasn't been completed
         print_inst(
@@ -335,25 +701,25 @@ def print_inst(
     # Print
 
     time_width = width * cycle_time
-    base_tick = (inst["fetch"] // time_width) * time_width
+    base_tick = (inst.fetch // time_width) * time_width
 
     # Find out the time of the last event - it may not
     # be 'retire' if the instruction is not comlpeted.
     last_event_time = max(
-        inst["fetch"],
-        inst["decode"],
-        inst["rename"],
-        inst["dispatch"],
-        inst["issue"],
-        inst["complete"],
-        inst["retire"],
+        inst.fetch,
+        inst.decode,
+        inst.rename,
+        inst.dispatch,
+        inst.issue,
+        inst.complete,
+        inst.retire,
     )
     if store_completions:
-        last_event_time = max(last_event_time, inst["store"])
+        last_event_time = max(last_event_time, inst.store)
 
     # Timeline shorter then time_width is printed in compact form where
     # the print continues at the start of the same line.
-    if (last_event_time - inst["fetch"]) < time_width:
+    if (last_event_time - inst.fetch) < time_width:
         num_lines = 1  # compact form
     else:
         num_lines = ((last_event_time - base_tick) // time_width) + 1
@@ -361,7 +727,7 @@ def print_inst(
     curr_color = termcap.Normal
 
     # This will visually distinguish completed and abandoned intructions.
-    if inst["retire"] == 0:
+    if inst.retire == 0:
         dot = "="  # abandoned instruction
     else:
         dot = "."  # completed instruction
@@ -370,10 +736,10 @@ def print_inst(
         start_tick = base_tick + i * time_width
         end_tick = start_tick + time_width
         if num_lines == 1:  # compact form
-            end_tick += inst["fetch"] - base_tick
+            end_tick += inst.fetch - base_tick
         events = []
         for stage_idx in range(len(stages)):
-            tick = inst[stages[stage_idx]["name"]]
+            tick = getattr(inst, stages[stage_idx]["name"])
             if tick != 0:
                 if tick >= start_tick and tick < end_tick:
                     events.append(
@@ -392,7 +758,7 @@ def print_inst(
         for event in events:
             if (
                 stages[event[2]]["name"] == "dispatch"
-                and inst["dispatch"] == inst["issue"]
+                and inst.dispatch == inst.issue
             ):
                 continue
             outfile.write(curr_color + dot * ((event[0] // cycle_time) - pos))
@@ -418,14 +784,14 @@ def print_inst(
             outfile.write(
                 "%s.%s %s [%s]"
                 % (
-                    inst["pc"].rjust(10),
-                    inst["upc"],
-                    inst["disasm"].ljust(25),
-                    str(inst["sn"]).rjust(10),
+                    inst.pc.rjust(10),
+                    inst.upc,
+                    inst.disasm.ljust(25),
+                    str(inst.sn).rjust(10),
                 )
             )
             if timestamps:
-                outfile.write(f"  f={inst['fetch']}, r={inst['retire']}")
+                outfile.write(f"  f={inst.fetch}, r={inst.retire}")
             outfile.write("\n")
         else:
             outfile.write("...".center(12) + "\n")
@@ -498,6 +864,29 @@ def main():
         default=False,
         help="additionally display store completion ticks",
     )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        default=False,
+        help="read the trace from the beginning to find the start of the"
+        " tick or instruction range, instead of using (and building) the"
+        f" index of the trace (TRACE_FILE{INDEX_SUFFIX})",
+    )
+    parser.add_argument(
+        "-j",
+        "--index-jobs",
+        type=int,
+        default=1,
+        help="number of processes used to build the index of an"
+        " uncompressed trace",
+    )
+    parser.add_argument(
+        "--block-compress",
+        metavar="GZIP_FILE",
+        default=None,
+        help="write a copy of the trace compressed with gzip in blocks,"
+        " which can be read from any block, to GZIP_FILE and exit",
+    )
     parser.add_argument("tracefile")
 
     args = parser.parse_args()
@@ -509,9 +898,22 @@ def main():
     if not inst_range:
         parser.error("invalid range")
         sys.exit(1)
+    if args.block_compress:
+        print("Compressing trace... ", end=" ")
+        block_compress(args.tracefile, args.block_compress)
+        print("done!")
+        return
+
+    # The index is only needed to find the start of a range
+    index = None
+    if not args.no_index and (tick_range[0] != 0 or inst_range[0] != 0):
+        print("Indexing trace... ", end=" ")
+        index = TraceIndex.get(args.tracefile, args.index_jobs)
+        print("done!")
+
     # Process trace
     print("Processing trace... ", end=" ")
-    with open(args.tracefile) as trace:
+    with TraceFile(args.tracefile, index.members if index else None) as trace:
         with open(args.outfile, "w") as out:
             process_trace(
                 trace,
@@ -523,6 +925,7 @@ def main():
                 args.only_committed,
                 args.store_completions,
                 *(tick_range + inst_range),
+                index=index,
             )
     print("done!")
 
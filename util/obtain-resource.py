@@ -38,11 +38,27 @@ build/ALL/gem5.opt util/obtain-resource.py <resource_id> [-p <path>] [-q]
 # This will download the resource with id `arm-hello64-static` to the
 # "arm-hello" in the CWD.
 ```
+
+A set of resources, and the resources they depend on, can be obtained at once
+with a manifest. The manifest lists one resource per line as `<resource_id>`
+or `<resource_id>@<resource_version>`. Blank lines and lines starting with `#`
+are ignored.
+
+```sh
+build/ALL/gem5.opt util/obtain-resource.py --manifest resources.txt \
+    [-d <resource directory>] [-j <jobs>] [-l <lockfile>]
+```
+
+A lockfile recording the local path and md5 of every resource obtained is
+written to `<manifest>.lock` by default. Setting `GEM5_RESOURCE_JSON` to the
+lockfile lets later runs obtain these resources without querying the
+resource clients.
 """
 
 if __name__ == "__m5_main__":
     import argparse
 
+    from gem5.resources.prefetch import prefetch_resources
     from gem5.resources.resource import obtain_resource
 
     parser = argparse.ArgumentParser()
@@ -50,9 +66,47 @@ if __name__ == "__m5_main__":
     parser.add_argument(
         "id",
         type=str,
+        nargs="?",
         help="The resource id to download.",
     )
 
+    parser.add_argument(
+        "-m",
+        "--manifest",
+        type=str,
+        required=False,
+        help="A file listing the resources to download, one "
+        "'<resource_id>[@<resource_version>]' per line. The resources, and "
+        "the resources they depend on, are downloaded concurrently.",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--resource-directory",
+        type=str,
+        required=False,
+        help="The directory the manifest's resources are to be downloaded "
+        "to. If not specified, the default gem5 local cache of resources is "
+        "used.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=4,
+        help="The max number of the manifest's resources downloaded at once.",
+    )
+
+    parser.add_argument(
+        "-l",
+        "--lockfile",
+        type=str,
+        required=False,
+        help="The path of the lockfile written for a manifest. Defaults to "
+        "'<manifest>.lock'.",
+    )
+
     parser.add_argument(
         "-p",
         "--path",
@@ -73,6 +127,32 @@ if __name__ == "__m5_main__":
 
     args = parser.parse_args()
 
+    if args.manifest:
+        resource_ids = []
+        resource_versions = []
+        with open(args.manifest) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                id, _, version = line.partition("@")
+                resource_ids.append(id)
+                resource_versions.append(version or None)
+
+        lockfile = args.lockfile or f"{args.manifest}.lock"
+        prefetch_resources(
+            resource_ids=resource_ids,
+            resource_versions=resource_versions,
+            resource_directory=args.resource_directory,
+            max_workers=args.jobs,
+            lockfile=lockfile,
+            quiet=args.quiet,
+        )
+        exit(0)
+
+    if not args.id:
+        parser.error("Either a resource id or --manifest must be given.")
+
     resource = obtain_resource(
         resource_id=args.id,
         quiet=args.quiet,
@@ -67,9 +67,68 @@
 # This file is a library of commonly used functions used when interfacing
 # with protobuf python messages. For eg, the decode scripts for different
 # types of proto objects can use the same function to decode a single message
+#
+# Besides the message-at-a-time functions it has a bulk codec for large
+# traces: MessageReader splits the stream into messages from large
+# blocks, decodeMessages parses them in batches, readColumns extracts
+# integer fields straight into arrays, and mapMessageChunks spreads the
+# work over several processes. Traces written by blockCompress are
+# ordinary multi-member gzip files whose members each hold whole
+# messages and record their compressed size in the gzip header, so they
+# can be split without decompressing them first.
 
+import argparse
+import functools
 import gzip
+import io
+import mmap
+import multiprocessing
+import os
 import struct
+import zlib
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Every gem5 trace starts with this magic number, followed by a header
+# message and then the messages themselves.
+MAGIC = b"gem5"
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Size of the blocks read from a trace by the bulk decoder, and the
+# amount of uncompressed data in each member written by blockCompress.
+DEFAULT_BLOCK_SIZE = 1 << 22
+
+DEFAULT_BATCH_SIZE = 4096
+
+# Fixed gzip member header written by blockCompress: the gzip magic,
+# compression method and FLG.FEXTRA, MTIME, XFL, OS and XLEN, followed
+# by a single "G5" extra subfield holding the total size of the member.
+_BLOCK_GZIP_HEADER = struct.Struct("<4sIBBH2sHI")
+_BLOCK_GZIP_ID = b"\x1f\x8b\x08\x04"
+_BLOCK_GZIP_SUBFIELD = b"G5"
+
+# Integer fields of the Packet message in src/proto/packet.proto, as
+# (column name, field number) pairs.
+PACKET_COLUMNS = (
+    ("tick", 1),
+    ("cmd", 2),
+    ("addr", 3),
+    ("size", 4),
+    ("flags", 5),
+)
+
+
+def isGzip(in_file):
+    """
+    Return True if the named file starts with the gzip magic number.
+    """
+    with open(in_file, "rb") as f:
+        return f.read(2) == GZIP_MAGIC
 
 
 def openFileRd(in_file):
@@ -79,17 +138,9 @@ def openFileRd(in_file):
     handle.
     """
     try:
-        # First see if this file is gzipped
-        try:
-            # Opening the file works even if it is not a gzip file
+        if isGzip(in_file):
             proto_in = gzip.open(in_file, "rb")
-
-            # Force a check of the magic number by seeking in the
-            # file. If we do not do it here the error will occur when
-            # reading the first message.
-            proto_in.seek(1)
-            proto_in.seek(0)
-        except OSError:
+        else:
             proto_in = open(in_file, "rb")
     except OSError:
         print("Failed to open ", in_file, " for reading")
@@ -113,7 +164,7 @@ def _DecodeVarint32(in_file):
         c = in_file.read(1)
         if len(c) == 0:
             return (0, 0)
-        b = struct.unpack("<B", c)[0]
+        b = c[0]
         result |= (b & 0x7F) << shift
         pos += 1
         if not (b & 0x80):
@@ -166,3 +217,434 @@ def encodeMessage(out_file, message):
     out = message.SerializeToString()
     _EncodeVarint32(out_file, len(out))
     out_file.write(out)
+
+
+def _decodeVarint(buf, pos):
+    """
+    Decode the varint starting at buf[pos] and return it together with
+    the position that follows it. Raises IndexError if buf ends first.
+    """
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    result = b & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        b = buf[pos]
+        result |= (b & 0x7F) << shift
+        pos += 1
+        if b < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise OSError("Too many bytes when decoding varint.")
+
+
+def _encodeVarint(value):
+    """
+    Return the varint encoding of value as bytes.
+    """
+    out = bytearray()
+    while value > 0x7F:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class MessageReader:
+    """
+    Splits the length-prefixed messages of a trace into raw message
+    bytes. The file is read in blocks of block_size bytes and the
+    length prefixes are decoded from the buffered block, rather than
+    a byte at a time from the file.
+
+    Reading starts at the current position of in_file, and the reader
+    reads ahead of the messages it has returned, so in_file should not
+    be used directly afterwards. Like decodeMessage, a zero length
+    prefix ends the stream.
+    """
+
+    def __init__(self, in_file, block_size=DEFAULT_BLOCK_SIZE):
+        self._file = in_file
+        self._block_size = block_size
+        self._buf = b""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        block = self._file.read(self._block_size)
+        if not block:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + block
+        self._pos = 0
+        return True
+
+    def readBatch(self, count=DEFAULT_BATCH_SIZE):
+        """
+        Return a list of up to count raw messages. The list is only
+        shorter than count at the end of the stream.
+        """
+        messages = []
+        append = messages.append
+        remaining = count
+        while remaining:
+            buf = self._buf
+            pos = self._pos
+            end = len(buf)
+            while remaining and pos < end:
+                size = buf[pos]
+                if size < 0x80:
+                    start = pos + 1
+                else:
+                    try:
+                        size, start = _decodeVarint(buf, pos)
+                    except IndexError:
+                        break
+                stop = start + size
+                if stop > end:
+                    break
+                if size == 0:
+                    self._buf = b""
+                    self._pos = 0
+                    self._eof = True
+                    return messages
+                append(buf[start:stop])
+                pos = stop
+                remaining -= 1
+            self._pos = pos
+            if remaining and not self._fill():
+                if self._pos < len(self._buf):
+                    raise OSError("Truncated message at the end of the trace")
+                break
+        return messages
+
+    def __iter__(self):
+        """
+        Yield lists of raw messages until the end of the stream.
+        """
+        while True:
+            batch = self.readBatch()
+            if not batch:
+                return
+            yield batch
+
+
+def decodeMessages(
+    in_file,
+    message_type,
+    batch_size=DEFAULT_BATCH_SIZE,
+    block_size=DEFAULT_BLOCK_SIZE,
+):
+    """
+    Decode the messages from the current position of in_file to its
+    end as instances of message_type, yielding them in lists of up to
+    batch_size messages.
+    """
+    parse = message_type.FromString
+    reader = MessageReader(in_file, block_size)
+    while True:
+        batch = reader.readBatch(batch_size)
+        if not batch:
+            return
+        yield [parse(raw) for raw in batch]
+
+
+def decodeColumns(messages, columns=PACKET_COLUMNS):
+    """
+    Extract integer fields from a list of raw messages without parsing
+    them into message objects. columns is a sequence of (name, field
+    number) pairs naming varint encoded fields. Returns a dict mapping
+    each name to an array of unsigned 64-bit values, one per message,
+    with 0 where a message does not have the field.
+    """
+    count = len(messages)
+    values = [array("Q", bytes(8 * count)) for _ in columns]
+    # Look the columns up by the field key of a varint with that number
+    slots = {
+        number << 3: column for (_, number), column in zip(columns, values)
+    }
+    for n, msg in enumerate(messages):
+        pos = 0
+        end = len(msg)
+        while pos < end:
+            key = msg[pos]
+            if key < 0x80:
+                pos += 1
+            else:
+                key, pos = _decodeVarint(msg, pos)
+            wire_type = key & 0x7
+            if wire_type == 0:
+                # Inlined _decodeVarint, as this is the hot loop
+                value = msg[pos]
+                pos += 1
+                if value >= 0x80:
+                    value &= 0x7F
+                    shift = 7
+                    while True:
+                        b = msg[pos]
+                        pos += 1
+                        value |= (b & 0x7F) << shift
+                        if b < 0x80:
+                            break
+                        shift += 7
+                        if shift >= 64:
+                            raise OSError(
+                                "Too many bytes when decoding varint."
+                            )
+                column = slots.get(key)
+                if column is not None:
+                    column[n] = value
+            elif wire_type == 2:
+                size, pos = _decodeVarint(msg, pos)
+                pos += size
+            elif wire_type == 1:
+                pos += 8
+            elif wire_type == 5:
+                pos += 4
+            else:
+                raise OSError(f"Unsupported wire type {wire_type}")
+    return {name: column for (name, _), column in zip(columns, values)}
+
+
+def _splitMessages(data):
+    """
+    Return the raw messages in a buffer holding whole messages.
+    """
+    reader = MessageReader(io.BytesIO(data), max(len(data), 1))
+    messages = []
+    for batch in reader:
+        messages.extend(batch)
+    return messages
+
+
+def _plainChunks(in_file_name, chunk_size):
+    """
+    Walk the length prefixes of an uncompressed trace and return the
+    (start, stop) file offsets of chunks of about chunk_size bytes that
+    each hold whole messages, skipping the magic number and header.
+    """
+    with open(in_file_name, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= len(MAGIC):
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[: len(MAGIC)] != MAGIC:
+                raise OSError(f"{in_file_name} is not a gem5 trace")
+            try:
+                header_size, pos = _decodeVarint(buf, len(MAGIC))
+                pos += header_size
+                chunks = []
+                start = pos
+                while pos < size:
+                    msg_size = buf[pos]
+                    if msg_size < 0x80:
+                        pos += 1
+                    else:
+                        msg_size, pos = _decodeVarint(buf, pos)
+                    if msg_size == 0:
+                        break
+                    pos += msg_size
+                    if pos - start >= chunk_size:
+                        chunks.append((start, pos))
+                        start = pos
+            except IndexError:
+                pos = size + 1
+            if pos > size:
+                raise OSError("Truncated message at the end of the trace")
+            if start < pos:
+                chunks.append((start, pos))
+            return chunks
+
+
+def _blockGzipMembers(in_file_name):
+    """
+    Return the (start, stop) file offsets of the gzip members of a
+    trace written by blockCompress, leaving out the first member, which
+    holds the magic number and header. Returns None if the file was not
+    written by blockCompress.
+    """
+    members = []
+    with open(in_file_name, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        pos = 0
+        while pos < size:
+            f.seek(pos)
+            header = f.read(_BLOCK_GZIP_HEADER.size)
+            if len(header) < _BLOCK_GZIP_HEADER.size:
+                return None
+            ident, _, _, _, xlen, subfield, sublen, member_size = (
+                _BLOCK_GZIP_HEADER.unpack(header)
+            )
+            if (
+                ident != _BLOCK_GZIP_ID
+                or xlen != 8
+                or subfield != _BLOCK_GZIP_SUBFIELD
+                or sublen != 4
+            ):
+                return None
+            members.append((pos, pos + member_size))
+            pos += member_size
+    return members[1:]
+
+
+def _decodeChunk(args):
+    in_file_name, compressed, start, stop, func = args
+    with open(in_file_name, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    if compressed:
+        data = gzip.decompress(data)
+    return func(_splitMessages(data))
+
+
+def _serialChunks(in_file_name, func):
+    proto_in = openFileRd(in_file_name)
+    with proto_in:
+        if proto_in.read(len(MAGIC)) != MAGIC:
+            raise OSError(f"{in_file_name} is not a gem5 trace")
+        reader = MessageReader(proto_in)
+        # Skip the header message
+        reader.readBatch(1)
+        for batch in reader:
+            yield func(batch)
+
+
+def mapMessageChunks(
+    in_file_name, func, jobs=None, chunk_size=DEFAULT_BLOCK_SIZE
+):
+    """
+    Split the messages following the header of a trace into chunks,
+    call func with the list of raw messages in each chunk and yield the
+    results in trace order.
+
+    Uncompressed traces and traces written by blockCompress are decoded
+    by jobs worker processes (all cores if None), so func must be
+    picklable, e.g. a module-level function or a functools.partial of
+    one. Other gzip traces can only be decompressed from the start and
+    are decoded in this process, as are all traces when jobs is 1.
+
+    :param in_file_name: Path to the trace.
+    :param func: Called with each list of raw messages.
+    :param jobs: The number of worker processes.
+    :param chunk_size: Approximate size in bytes of the chunks of an
+        uncompressed trace.
+    """
+    chunks = None
+    if jobs != 1:
+        if isGzip(in_file_name):
+            members = _blockGzipMembers(in_file_name)
+            if members is not None:
+                chunks = (True, members)
+        else:
+            chunks = (False, _plainChunks(in_file_name, chunk_size))
+
+    if chunks is None:
+        yield from _serialChunks(in_file_name, func)
+        return
+
+    compressed, ranges = chunks
+    with multiprocessing.Pool(jobs) as pool:
+        yield from pool.imap(
+            _decodeChunk,
+            (
+                (in_file_name, compressed, start, stop, func)
+                for start, stop in ranges
+            ),
+        )
+
+
+def readColumns(in_file_name, columns=PACKET_COLUMNS, jobs=1):
+    """
+    Read integer fields of all the messages following the header of a
+    trace into columns, e.g. the tick, command, address, size and flags
+    of each packet in a packet trace. See decodeColumns for the meaning
+    of columns and mapMessageChunks for jobs.
+
+    Returns a dict mapping column names to NumPy uint64 arrays if NumPy
+    is installed, and to array.array("Q") objects otherwise.
+    """
+    result = {name: array("Q") for name, _ in columns}
+    for part in mapMessageChunks(
+        in_file_name, functools.partial(decodeColumns, columns=columns), jobs
+    ):
+        for name, values in part.items():
+            result[name].extend(values)
+    if np is not None:
+        result = {
+            name: np.frombuffer(values, dtype=np.uint64)
+            for name, values in result.items()
+        }
+    return result
+
+
+def _gzipMember(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    body = compressor.compress(data) + compressor.flush()
+    member_size = _BLOCK_GZIP_HEADER.size + len(body) + 8
+    header = _BLOCK_GZIP_HEADER.pack(
+        _BLOCK_GZIP_ID, 0, 0, 255, 8, _BLOCK_GZIP_SUBFIELD, 4, member_size
+    )
+    trailer = struct.pack("<II", zlib.crc32(data), len(data) & 0xFFFFFFFF)
+    return header + body + trailer
+
+
+def blockCompress(
+    in_file_name, out_file_name, block_size=DEFAULT_BLOCK_SIZE, level=6
+):
+    """
+    Write a copy of a trace as a series of gzip members, each holding
+    whole messages and about block_size bytes of uncompressed data. The
+    result can be read as a normal gzip file, by gem5 as well as by
+    this library, and lets mapMessageChunks decode the members in
+    parallel.
+    """
+    proto_in = openFileRd(in_file_name)
+    with proto_in, open(out_file_name, "wb") as out:
+        magic = proto_in.read(len(MAGIC))
+        if magic != MAGIC:
+            raise OSError(f"{in_file_name} is not a gem5 trace")
+        reader = MessageReader(proto_in)
+        parts = [magic]
+        for header in reader.readBatch(1):
+            parts += [_encodeVarint(len(header)), header]
+        out.write(_gzipMember(b"".join(parts), level))
+
+        parts = []
+        size = 0
+        for batch in reader:
+            for msg in batch:
+                prefix = _encodeVarint(len(msg))
+                parts += [prefix, msg]
+                size += len(prefix) + len(msg)
+                if size >= block_size:
+                    out.write(_gzipMember(b"".join(parts), level))
+                    parts = []
+                    size = 0
+        if parts:
+            out.write(_gzipMember(b"".join(parts), level))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rewrite a protobuf trace as block-compressed gzip, "
+        "so that it can be decoded in parallel."
+    )
+    parser.add_argument("input", help="Trace to compress")
+    parser.add_argument("output", help="Block-compressed trace to write")
+    parser.add_argument(
+        "--block-size",
+        type=int,
+        default=DEFAULT_BLOCK_SIZE,
+        help="Uncompressed bytes per gzip member (default: %(default)s)",
+    )
+    args = parser.parse_args()
+    blockCompress(args.input, args.output, args.block_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# Copyright (c) 2026 The Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are
+# met: redistributions of source code must retain the above copyright
+# notice, this list of conditions and the following disclaimer;
+# redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution;
+# neither the name of the copyright holders nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+# "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+# LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+# A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+# OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+# LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+A micro-benchmark of searching, and navigating, a large PyStats tree.
+
+A synthetic SimStat of a system with many cores is built (500k statistics by
+default), then the time taken by ``AbstractStat.find``, ``find_paths``, and
+attribute access of SimObject vector elements (e.g., ``system.cpu3``) is
+reported. ``find`` is compared against a search of
+``children(recursive=True)``, as ``find`` was implemented before the path
+index.
+
+Usage
+-----
+
+```sh
+build/ALL/gem5.opt util/pystats-find-benchmark.py [--cores 64] \
+    [--stats-per-core 7800] [--repeat 5]
+# Or, as PyStats does not depend on the gem5 binary:
+PYTHONPATH=src/python python3 util/pystats-find-benchmark.py
+```
+"""
+
+import argparse
+import re
+import time
+from typing import Callable
+
+from m5.ext.pystats import (
+    Scalar,
+    SimObjectGroup,
+    SimObjectVectorGroup,
+    SimStat,
+    Vector,
+)
+
+
+def build_simstat(cores: int, stats_per_core: int) -> SimStat:
+    """Builds a SimStat of a system with ``cores`` cores, each with
+    ``stats_per_core`` statistics. One in every 16 statistics is a Vector of
+    4 Scalars, the rest are Scalars.
+    """
+    cpus = []
+    for core in range(cores):
+        stats = {"name": f"cpu{core}"}
+        for index in range(stats_per_core):
+            if index % 16 == 0:
+                stats[f"vector{index}"] = Vector(
+                    value={i: Scalar(value=i) for i in range(4)},
+                    type="Vector",
+                )
+            else:
+                stats[f"stat{index}"] = Scalar(value=index, unit="Count")
+        stats["numCycles"] = Scalar(value=core)
+        cpus.append(SimObjectGroup(**stats))
+    return SimStat(system=SimObjectGroup(cpu=SimObjectVectorGroup(value=cpus)))
+
+
+def timed(description: str, repeat: int, function: Callable) -> None:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    print(
+        f"{description:<48} best {min(times) * 1000:10.2f} ms  "
+        f"first {times[0] * 1000:10.2f} ms  ({len(result)} results)"
+    )
+
+
+def run(cores: int, stats_per_core: int, repeat: int) -> None:
+    start = time.perf_counter()
+    simstat = build_simstat(cores, stats_per_core)
+    print(f"Built the SimStat in {time.perf_counter() - start:.2f} s.")
+
+    pattern = re.compile("numCycles")
+    timed(
+        "children(recursive=True) + re.match",
+        repeat,
+        lambda: simstat.children(
+            lambda name: re.match(pattern, name), recursive=True
+        ),
+    )
+    timed("find('numCycles')", repeat, lambda: simstat.find(pattern))
+    timed(
+        "find_paths('system.cpu.*.numCycles', glob=True)",
+        repeat,
+        lambda: simstat.find_paths("system.cpu.*.numCycles", glob=True),
+    )
+    timed(
+        "find_paths(r'system\\.cpu\\.3\\.vector')",
+        repeat,
+        lambda: simstat.find_paths(r"system\.cpu\.3\.vector"),
+    )
+    timed(
+        f"system.cpu<n>.numCycles for each of {cores} cores",
+        repeat,
+        lambda: [
+            getattr(simstat.system, f"cpu{core}").numCycles
+            for core in range(cores)
+        ],
+    )
+
+
+if __name__ in ("__main__", "__m5_main__"):
+    parser = argparse.ArgumentParser(
+        description="Benchmarks searching a large PyStats SimStat."
+    )
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=64,
+        help="The number of cores in the synthetic system.",
+    )
+    parser.add_argument(
+        "--stats-per-core",
+        type=int,
+        default=7800,
+        help="The number of statistics of each core.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="The number of times each search is timed.",
+    )
+    args = parser.parse_args()
+    run(args.cores, args.stats_per_core, args.repeat)